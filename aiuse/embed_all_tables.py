@@ -1,12 +1,29 @@
+import os
 import sys
-from dataclasses import dataclass
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
 from typing import List, Tuple, Dict, Optional
 
+import numpy as np
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import execute_batch
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import TruncatedSVD
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.pgvector_codec import column_type, update_vectors  # noqa: E402
+from core.text_model_store import ModelStore, TextModel, fit_text_model  # noqa: E402
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "models")
+
+# 임베딩 대상이 아닌 관리용 테이블 (변경 로그, 재임베딩 상태, 엑셀 적재 기록)
+EXCLUDED_TABLES = frozenset({
+    "tb_researcher_change",           # migrations/004
+    "tb_researcher_embedding_state",  # core/reembed.py
+    "ingest_run",                     # migrations/007
+    "ingest_fingerprint",
+    "ingest_changeset",
+})
 
 
 @dataclass
@@ -19,6 +36,22 @@ class DbConfig:
     schema: str = "scholar"
     dim: int = 128
     limit: Optional[int] = None
+    chunk_size: int = 5000
+    fit_rows: int = 50000
+    # auto: 저장된 모델이 있으면 새/변경 행만 transform, 없거나 refit_days보다 오래되면 재학습
+    # transform: 저장된 모델로만 변환 / refit: 항상 재학습 후 전체 행 재계산
+    mode: str = "auto"
+    refit_days: float = 30.0
+    # transform 대상 행 조건 (기본: embedding IS NULL). --all이면 전체 행
+    where: Optional[str] = None
+    all_rows: bool = False
+    # 엑셀 적재 변경분(ingest_changeset, migrations/007)에서 이 run_id 이후 추가/변경된 행만 변환
+    changes_since: Optional[int] = None
+    model_dir: str = MODEL_DIR
+    # 테이블 단위 병렬 처리 (워커 프로세스마다 자체 연결). 1이면 현재 프로세스에서 순차 실행
+    workers: int = min(4, os.cpu_count() or 1)
+    retries: int = 1
+    tables: Optional[List[str]] = None
 
 
 def connect_db(cfg: DbConfig):
@@ -46,7 +79,7 @@ def list_tables(conn, schema: str) -> List[str]:
             """,
             (schema,),
         )
-        return [r[0] for r in cur.fetchall()]
+        return [r[0] for r in cur.fetchall() if r[0] not in EXCLUDED_TABLES]
 
 
 def list_columns(conn, schema: str, table: str) -> List[Tuple[str, str, str]]:
@@ -153,19 +186,40 @@ def ensure_embedding_column(conn, schema: str, table: str, desired_dim: int) ->
     return dim if dim else desired_dim
 
 
-def fetch_rows(conn, schema: str, table: str, pk: Optional[str], text_cols: List[str], limit: Optional[int]):
+def _select_rows(schema: str, table: str, pk: Optional[str], text_cols: List[str], limit: Optional[int],
+                 where: Optional[sql.Composable] = None):
     cols = ['ctid'] + ([pk] if pk else []) + text_cols
     q = sql.SQL("SELECT {} FROM {}.{}").format(
         sql.SQL(", ").join(sql.Identifier(c) for c in cols),
         sql.Identifier(schema),
         sql.Identifier(table),
     )
+    if where is not None:
+        q = q + sql.SQL(" WHERE ") + where
     if limit:
         q = q + sql.SQL(" LIMIT {}").format(sql.Literal(limit))
-    with conn.cursor() as cur:
-        cur.execute(q)
-        names = [d[0] for d in cur.description]
-        return [dict(zip(names, r)) for r in cur.fetchall()]
+    return q
+
+
+def iter_row_chunks(conn, schema: str, table: str, pk: Optional[str], text_cols: List[str],
+                    limit: Optional[int], chunk_size: int, where: Optional[sql.Composable] = None):
+    """Stream rows as lists of dicts through a named (server-side) cursor.
+
+    WITH HOLD keeps the cursor open across the per-chunk commits of the writer.
+    """
+    cur = conn.cursor(name=f"embed_{table}", withhold=True)
+    try:
+        cur.execute(_select_rows(schema, table, pk, text_cols, limit, where))
+        names = None
+        while True:
+            batch = cur.fetchmany(chunk_size)
+            if not batch:
+                break
+            if names is None:
+                names = [d[0] for d in cur.description]
+            yield [dict(zip(names, r)) for r in batch]
+    finally:
+        cur.close()
 
 
 def build_docs(rows, text_cols: List[str]) -> List[str]:
@@ -181,47 +235,215 @@ def build_docs(rows, text_cols: List[str]) -> List[str]:
     return docs
 
 
-def fit_embeddings(docs: List[str], dim: int) -> List[list]:
-    vec = TfidfVectorizer(max_features=20000)
-    X = vec.fit_transform(docs)
-    dim_eff = min(dim, max(2, X.shape[1]))
-    svd = TruncatedSVD(n_components=dim_eff, random_state=42)
-    emb = svd.fit_transform(X)
-    return emb.tolist()
+def pad_or_truncate(embs: np.ndarray, target_dim: int) -> np.ndarray:
+    if embs.shape[1] == target_dim:
+        return embs
+    if embs.shape[1] > target_dim:
+        return embs[:, :target_dim]
+    return np.pad(embs, ((0, 0), (0, target_dim - embs.shape[1])))
 
 
-def pad_or_truncate(embs: List[list], target_dim: int) -> List[list]:
-    out: List[list] = []
-    for e in embs:
-        if len(e) == target_dim:
-            out.append(e)
-        elif len(e) < target_dim:
-            out.append(e + [0.0] * (target_dim - len(e)))
-        else:
-            out.append(e[:target_dim])
-    return out
+def update_embeddings(conn, schema: str, table: str, key: str, key_type: str, keys, embs) -> int:
+    # float32 벡터를 pgvector 바이너리 형식으로 COPY한 뒤 한 번의 UPDATE ... FROM으로 반영
+    with conn.cursor() as cur:
+        updated = update_vectors(cur, sql.Identifier(schema, table), key, key_type, keys, embs)
+    conn.commit()
+    return updated
 
 
-def to_vec_literal(e: list) -> str:
-    # pgvector는 '[x1, x2, ...]' 형식 문자열을 vector로 캐스팅 가능
-    return '[' + ','.join(f"{float(x):.6f}" for x in e) + ']'
+def estimate_rows(conn, schema: str, table: str) -> int:
+    # planner estimate (cheap); -1/0 until the table has been analyzed
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            (sql.Identifier(schema, table).as_string(cur),),
+        )
+        row = cur.fetchone()
+    return max(int(row[0]), 0) if row else 0
+
+
+def fit_table_model(conn, cfg: DbConfig, table: str, pk: Optional[str], text_cols: List[str],
+                    eff_dim: int) -> Tuple[Optional[TextModel], int]:
+    """One streaming pass: document frequencies over every row, SVD on a fit_rows sample."""
+    chunks = (build_docs(c, text_cols)
+              for c in iter_row_chunks(conn, cfg.schema, table, pk, text_cols, cfg.limit, cfg.chunk_size))
+    model, total = fit_text_model(chunks, min(cfg.dim, eff_dim), fit_rows=cfg.fit_rows)
+    if model is not None:
+        model.meta["target_dim"] = eff_dim
+        model.meta["text_columns"] = list(text_cols)
+    return model, total
+
+
+def choose_model(store: ModelStore, cfg: DbConfig, table: str, text_cols: List[str],
+                 eff_dim: int) -> Tuple[Optional[TextModel], str]:
+    """Return (stored model or None, reason). None means the table must be refitted."""
+    if cfg.mode == "refit":
+        return None, "refit requested"
+    model = store.load(cfg.schema, table)
+    if model is None:
+        return None, "no stored model"
+    if model.meta.get("target_dim") != eff_dim or model.meta.get("text_columns") != list(text_cols):
+        return None, "dimension or text columns changed"
+    if cfg.mode == "auto" and cfg.refit_days > 0 and store.age_days(model) > cfg.refit_days:
+        return None, f"model older than {cfg.refit_days:g} days"
+    return model, f"model {model.version}"
+
+
+def changeset_filter(schema: str, table: str, pk: str, since_run_id: int) -> sql.Composable:
+    """Rows inserted/updated by ingest runs after since_run_id, or still missing an embedding."""
+    return sql.SQL(
+        "({embedding} IS NULL OR {pk}::text IN ("
+        "SELECT row_key FROM {changeset} WHERE table_name = {table} AND run_id > {run} AND op <> 'delete'))"
+    ).format(
+        embedding=sql.Identifier("embedding"),
+        pk=sql.Identifier(pk),
+        changeset=sql.Identifier(schema, "ingest_changeset"),
+        table=sql.Literal(table),
+        run=sql.Literal(since_run_id),
+    )
 
 
-def update_embeddings(conn, schema: str, table: str, pk: Optional[str], rows, embs):
+def record_model_version(conn, schema: str, table: str, version: str) -> None:
+    # 임베딩 열 주석에 모델 버전을 남겨 어떤 모델로 계산된 값인지 추적
     with conn.cursor() as cur:
-        if pk:
-            data = [(to_vec_literal(embs[i]), rows[i][pk]) for i in range(len(rows))]
-            execute_batch(cur, sql.SQL('UPDATE {}.{} SET "embedding" = (%s)::vector WHERE {} = %s').format(
-                sql.Identifier(schema), sql.Identifier(table), sql.Identifier(pk)
-            ).as_string(cur), data, page_size=500)
-        else:
-            data = [(to_vec_literal(embs[i]), rows[i]['ctid']) for i in range(len(rows))]
-            execute_batch(cur, sql.SQL('UPDATE {}.{} SET "embedding" = (%s)::vector WHERE ctid = %s').format(
-                sql.Identifier(schema), sql.Identifier(table)
-            ).as_string(cur), data, page_size=500)
+        cur.execute(sql.SQL("COMMENT ON COLUMN {}.{} IS {}").format(
+            sql.Identifier(schema, table), sql.Identifier("embedding"), sql.Literal(f"text_model={version}")))
     conn.commit()
 
 
+def embed_table(conn, cfg: DbConfig, table: str, pk: Optional[str], text_cols: List[str], eff_dim: int) -> int:
+    """Load or fit the table model, then stream chunks: transform -> COPY -> UPDATE ... FROM -> commit.
+
+    With a stored model only new rows (embedding IS NULL, or --where) are transformed;
+    after a refit every row is recomputed so the whole column shares one embedding space.
+    """
+    store = ModelStore(cfg.model_dir)
+    model, reason = choose_model(store, cfg, table, text_cols, eff_dim)
+    where = None
+    total = 0
+    refitted = model is None
+    if refitted:
+        if cfg.mode == "transform":
+            print(f"[WARN] {table}: {reason}; fitting a new model")
+        model, total = fit_table_model(conn, cfg, table, pk, text_cols, eff_dim)
+        if model is None:
+            return 0
+        print(f"[FIT] {table}: {reason} "
+              f"({model.meta['rows_fitted']}/{total} rows, {model.meta['fit_seconds']}s)", flush=True)
+    else:
+        if cfg.changes_since is not None and pk:
+            where = changeset_filter(cfg.schema, table, pk, cfg.changes_since)
+        elif not cfg.all_rows:
+            where = sql.SQL(cfg.where) if cfg.where else sql.SQL("{} IS NULL").format(sql.Identifier("embedding"))
+        print(f"[LOAD] {table}: {reason}", flush=True)
+    key = pk or 'ctid'
+    with conn.cursor() as cur:
+        key_type = column_type(cur, sql.Identifier(cfg.schema, table).as_string(cur), pk) if pk else 'tid'
+    total = total or estimate_rows(conn, cfg.schema, table)
+    done = 0
+    started = time.perf_counter()
+    for chunk in iter_row_chunks(conn, cfg.schema, table, pk, text_cols, cfg.limit, cfg.chunk_size, where):
+        embs = pad_or_truncate(model.transform(build_docs(chunk, text_cols)), eff_dim)
+        update_embeddings(conn, cfg.schema, table, key, key_type, [r[key] for r in chunk], embs)
+        done += len(chunk)
+        rate = done / max(time.perf_counter() - started, 1e-9)
+        print(f"[..] {table}: {done}/{total} rows ({rate:.0f} rows/s)", flush=True)
+    # 재학습한 모델은 전체 행을 다시 쓴 뒤에만 저장: 중간에 실패해 재시도하면 처음부터 다시 학습
+    version = store.save(cfg.schema, table, model) if refitted else model.version
+    record_model_version(conn, cfg.schema, table, version)
+    return done
+
+
+@dataclass
+class TableResult:
+    table: str
+    status: str  # ok | skip | failed
+    rows: int = 0
+    dim: int = 0
+    seconds: float = 0.0
+    attempts: int = 0
+    detail: str = ""
+
+
+def embed_one_table(cfg: DbConfig, table: str) -> TableResult:
+    """Introspect and embed a single table on its own connection (process-pool entry point)."""
+    started = time.perf_counter()
+    conn = connect_db(cfg)
+    try:
+        tcols = text_columns(list_columns(conn, cfg.schema, table))
+        if not tcols:
+            return TableResult(table, "skip", detail="no text columns")
+        pk = get_primary_key(conn, cfg.schema, table)
+        eff_dim = ensure_embedding_column(conn, cfg.schema, table, cfg.dim)
+        n_rows = embed_table(conn, cfg, table, pk, tcols, eff_dim)
+    finally:
+        conn.close()
+    seconds = round(time.perf_counter() - started, 2)
+    if not n_rows:
+        return TableResult(table, "skip", dim=eff_dim, seconds=seconds, detail="no rows to embed")
+    return TableResult(table, "ok", rows=n_rows, dim=eff_dim, seconds=seconds)
+
+
+def _embed_with_retry(cfg: DbConfig, table: str) -> TableResult:
+    """Run embed_one_table, retrying failures so one bad table does not stop the others."""
+    attempts = max(1, cfg.retries + 1)
+    started = time.perf_counter()
+    for attempt in range(1, attempts + 1):
+        try:
+            result = embed_one_table(cfg, table)
+            result.attempts = attempt
+            return result
+        except Exception as exc:
+            detail = f"{type(exc).__name__}: {exc}".strip()
+            print(f"[RETRY] {table}: attempt {attempt}/{attempts} failed: {detail}", flush=True)
+            if attempt == attempts:
+                traceback.print_exc()
+                return TableResult(table, "failed", seconds=round(time.perf_counter() - started, 2),
+                                   attempts=attempt, detail=detail)
+            time.sleep(min(2 ** attempt, 30))
+
+
+def run_tables(cfg: DbConfig, tables: List[str]) -> List[TableResult]:
+    """Embed tables across a process pool, largest first so the run ends near the largest table's time."""
+    if cfg.workers <= 1 or len(tables) <= 1:
+        results = []
+        for t in tables:
+            results.append(_embed_with_retry(cfg, t))
+            _report(results[-1])
+        return results
+    results = []
+    with ProcessPoolExecutor(max_workers=min(cfg.workers, len(tables))) as pool:
+        futures = {pool.submit(_embed_with_retry, cfg, t): t for t in tables}
+        for fut in as_completed(futures):
+            try:
+                result = fut.result()
+            except Exception as exc:  # worker process died
+                result = TableResult(futures[fut], "failed", detail=f"{type(exc).__name__}: {exc}")
+            results.append(result)
+            _report(result)
+    return results
+
+
+def _report(r: TableResult) -> None:
+    if r.status == "ok":
+        print(f"[OK] {r.table}: {r.rows} rows -> embedding vector({r.dim}) in {r.seconds}s", flush=True)
+    elif r.status == "skip":
+        print(f"[SKIP] {r.table}: {r.detail}", flush=True)
+    else:
+        print(f"[FAIL] {r.table}: {r.detail}", flush=True)
+
+
+def print_summary(results: List[TableResult], wall: float) -> None:
+    width = max([len(r.table) for r in results] + [5])
+    print(f"\n{'table':<{width}}  {'status':<6}  {'rows':>10}  {'seconds':>8}  tries  detail")
+    for r in sorted(results, key=lambda r: -r.seconds):
+        print(f"{r.table:<{width}}  {r.status:<6}  {r.rows:>10}  {r.seconds:>8.2f}  {r.attempts:>5}  {r.detail}")
+    busy = sum(r.seconds for r in results)
+    failed = sum(1 for r in results if r.status == "failed")
+    print(f"[SUMMARY] tables={len(results)} failed={failed} rows={sum(r.rows for r in results)} "
+          f"wall={wall:.2f}s table_time={busy:.2f}s")
+
+
 def parse_args(argv: List[str]) -> DbConfig:
     cfg = DbConfig()
     i = 0
@@ -235,7 +457,20 @@ def parse_args(argv: List[str]) -> DbConfig:
         if a == "--schema": cfg.schema = argv[i+1]; i += 2; continue
         if a == "--dim": cfg.dim = int(argv[i+1]); i += 2; continue
         if a == "--limit": cfg.limit = int(argv[i+1]); i += 2; continue
+        if a == "--chunk-size": cfg.chunk_size = int(argv[i+1]); i += 2; continue
+        if a == "--fit-rows": cfg.fit_rows = int(argv[i+1]); i += 2; continue
+        if a == "--mode": cfg.mode = argv[i+1]; i += 2; continue
+        if a == "--refit-days": cfg.refit_days = float(argv[i+1]); i += 2; continue
+        if a == "--where": cfg.where = argv[i+1]; i += 2; continue
+        if a == "--all": cfg.all_rows = True; i += 1; continue
+        if a == "--changes-since": cfg.changes_since = int(argv[i+1]); i += 2; continue
+        if a == "--model-dir": cfg.model_dir = argv[i+1]; i += 2; continue
+        if a == "--workers": cfg.workers = int(argv[i+1]); i += 2; continue
+        if a == "--retries": cfg.retries = int(argv[i+1]); i += 2; continue
+        if a == "--tables": cfg.tables = [t for t in argv[i+1].split(",") if t]; i += 2; continue
         i += 1
+    if cfg.mode not in ("auto", "transform", "refit"):
+        raise SystemExit(f"--mode must be auto, transform or refit (got {cfg.mode!r})")
     return cfg
 
 
@@ -244,28 +479,22 @@ def main():
     conn = connect_db(cfg)
     try:
         ensure_extension(conn)
-        tables = list_tables(conn, cfg.schema)
-        print(f"[INFO] schema={cfg.schema} tables={len(tables)}: {tables}")
-        for t in tables:
-            cols = list_columns(conn, cfg.schema, t)
-            tcols = text_columns(cols)
-            if not tcols:
-                print(f"[SKIP] {t}: no text columns")
-                continue
-            pk = get_primary_key(conn, cfg.schema, t)
-            eff_dim = ensure_embedding_column(conn, cfg.schema, t, cfg.dim)
-            rows = fetch_rows(conn, cfg.schema, t, pk, tcols, cfg.limit)
-            if not rows:
-                print(f"[SKIP] {t}: no rows")
-                continue
-            docs = build_docs(rows, tcols)
-            embs = fit_embeddings(docs, min(cfg.dim, eff_dim))
-            embs = pad_or_truncate(embs, eff_dim)
-            update_embeddings(conn, cfg.schema, t, pk, rows, embs)
-            print(f"[OK] {t}: {len(rows)} rows -> embedding vector({eff_dim})")
+        tables = cfg.tables or list_tables(conn, cfg.schema)
+        skipped = [t for t in tables if t in EXCLUDED_TABLES]
+        if skipped:
+            print(f"[SKIP] bookkeeping tables are never embedded: {skipped}")
+            tables = [t for t in tables if t not in EXCLUDED_TABLES]
+        # 큰 테이블부터 배정해 전체 소요 시간이 가장 큰 테이블 시간에 가깝도록 함
+        tables.sort(key=lambda t: estimate_rows(conn, cfg.schema, t), reverse=True)
     finally:
         conn.close()
+    print(f"[INFO] schema={cfg.schema} tables={len(tables)} workers={cfg.workers}: {tables}")
+    started = time.perf_counter()
+    results = run_tables(replace(cfg, tables=None), tables)
+    print_summary(results, time.perf_counter() - started)
     print("[DONE]")
+    if any(r.status == "failed" for r in results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
+import argparse
 import os
+import sys
 import psycopg2
-import numpy as np
 from sentence_transformers import SentenceTransformer
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.reembed import ResearcherReembedder  # noqa: E402
+
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_NAME = os.getenv("DB_NAME", "postgres")
 DB_USER = os.getenv("DB_USER", "postgres")
@@ -11,6 +15,8 @@ DB_SCHEMA = os.getenv("DB_SCHEMA", "scholar")
 
 MODEL_NAME = os.getenv("EMBEDDING_MODEL", "intfloat/multilingual-e5-large")
 DIM = int(os.getenv("EMBEDDING_DIM", "1024"))
+BATCH_SIZE = int(os.getenv("REEMBED_BATCH_SIZE", "64"))
+CHECKPOINT_ROWS = int(os.getenv("REEMBED_CHECKPOINT_ROWS", "2048"))
 
 
 def get_conn():
@@ -23,16 +29,19 @@ def get_conn():
     )
 
 
-def to_vec_literal(vec):
-    arr = np.asarray(vec, dtype="float32").reshape(-1)
-    if arr.shape[0] > DIM:
-        arr = arr[:DIM]
-    if arr.shape[0] < DIM:
-        arr = np.pad(arr, (0, DIM - arr.shape[0]))
-    return "[" + ",".join(f"{float(x):.6f}" for x in arr.tolist()) + "]"
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Re-embed researchers whose source text changed")
+    parser.add_argument("--force", action="store_true", help="re-embed every researcher")
+    # 해시는 mv_researcher_keywords 기준이므로 기본으로 먼저 갱신 (끄면 키워드 변경을 놓칠 수 있음)
+    parser.add_argument("--refresh-keywords", action=argparse.BooleanOptionalAction, default=True,
+                        help="refresh mv_researcher_keywords before hashing (default: on)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--checkpoint-rows", type=int, default=CHECKPOINT_ROWS)
+    return parser.parse_args(argv)
 
 
 def main():
+    args = parse_args(sys.argv[1:])
     model = SentenceTransformer(MODEL_NAME)
     with get_conn() as conn:
         with conn.cursor() as cur:
@@ -62,38 +71,25 @@ def main():
             )
             conn.commit()
 
-            # Load researcher name + keywords
-            cur.execute(
-                """
-                SELECT r.researcher_id,
-                       r.name,
-                       COALESCE(array_agg(DISTINCT tk.term) FILTER (WHERE tk.term IS NOT NULL), '{}') AS thesis_keywords,
-                       COALESCE(array_agg(DISTINCT pk.term) FILTER (WHERE pk.term IS NOT NULL), '{}') AS patent_keywords
-                  FROM tb_researcher r
-             LEFT JOIN tb_thesis_author ta ON ta.researcher_id = r.researcher_id
-             LEFT JOIN tb_thesis_keyword tk ON tk.thesis_id = ta.thesis_id
-             LEFT JOIN tb_patent_holder ph ON ph.researcher_id = r.researcher_id
-             LEFT JOIN tb_patent_keyword pk ON pk.patent_id = ph.patent_id
-              GROUP BY r.researcher_id, r.name
-                """
-            )
-            rows = cur.fetchall()
-
-            updated = 0
-            for rid, name, rk, pk in rows:
-                rk = rk or []
-                pk = pk or []
-                text = " ".join([str(name)] + [str(x) for x in rk] + [str(x) for x in pk])
-                emb = model.encode(text)
-                vec = to_vec_literal(emb)
-                cur.execute(
-                    'UPDATE tb_researcher SET "embedding" = (%s)::public.vector WHERE researcher_id = %s',
-                    (vec, rid)
-                )
-                updated += 1
+            if args.refresh_keywords:
+                cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_researcher_keywords")
+                conn.commit()
 
-            conn.commit()
-            print(f"[OK] updated {updated} researchers to vector(1024) using {MODEL_NAME}")
+        # Only researchers whose name/keywords hash changed (or with no embedding) are encoded;
+        # each checkpoint commits vectors + hashes so an interrupted run resumes where it stopped.
+        engine = ResearcherReembedder(
+            conn,
+            model,
+            MODEL_NAME,
+            DIM,
+            batch_size=args.batch_size,
+            checkpoint_rows=args.checkpoint_rows,
+        )
+        stats = engine.run(force=args.force)
+        print(
+            f"[OK] re-embedded {stats['reembedded']} researchers "
+            f"(skipped {stats['skipped']} unchanged) to vector(1024) using {MODEL_NAME}"
+        )
 
 
 if __name__ == "__main__":
@@ -10,6 +10,11 @@ from tqdm import tqdm
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.decomposition import TruncatedSVD
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.text_model_store import ModelStore, TextModel  # noqa: E402
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "models")
+
 
 @dataclass
 class DbConfig:
@@ -102,10 +107,14 @@ def build_text(row: Dict[str, object], text_cols: List[str]) -> str:
     return "\n".join(parts)
 
 
-def vectorize_rows(rows: List[Dict[str, object]], text_cols: List[str], n_components: int = 128) -> Tuple[np.ndarray, List[str]]:
+def vectorize_rows(rows: List[Dict[str, object]], text_cols: List[str], n_components: int = 128,
+                   model: Optional[TextModel] = None) -> Tuple[np.ndarray, List[str]]:
     documents = [build_text(r, text_cols) for r in rows]
     # 빈 문서 제거 방지: 최소 공백 넣기
     documents = [d if d.strip() else "_" for d in documents]
+    if model is not None:
+        # embed_all_tables.py가 저장한 테이블 모델로 변환 (DB 임베딩과 같은 공간)
+        return model.transform(documents), documents
     vectorizer = TfidfVectorizer(max_features=5000)
     X = vectorizer.fit_transform(documents)
     if X.shape[1] < n_components:
@@ -129,6 +138,7 @@ def inspect_and_vectorize(cfg: DbConfig, sample_limit: int = 5) -> None:
     out_dir = os.path.join(os.path.dirname(__file__), "outputs")
     ensure_dir(out_dir)
 
+    store = ModelStore(MODEL_DIR)
     with connect_db(cfg) as conn:
         tables = list_tables(conn, cfg.schema)
         print(f"[INFO] schema={cfg.schema} tables={len(tables)}: {tables}")
@@ -157,7 +167,11 @@ def inspect_and_vectorize(cfg: DbConfig, sample_limit: int = 5) -> None:
             if not text_cols or not samples:
                 continue
 
-            vectors, docs = vectorize_rows(samples, text_cols, n_components=128)
+            model = store.load(cfg.schema, table)
+            if model is not None and model.meta.get("text_columns") != text_cols:
+                model = None
+            print(f"  model: {model.version if model is not None else 'fit on samples'}")
+            vectors, docs = vectorize_rows(samples, text_cols, n_components=128, model=model)
             recs: List[Dict[str, object]] = []
             for i, row in enumerate(samples):
                 pk_val = row.get(pk) if pk else i
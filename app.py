@@ -1,12 +1,16 @@
-from flask import Flask, request, render_template, jsonify
+import json
+
+from flask import Flask, Response, request, render_template, jsonify, stream_with_context
 from dotenv import load_dotenv
 from core.config import AppConfig
 from core.vector_utils import VectorUtils
 from core.recommendation import ResearcherRecommender
 from core.analyzer import Assistant
 from core.api import search_papers_by_keyword, search_researchers_by_name
+from core.autocomplete import NameAutocomplete
 from psycopg2.extras import RealDictCursor
-from core.db import get_connection
+from core.db import get_connection, pool_stats
+from core import metrics
 
 # .env 파일 로드
 load_dotenv("settings/.env")
@@ -17,9 +21,31 @@ app = Flask(__name__)
 # 구성 요소 초기화
 config = AppConfig()
 embedding = VectorUtils(config)
+# 변경 로그를 주기적으로 읽어 바뀐 연구자만 인덱스에 반영
+embedding.start_refresh(config.vector_refresh_interval)
 recommender = ResearcherRecommender(embedding, config)
+# 이름 자동완성: 메모리의 연구자 이름으로 n-gram 색인 (NAME_AUTOCOMPLETE_NGRAM=0이면 DB 검색)
+autocomplete = NameAutocomplete(embedding, config.name_autocomplete_ngram) if config.name_autocomplete_ngram > 0 else None
 assistant = Assistant(config)
 
+# 지표: 스크레이프 시점에 캐시/연결 풀 카운터를 읽어 /metrics에 포함
+if config.metrics_enabled:
+    metrics.REGISTRY.register_collector(metrics.cache_collector(recommender.cache_stats))
+    metrics.REGISTRY.register_collector(metrics.pool_collector(pool_stats))
+    if config.metrics_request_log:
+        metrics.enable_request_log()
+
+    @app.before_request
+    def _metrics_begin():
+        rule = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        metrics.begin_request(request.method, rule)
+
+    @app.after_request
+    def _metrics_end(response):
+        # SSE 응답은 스트림이 끝나기 전(헤더 전송 시점)까지만 측정됩니다
+        metrics.end_request(response.status_code, log=config.metrics_request_log)
+        return response
+
 # 라우팅
 # 메인 화면 렌더링
 @app.route("/")
@@ -45,6 +71,21 @@ def assist_text():
         return jsonify({"error": "문장을 입력해주세요."}), 400
     return assistant.assist_from_text(text)
 
+def _recommend_payload(item):
+    """추천 결과 항목을 응답 JSON 형태로 변환합니다."""
+    return {
+        "researcher_id": item["researcher_id"],
+        "name": item["name"],
+        "score": item["score"],
+        "base_score": item["base_score"],
+        "impact_bonus": item["impact_bonus"],
+        "keyword_bonus": item["keyword_bonus"],
+        "research_keywords": item["research_keywords"],
+        "paper_keywords": item["paper_keywords"],
+        "reason_markdown": item["reason_markdown"],
+        "top_papers": item.get("top_papers", []),
+    }
+
 # 연구자 추천
 @app.route("/recommend", methods=["POST"])
 def recommend():
@@ -53,28 +94,98 @@ def recommend():
     if not query:
         return jsonify([])
     results = recommender.recommend(query)
-    payload = []
-    for item in results:
-        payload.append({
-            "researcher_id": item["researcher_id"],
-            "name": item["name"],
-            "score": item["score"],
-            "base_score": item["base_score"],
-            "impact_bonus": item["impact_bonus"],
-            "keyword_bonus": item["keyword_bonus"],
-            "research_keywords": item["research_keywords"],
-            "paper_keywords": item["paper_keywords"],
-            "reason_markdown": item["reason_markdown"],
-            "top_papers": item.get("top_papers", []),
-        })
-    return jsonify(payload)
+    return jsonify([_recommend_payload(item) for item in results])
+
+def _sse(event, data):
+    """server-sent events 한 건을 직렬화합니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+# 연구자 추천 (SSE 스트리밍)
+@app.route("/recommend/stream", methods=["GET", "POST"])
+def recommend_stream():
+    """추천 후보를 벡터 검색 직후 먼저 보내고, LLM 사유는 완성되는 대로 server-sent events로 보냅니다."""
+    if request.method == "POST":
+        query = (request.json or {}).get("query", "")
+    else:
+        query = request.args.get("q", "")
+
+    def events():
+        if not query:
+            yield _sse("candidates", [])
+            yield _sse("done", {"complete": True})
+            return
+        for event, data in recommender.recommend_stream(query):
+            if event == "candidates":
+                data = [_recommend_payload(item) for item in data]
+            yield _sse(event, data)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# 연구자 일괄 추천
+@app.route("/recommend/batch", methods=["POST"])
+def recommend_batch():
+    """여러 질의를 한 번에 인코딩/검색하여 질의별 추천 결과 목록을 반환합니다."""
+    body = request.json or {}
+    queries = body.get("queries", [])
+    if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+        return jsonify({"error": "queries는 문자열 목록이어야 합니다."}), 400
+    queries = [q for q in queries if q.strip()]
+    if len(queries) > config.recommend_batch_max_queries:
+        return jsonify({"error": f"queries는 최대 {config.recommend_batch_max_queries}개까지 허용됩니다."}), 400
+    top_k = body.get("top_k")
+    if top_k is not None:
+        try:
+            top_k = int(top_k)
+        except (TypeError, ValueError):
+            return jsonify({"error": "top_k는 정수여야 합니다."}), 400
+        if not 1 <= top_k <= config.max_top_k:
+            return jsonify({"error": f"top_k는 1 이상 {config.max_top_k} 이하여야 합니다."}), 400
+    # 일괄 호출은 기본적으로 LLM 사유 없이 템플릿 요약 사용 (JSON 불리언만 허용)
+    rationale = body.get("rationale", False)
+    if not isinstance(rationale, bool):
+        return jsonify({"error": "rationale는 true 또는 false여야 합니다."}), 400
+    if not queries:
+        return jsonify([])
+    results = recommender.recommend_many(
+        queries,
+        top_k=top_k,
+        rationale=rationale,
+    )
+    return jsonify([
+        {"query": query, "results": [_recommend_payload(item) for item in items]}
+        for query, items in zip(queries, results)
+    ])
+
+# 캐시 통계
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    """질의 임베딩/추천 결과 캐시의 적중·미스·축출 카운터를 반환합니다."""
+    return jsonify(recommender.cache_stats())
+
+# 검색 인덱스 정보
+@app.route("/index/info", methods=["GET"])
+def index_info():
+    """검색 인덱스 모드와 구축 시간, 근사 인덱스의 recall@k 점검 결과를 반환합니다."""
+    return jsonify(embedding.index_info)
+
+# Prometheus 지표
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """단계별 지연 히스토그램과 캐시/DB/LLM 카운터를 Prometheus 텍스트 형식으로 반환합니다."""
+    if not config.metrics_enabled:
+        return jsonify({"error": "metrics disabled"}), 404
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
 
 # 연구자 상세 조회
 @app.route("/researchers/<researcher_id>", methods=["GET"])
 def researcher_detail(researcher_id):
     """연구자 ID로 상세 프로필 정보를 JSON으로 반환합니다."""
     try:
-        with get_connection() as conn:
+        with metrics.db_span("researcher_detail"), get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
@@ -127,5 +238,25 @@ def researchers_search():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# 연구자 이름 자동완성
+@app.route("/researchers/autocomplete", methods=["GET"])
+def researchers_autocomplete():
+    """이름 접두사/부분 일치 연구자를 인메모리 색인에서 찾아 반환합니다."""
+    name = request.args.get("q", "")
+    if not name:
+        return jsonify([])
+    try:
+        limit = int(request.args.get("limit", 10))
+    except ValueError:
+        return jsonify({"error": "limit는 정수여야 합니다."}), 400
+    limit = max(1, min(limit, config.name_autocomplete_max_limit))
+    try:
+        if autocomplete is not None:
+            return jsonify(autocomplete.search(name, limit=limit))
+        rows = search_researchers_by_name(name, limit=limit)
+        return jsonify([{"researcher_id": r["researcher_id"], "name": r["name"]} for r in rows])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
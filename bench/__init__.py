@@ -0,0 +1,2 @@
+# bench/__init__.py
+"""합성 데이터 기반 성능 벤치마크 (python -m bench)."""
@@ -0,0 +1,89 @@
+# bench/__main__.py
+"""벤치마크 실행기.
+
+    python -m bench --researchers 10000 --suites vector,embed
+    python -m bench.synthetic --researchers 100000 --schema bench_scholar --dim 256
+    python -m bench --researchers 100000 --dim 256 --suites recommend,api,ingest --baseline data/bench/<이전>.json
+    python -m bench --suites encoder --encoder-backends torch,onnx,onnx-int8
+
+결과는 --out(기본 data/bench)에 JSON으로 저장되고, --baseline을 주면 p50 기준으로 비교합니다.
+DB 모음은 합성 데이터를 적재할 때와 같은 --researchers/--seed/--dim을 써야 질의가 데이터와 맞습니다.
+"""
+
+import argparse
+import os
+import sys
+
+from bench.harness import compare, print_table, save_results
+from bench.synthetic import SyntheticScholar
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="합성 데이터로 핫패스 성능을 측정합니다.")
+    parser.add_argument("--researchers", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dim", type=int, default=None, help="임베딩 차원 (기본: EMBEDDING_DIM)")
+    parser.add_argument("--suites", default="vector,embed", help="쉼표 구분: vector,embed,recommend,api,ingest,encoder")
+    parser.add_argument("--index-modes", default="flat,hnsw", help="vector 모음의 VECTOR_INDEX 모드")
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--schema", default="bench_scholar", help="DB 모음이 사용할 합성 데이터 스키마")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="스텁 LLM 호출 지연")
+    parser.add_argument("--ingest-researchers", type=int, default=5000)
+    parser.add_argument("--encoder-backends", default="torch,onnx,onnx-int8", help="encoder 모음의 ENCODER_BACKEND 목록")
+    parser.add_argument("--concurrency", type=int, default=64, help="encoder 모음의 동시 사용자 수")
+    parser.add_argument("--out", default=os.path.join("data", "bench"))
+    parser.add_argument("--label", default="")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 볼 p50 증가 비율")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # core.api / core.ingest는 기본 설정(DB_SCHEMA)의 풀을 쓰므로 첫 연결 전에 지정
+    os.environ["DB_SCHEMA"] = args.schema
+    from bench.suites import SUITES, BenchContext
+    from core.config import AppConfig
+
+    dim = args.dim or AppConfig().embedding_dim
+    names = [s.strip() for s in args.suites.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SUITES]
+    if unknown:
+        print(f"[ERROR] unknown suites: {unknown} (available: {', '.join(SUITES)})")
+        return 2
+    ctx = BenchContext(
+        data=SyntheticScholar(args.researchers, seed=args.seed),
+        dim=dim,
+        schema=args.schema,
+        rounds=args.rounds,
+        k=args.k,
+        n_queries=args.queries,
+        index_modes=[m.strip() for m in args.index_modes.split(",") if m.strip()],
+        llm_latency_ms=args.llm_latency_ms,
+        ingest_researchers=args.ingest_researchers,
+        encoder_backends=[b.strip() for b in args.encoder_backends.split(",") if b.strip()],
+        concurrency=args.concurrency,
+    )
+    results = []
+    for name in names:
+        print(f"[RUN] {name}", flush=True)
+        results.extend(SUITES[name](ctx))
+    print_table(results)
+    params = {k: v for k, v in vars(args).items() if k not in ("baseline", "out", "fail_on_regression")}
+    params["dim"] = dim
+    path = save_results(results, args.out, args.label, params)
+    print(f"\n[SAVED] {path}")
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"[REGRESSION] {', '.join(regressions)}")
+            if args.fail_on_regression:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# bench/harness.py
+"""pytest-benchmark 방식의 경량 측정기와 결과 저장/비교.
+
+각 측정은 warmup 후 rounds번 호출해 지연 분포(p50/p95/p99)와 처리량을 구하고,
+별도 1회 호출을 tracemalloc으로 감싸 최대 할당량을 잽니다. 결과는 실행 환경 정보와 함께
+JSON으로 저장되며, 이전 결과(baseline)와 비교해 지정 비율 이상 느려진 항목을 회귀로 표시합니다.
+"""
+
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # pragma: no cover (Windows)
+    resource = None  # type: ignore
+
+
+@dataclass
+class BenchResult:
+    name: str
+    rounds: int
+    items_per_call: int
+    mean_ms: float
+    min_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    throughput: float  # items/s (p50 기준)
+    peak_alloc_mb: float
+    params: Dict = field(default_factory=dict)
+
+
+def _rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024.0 if sys.platform != "darwin" else peak / (1024.0 * 1024.0)
+
+
+def measure(
+    name: str,
+    fn: Callable[[], object],
+    rounds: int = 20,
+    warmup: int = 2,
+    items_per_call: int = 1,
+    memory: bool = True,
+    params: Optional[Dict] = None,
+) -> BenchResult:
+    """fn을 warmup + rounds번 호출해 지연/처리량/메모리를 측정합니다."""
+    for _ in range(warmup):
+        fn()
+    gc.collect()
+    times = np.empty(max(1, rounds), dtype=np.float64)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(len(times)):
+            started = time.perf_counter()
+            fn()
+            times[i] = time.perf_counter() - started
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    peak_mb = 0.0
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024.0 * 1024.0)
+        finally:
+            tracemalloc.stop()
+    ms = times * 1000.0
+    p50 = float(np.percentile(ms, 50))
+    return BenchResult(
+        name=name,
+        rounds=len(times),
+        items_per_call=items_per_call,
+        mean_ms=round(float(ms.mean()), 4),
+        min_ms=round(float(ms.min()), 4),
+        p50_ms=round(p50, 4),
+        p95_ms=round(float(np.percentile(ms, 95)), 4),
+        p99_ms=round(float(np.percentile(ms, 99)), 4),
+        max_ms=round(float(ms.max()), 4),
+        throughput=round(items_per_call / (p50 / 1000.0), 2) if p50 > 0 else float("inf"),
+        peak_alloc_mb=round(peak_mb, 3),
+        params=dict(params or {}),
+    )
+
+
+def timed(name: str, fn: Callable[[], object], items: int = 1, params: Optional[Dict] = None) -> BenchResult:
+    """한 번만 실행하는 긴 작업(인덱스 구축, 적재 등)의 소요 시간을 BenchResult로 기록합니다."""
+    return measure(name, fn, rounds=1, warmup=0, items_per_call=items, memory=False, params=params)
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "commit": commit,
+    }
+
+
+def save_results(results: List[BenchResult], directory: str, label: str = "", params: Optional[Dict] = None) -> str:
+    """결과를 <directory>/<시각>[-label].json으로 저장하고 경로를 반환합니다."""
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{stamp}-{label}.json" if label else f"{stamp}.json")
+    payload = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "label": label,
+        "environment": environment(),
+        "params": dict(params or {}),
+        "max_rss_mb": round(_rss_mb(), 1),
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_results(path: str) -> Dict[str, Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return {r["name"]: r for r in payload.get("results", [])}
+
+
+def compare(results: List[BenchResult], baseline_path: str, threshold: float = 0.10) -> List[str]:
+    """baseline 대비 p50이 threshold 비율 이상 늘어난 항목 이름을 반환하고 비교표를 출력합니다."""
+    base = load_results(baseline_path)
+    regressions = []
+    print(f"\n{'benchmark':<40} {'base p50':>10} {'now p50':>10} {'change':>8}")
+    for r in results:
+        old = base.get(r.name)
+        if old is None or not old.get("p50_ms"):
+            print(f"{r.name:<40} {'-':>10} {r.p50_ms:>10.3f} {'new':>8}")
+            continue
+        change = r.p50_ms / old["p50_ms"] - 1.0
+        mark = ""
+        if change > threshold:
+            regressions.append(r.name)
+            mark = "  << regression"
+        print(f"{r.name:<40} {old['p50_ms']:>10.3f} {r.p50_ms:>10.3f} {change:>+7.1%}{mark}")
+    return regressions
+
+
+def print_table(results: List[BenchResult]) -> None:
+    print(f"\n{'benchmark':<40} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'items/s':>12} {'peak MB':>9}")
+    for r in results:
+        print(f"{r.name:<40} {r.p50_ms:>10.3f} {r.p95_ms:>10.3f} {r.p99_ms:>10.3f} "
+              f"{r.throughput:>12.1f} {r.peak_alloc_mb:>9.2f}")
@@ -0,0 +1,100 @@
+# bench/stubs.py
+"""벤치마크용 인코더/LLM 대역.
+
+StubEncoder는 토큰별 고정 난수 벡터의 합으로 문장을 인코딩하므로, 키워드를 공유하는
+문장끼리 실제로 가까워져 검색 결과가 의미 있게 나옵니다. exclusive=True이면 지연 구간을
+한 번에 하나의 호출만 지나가게 해 CPU를 다 쓰는 실제 모델의 forward pass를 흉내 냅니다. StubLLM은 OpenAI 클라이언트의
+``chat.completions.create`` 모양만 흉내 내며 지연/실패율을 조절할 수 있습니다.
+"""
+
+import random
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Dict, List, Union
+
+import numpy as np
+
+
+class StubEncoder:
+    """SentenceTransformer.encode 호환 결정적 인코더."""
+
+    def __init__(self, dim: int = 1024, latency_ms: float = 0.0, per_text_ms: float = 0.0, exclusive: bool = False):
+        self.dim = dim
+        self.latency_ms = latency_ms
+        self.per_text_ms = per_text_ms
+        self.exclusive = exclusive
+        self._busy = threading.Lock()
+        self.calls = 0
+        self.texts = 0
+        self._tokens: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _token_vector(self, token: str) -> np.ndarray:
+        vec = self._tokens.get(token)
+        if vec is None:
+            rng = np.random.default_rng(zlib.crc32(token.encode("utf-8")))
+            vec = rng.standard_normal(self.dim).astype(np.float32)
+            with self._lock:
+                self._tokens[token] = vec
+        return vec
+
+    def encode_one(self, text: str) -> np.ndarray:
+        tokens = str(text).replace(",", " ").lower().split() or ["_"]
+        vec = np.sum([self._token_vector(tok) for tok in tokens], axis=0)
+        return (vec / (np.linalg.norm(vec) + 1e-8)).astype(np.float32)
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False,
+        normalize_embeddings: bool = False,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        self.calls += 1
+        self.texts += len(texts)
+        delay = self.latency_ms * max(1, -(-len(texts) // max(1, batch_size))) + self.per_text_ms * len(texts)
+        if delay > 0:
+            if self.exclusive:
+                with self._busy:
+                    time.sleep(delay / 1000.0)
+            else:
+                time.sleep(delay / 1000.0)
+        out = np.vstack([self.encode_one(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+        return out[0] if single else out
+
+
+class _Completions:
+    def __init__(self, llm: "StubLLM"):
+        self._llm = llm
+
+    def create(self, model=None, messages=None, **kwargs):
+        llm = self._llm
+        with llm._lock:
+            llm.calls += 1
+            fail = llm._rng.random() < llm.failure_rate
+        if llm.latency_ms > 0:
+            time.sleep(llm.latency_ms / 1000.0)
+        if fail:
+            raise TimeoutError("stub llm failure")
+        prompt = (messages or [{}])[-1].get("content", "")
+        text = f"{llm.reply} (prompt {len(prompt)} chars)"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class StubLLM:
+    """OpenAI 클라이언트 대역: client.chat.completions.create(...)만 제공합니다."""
+
+    def __init__(self, latency_ms: float = 0.0, failure_rate: float = 0.0, seed: int = 0,
+                 reply: str = "질의와 연구 주제가 겹치는 연구자입니다."):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.reply = reply
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_Completions(self))
@@ -0,0 +1,339 @@
+# bench/suites.py
+"""핫패스별 벤치마크 모음.
+
+- vector: VectorUtils.topk / topk_many (인덱스 모드별, DB 없이 합성 행렬로 구성)
+- embed: TF-IDF/SVD 학습·변환(core.text_model_store), DB가 있으면 embed_all_tables 테이블 1개
+- recommend: ResearcherRecommender.recommend / recommend_many (DB + 스텁 인코더/LLM)
+- api: core.api.search_* (DB, pg_trgm 인덱스)
+- ingest: core.ingest.excel_to_db 전체 적재와 무변경 재적재 (DB + openpyxl)
+- encoder: 질의 인코더 백엔드(torch/onnx/onnx-int8)별 지연·처리량과 fp32 대비 코사인 일치도 (실제 모델),
+  동시 사용자 단건 인코딩의 직접 호출 대비 BatchingEncoder 처리량 (실제 모델이 없으면 스텁 인코더)
+
+DB가 필요한 모음은 합성 데이터가 적재된 스키마(python -m bench.synthetic)를 사용합니다.
+"""
+
+import importlib.util
+import itertools
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from bench.harness import BenchResult, measure, timed
+from bench.stubs import StubEncoder, StubLLM
+from bench.synthetic import SyntheticScholar
+from core.config import AppConfig
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class BenchContext:
+    data: SyntheticScholar
+    dim: int
+    schema: str = "bench_scholar"
+    rounds: int = 30
+    k: int = 50
+    n_queries: int = 200
+    batch: int = 256
+    index_modes: List[str] = field(default_factory=lambda: ["flat", "hnsw"])
+    llm_latency_ms: float = 0.0
+    ingest_researchers: int = 5000
+    encoder_backends: List[str] = field(default_factory=lambda: ["torch", "onnx", "onnx-int8"])
+    concurrency: int = 64
+    log: Callable[[str], None] = print
+
+    def config(self, **overrides) -> AppConfig:
+        """벤치마크용 설정: 캐시/스냅샷을 끄고 합성 스키마/차원을 사용합니다."""
+        cfg = AppConfig()
+        cfg.db_schema = self.schema
+        cfg.embedding_dim = self.dim
+        cfg.vector_snapshot_dir = ""
+        cfg.cache_embedding_size = 0
+        cfg.cache_result_size = 0
+        cfg.similarity_threshold = -1.0
+        for key, value in overrides.items():
+            setattr(cfg, key, value)
+        return cfg
+
+    def queries(self) -> List[str]:
+        return self.data.queries(self.n_queries)
+
+
+def _cycle(items):
+    it = itertools.cycle(items)
+    return lambda: next(it)
+
+
+def db_available(ctx: BenchContext) -> Optional[str]:
+    """DB에 접속할 수 없으면 사유 문자열을, 가능하면 None을 반환합니다."""
+    cfg = ctx.config()
+    if not cfg.db_host:
+        return "DB_HOST not set"
+    try:
+        from core.db import get_connection
+
+        with get_connection(cfg) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT to_regclass(%s) IS NOT NULL", (f"{ctx.schema}.tb_researcher",))
+                if not cur.fetchone()[0]:
+                    return f"{ctx.schema}.tb_researcher missing (run python -m bench.synthetic --schema {ctx.schema})"
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+    return None
+
+
+def vector_suite(ctx: BenchContext) -> List[BenchResult]:
+    from core.vector_utils import VectorUtils
+
+    encoder = StubEncoder(ctx.dim)
+    started = time.perf_counter()
+    ids, names, rk, pk, mat = ctx.data.arrays(encoder)
+    ctx.log(f"[..] synthetic matrix {mat.shape} in {time.perf_counter() - started:.1f}s")
+    texts = ctx.queries()
+    Q = encoder.encode(texts)
+    single = _cycle(list(Q))
+    pairs = _cycle(list(zip(Q, texts)))
+    batch, batch_texts = Q[:ctx.batch], texts[:ctx.batch]
+    results = []
+    for mode in ctx.index_modes:
+        # BM25 색인도 함께 만들고, 질의 원문을 넘기지 않는 호출은 기존 dense 경로 그대로 측정
+        cfg = ctx.config(vector_index=mode, vector_search="hybrid")
+        started = time.perf_counter()
+        vu = VectorUtils.from_arrays(cfg, ids, names, mat, rk, pk, model=encoder)
+        build = time.perf_counter() - started
+        params = {"rows": len(ids), "dim": ctx.dim, "k": ctx.k, **vu.index_info, "build_seconds": round(build, 3),
+                  **{f"store_{name}_bytes": size for name, size in vu.store.memory().items()}}
+        results.append(measure(f"vector.topk[{mode}]", lambda: vu.topk(single(), ctx.k),
+                               rounds=ctx.rounds * 10, params=params))
+        results.append(measure(f"vector.topk_many[{mode}]", lambda: vu.topk_many(batch, ctx.k),
+                               rounds=ctx.rounds, items_per_call=len(batch), params=params))
+
+        def hybrid_one():
+            q, text = pairs()
+            return vu.topk(q, ctx.k, text=text)
+
+        for fusion in ("rrf", "weighted"):
+            vu.config.hybrid_fusion = fusion
+            hybrid_params = {**params, "fusion": fusion, "pool": cfg.hybrid_pool}
+            results.append(measure(f"vector.topk[{mode},hybrid-{fusion}]", hybrid_one,
+                                   rounds=ctx.rounds * 10, params=hybrid_params))
+            results.append(measure(f"vector.topk_many[{mode},hybrid-{fusion}]",
+                                   lambda: vu.topk_many(batch, ctx.k, texts=batch_texts),
+                                   rounds=ctx.rounds, items_per_call=len(batch), params=hybrid_params))
+        del vu
+    return results
+
+
+def _load_embed_script():
+    spec = importlib.util.spec_from_file_location("embed_all_tables", os.path.join(_ROOT, "aiuse", "embed_all_tables.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+def embed_suite(ctx: BenchContext) -> List[BenchResult]:
+    from core.text_model_store import fit_text_model
+
+    docs = [th["title"] for r in ctx.data.iter_researchers(0, min(ctx.data.n, 20000)) for th in r["theses"]]
+    chunks = [docs[i:i + 5000] for i in range(0, len(docs), 5000)]
+    holder = {}
+
+    def fit():
+        holder["model"], _ = fit_text_model(iter(chunks), 128, fit_rows=50000)
+
+    results = [timed("embed.fit_text_model", fit, items=len(docs), params={"docs": len(docs)})]
+    model = holder["model"]
+    sample = docs[:1000]
+    results.append(measure("embed.transform[1000]", lambda: model.transform(sample),
+                           rounds=ctx.rounds, items_per_call=len(sample)))
+
+    reason = db_available(ctx)
+    if reason:
+        ctx.log(f"[SKIP] embed.table: {reason}")
+        return results
+    script = _load_embed_script()
+    app = ctx.config()
+    with tempfile.TemporaryDirectory() as model_dir:
+        cfg = script.DbConfig(host=app.db_host, dbname=app.db_name, user=app.db_user, password=app.db_password,
+                              schema=ctx.schema, dim=128, mode="refit", model_dir=model_dir)
+        rows = {}
+
+        def run():
+            rows["n"] = script.embed_one_table(cfg, "tb_thesis").rows
+
+        result = timed("embed.table[tb_thesis]", run)
+        result.items_per_call = rows.get("n", 0)
+        result.throughput = round(rows.get("n", 0) / max(result.p50_ms / 1000.0, 1e-9), 2)
+        results.append(result)
+    return results
+
+
+def recommend_suite(ctx: BenchContext) -> List[BenchResult]:
+    reason = db_available(ctx)
+    if reason:
+        ctx.log(f"[SKIP] recommend: {reason}")
+        return []
+    from core.recommendation import ResearcherRecommender
+    from core.vector_utils import VectorUtils
+
+    cfg = ctx.config()
+    encoder = StubEncoder(ctx.dim)
+    holder = {}
+    results = [timed("recommend.load_vectors", lambda: holder.setdefault("vu", VectorUtils(cfg, model=encoder)))]
+    vu = holder["vu"]
+    results[0].items_per_call = len(vu.researcher_ids)
+    llm = StubLLM(latency_ms=ctx.llm_latency_ms)
+    rec = ResearcherRecommender(vu, cfg, client=llm)
+    queries = ctx.queries()
+    params = {"rows": len(vu.researcher_ids), "llm_latency_ms": ctx.llm_latency_ms, "top_k": cfg.top_k}
+    results.append(measure("recommend.recommend", lambda q=_cycle(queries): rec.recommend(q()),
+                           rounds=ctx.rounds, params=params))
+    batch = queries[:32]
+    results.append(measure("recommend.recommend_many[32,no-llm]",
+                           lambda: rec.recommend_many(batch, rationale=False),
+                           rounds=max(3, ctx.rounds // 5), items_per_call=len(batch), params=params))
+    return results
+
+
+def api_suite(ctx: BenchContext) -> List[BenchResult]:
+    reason = db_available(ctx)
+    if reason:
+        ctx.log(f"[SKIP] api: {reason}")
+        return []
+    from core import api
+
+    terms = [t for topic in ctx.data.topic_terms[:50] for t in topic[:3]]
+    names = [r["name"][:2] for r in ctx.data.iter_researchers(0, 200)]
+    params = {"researchers": ctx.data.n}
+    return [
+        measure("api.search_papers_by_keyword", lambda t=_cycle(terms): api.search_papers_by_keyword(t()),
+                rounds=ctx.rounds, params=params),
+        measure("api.search_researchers_by_name", lambda n=_cycle(names): api.search_researchers_by_name(n()),
+                rounds=ctx.rounds, params=params),
+    ]
+
+
+_INGEST_TABLES = ["pseudonym", "paper_keyword", "paper_author", "paper", "patent", "researcher",
+                  "ingest_changeset", "ingest_fingerprint", "ingest_run"]
+
+
+def ingest_suite(ctx: BenchContext) -> List[BenchResult]:
+    reason = db_available(ctx)
+    if reason:
+        ctx.log(f"[SKIP] ingest: {reason}")
+        return []
+    from pathlib import Path
+
+    from core.db import get_connection
+    from core.ingest.excel_to_db import ingest_excel_to_db
+
+    n = min(ctx.data.n, ctx.ingest_researchers)
+    with get_connection(ctx.config()) as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE " + ", ".join(f"{ctx.schema}.{t}" for t in _INGEST_TABLES) + " CASCADE")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(ctx.data.write_workbook(os.path.join(tmp, "bench.xlsx"), 0, n))
+        params = {"researchers": n, "bytes": path.stat().st_size}
+        return [
+            timed("ingest.excel[full]", lambda: ingest_excel_to_db(path), items=n, params=params),
+            timed("ingest.excel[unchanged]", lambda: ingest_excel_to_db(path), items=n, params=params),
+        ]
+
+
+def _concurrent_encode(encoder, texts: List[str], users: int) -> Callable[[], None]:
+    """users개 스레드가 동시에 단건 encode를 한 번씩 호출하는 측정 대상 함수를 만듭니다."""
+    pool = ThreadPoolExecutor(max_workers=users)
+    next_text = _cycle(texts)
+
+    def run():
+        batch = [next_text() for _ in range(users)]
+        list(pool.map(encoder.encode, batch))
+
+    run.pool = pool  # type: ignore[attr-defined]
+    return run
+
+
+def _batching_results(ctx: BenchContext, name: str, encoder, texts: List[str], params: Dict) -> List[BenchResult]:
+    """직접 호출과 BatchingEncoder의 동시 단건 인코딩 처리량을 비교합니다."""
+    from core.encoders import BatchingEncoder
+
+    cfg = ctx.config()
+    results = []
+    for label, target in (("direct", encoder),
+                          ("batched", BatchingEncoder(encoder, cfg.encoder_batch_max, cfg.encoder_batch_wait_ms))):
+        run = _concurrent_encode(target, texts, ctx.concurrency)
+        try:
+            results.append(measure(f"encoder.concurrent{ctx.concurrency}[{name},{label}]", run,
+                                   rounds=max(3, ctx.rounds // 3), items_per_call=ctx.concurrency, memory=False,
+                                   params={**params, "users": ctx.concurrency,
+                                           "batch_max": cfg.encoder_batch_max,
+                                           "batch_wait_ms": cfg.encoder_batch_wait_ms}))
+        finally:
+            run.pool.shutdown()
+    return results
+
+
+def encoder_suite(ctx: BenchContext) -> List[BenchResult]:
+    """백엔드별 단건/배치 인코딩 지연과, fp32 기준(torch, 없으면 onnx) 임베딩과의 코사인 일치도."""
+    from core.encoders import ENCODER_BACKENDS, load_encoder
+
+    cfg = ctx.config()
+    texts = ctx.queries()
+    batch = texts[:32]
+    # fp32 백엔드를 먼저 실행해 기준 임베딩으로 사용
+    backends = sorted(ctx.encoder_backends, key=lambda b: ENCODER_BACKENDS.index(b) if b in ENCODER_BACKENDS else 99)
+    reference = None
+    reference_name = ""
+    results = []
+    for backend in backends:
+        try:
+            encoder = load_encoder(cfg, backend)
+            encoder = getattr(encoder, "encoder", encoder)  # 병합 래퍼는 _batching_results에서 따로 측정
+        except (RuntimeError, ValueError) as exc:
+            ctx.log(f"[SKIP] encoder[{backend}]: {exc}")
+            continue
+        if encoder is None:
+            ctx.log(f"[SKIP] encoder[{backend}]: sentence-transformers not installed")
+            continue
+        vecs = np.asarray(encoder.encode(texts, batch_size=32), dtype=np.float32)
+        vecs /= np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+        params = {"backend": backend, "texts": len(texts), "threads": cfg.encoder_threads}
+        if reference is None and backend != "onnx-int8":
+            reference, reference_name = vecs, backend
+        elif reference is not None and reference.shape == vecs.shape:
+            cos = np.einsum("ij,ij->i", reference, vecs)
+            params.update({
+                "reference": reference_name,
+                "cosine_mean": round(float(cos.mean()), 5),
+                "cosine_p01": round(float(np.percentile(cos, 1)), 5),
+                "cosine_min": round(float(cos.min()), 5),
+            })
+            ctx.log(f"[..] encoder[{backend}] cosine vs {reference_name}: "
+                    f"mean {params['cosine_mean']} / min {params['cosine_min']}")
+        results.append(measure(f"encoder.encode[{backend}]", lambda q=_cycle(texts): encoder.encode(q()),
+                               rounds=ctx.rounds, params=params))
+        results.append(measure(f"encoder.encode_batch32[{backend}]",
+                               lambda: encoder.encode(batch, batch_size=32),
+                               rounds=max(3, ctx.rounds // 3), items_per_call=len(batch), params=params))
+        results.extend(_batching_results(ctx, backend, encoder, texts, params))
+        del encoder
+    if not results:
+        # 실제 모델이 없으면 배치당 고정 비용이 큰 스텁으로 병합 효과만 확인
+        stub = StubEncoder(ctx.dim, latency_ms=4.0, per_text_ms=0.1, exclusive=True)
+        results.extend(_batching_results(ctx, "stub", stub, texts, {"backend": "stub", "latency_ms": 4.0, "per_text_ms": 0.1}))
+    return results
+
+
+SUITES: Dict[str, Callable[[BenchContext], List[BenchResult]]] = {
+    "vector": vector_suite,
+    "embed": embed_suite,
+    "recommend": recommend_suite,
+    "api": api_suite,
+    "ingest": ingest_suite,
+    "encoder": encoder_suite,
+}
@@ -0,0 +1,384 @@
+# bench/synthetic.py
+"""scholar 스키마 모양의 합성 데이터 생성기.
+
+연구자마다 주제(topic)를 하나 정하고, 논문/특허 키워드를 그 주제의 용어에서 Zipf 분포로
+뽑습니다. 연구자 i의 모든 행은 (seed, i)로 정해지는 난수로 만들어지므로 규모와 관계없이
+같은 설정이면 같은 데이터가 나오고, 전체를 메모리에 올리지 않고 테이블별로 스트리밍할 수 있습니다.
+
+사용 예 (DB에 bench_scholar 스키마로 적재)::
+
+    python -m bench.synthetic --researchers 100000 --schema bench_scholar --dim 256
+"""
+
+import argparse
+import csv
+import os
+import random
+import re
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_HANGUL = [chr(c) for c in range(0xAC00, 0xD7A4, 37)]
+_SURNAMES = "김이박최정강조윤장임한오서신권황안송전홍"
+_LETTERS = "bcdfghklmnprstvz"
+_VOWELS = "aeiou"
+_GRADES = ["SCI", "SCIE", "KCI", "SCOPUS", "기타"]
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_MIGRATIONS = os.path.join(_ROOT, "migrations")
+
+# 엑셀 적재(core/ingest/excel_to_db.py) 시트 헤더
+RESEARCHER_HEADER = ['사용자번호', '연구자명', '소속', '직급', '연락처', '이메일', '전공',
+                     '연구실 위치', '실험실', '웹사이트', '주요약력', '주요경력', '연구분야']
+PAPER_HEADER = ['순번', '제목', '논문등급', '발행기관', 'ISBN', '발행국가', 'JCR', 'IF',
+                '노션여부', 'ISBN온라인여부', '사용자번호', '교신저자여부', '키워드']
+PATENT_HEADER = ['순번', '기술구분', '기술명', '기술분류', '대표 발명자', '대표 발명자 번호', '키워드']
+
+
+class SyntheticScholar:
+    """합성 연구자/논문/특허/키워드 생성기."""
+
+    def __init__(
+        self,
+        researchers: int = 10000,
+        theses_per_researcher: float = 4.0,
+        patents_per_researcher: float = 0.5,
+        keywords_per_item: int = 4,
+        topics: int = 200,
+        vocab: int = 20000,
+        journals: int = 500,
+        seed: int = 0,
+    ):
+        self.n = researchers
+        self.theses_per = theses_per_researcher
+        self.patents_per = patents_per_researcher
+        self.keywords_per = keywords_per_item
+        self.topics = max(1, topics)
+        self.journals = max(1, journals)
+        self.seed = seed
+        rng = random.Random(seed)
+        words = set()
+        while len(words) < vocab:
+            if rng.random() < 0.5:
+                words.add("".join(rng.choice(_HANGUL) for _ in range(rng.randint(2, 4))))
+            else:
+                words.add("".join(rng.choice(_LETTERS) + rng.choice(_VOWELS) for _ in range(rng.randint(2, 4))))
+        self.vocab = sorted(words)
+        rng.shuffle(self.vocab)
+        per_topic = max(8, min(64, vocab // self.topics * 2))
+        self.topic_terms = [rng.sample(self.vocab, per_topic) for _ in range(self.topics)]
+        # Zipf 가중치: 주제 안에서 앞쪽 용어가 자주 등장
+        self._weights = [1.0 / (r + 1) for r in range(per_topic)]
+        # 연구자별 논문/특허 ID 구간 (결정적 ID를 위해 최대 개수만큼 예약)
+        self._max_theses = max(1, int(round(self.theses_per * 2)))
+        self._max_patents = max(1, int(round(self.patents_per * 2)) + 1)
+
+    # ---- 연구자 단위 생성 ----
+
+    def _rng(self, i: int) -> random.Random:
+        return random.Random(self.seed * 1_000_003 + i)
+
+    def _terms(self, rng: random.Random, topic: int, k: int) -> List[str]:
+        terms = self.topic_terms[topic]
+        picked = rng.choices(terms, weights=self._weights, k=k)
+        if rng.random() < 0.2:
+            picked[-1] = rng.choice(self.vocab)
+        return list(dict.fromkeys(picked))
+
+    def researcher_id(self, i: int) -> int:
+        return 1000 + i
+
+    def researcher(self, i: int) -> Dict:
+        """연구자 i와 그의 논문/특허를 만듭니다."""
+        rng = self._rng(i)
+        topic = i % self.topics
+        rid = self.researcher_id(i)
+        name = rng.choice(_SURNAMES) + rng.choice(_HANGUL) + rng.choice(_HANGUL)
+        theses = []
+        for k in range(rng.randint(0, self._max_theses)):
+            terms = self._terms(rng, topic, self.keywords_per)
+            coauthor = None
+            if self.n > self.topics and rng.random() < 0.3:
+                j = rng.randrange(topic, self.n, self.topics)
+                if j != i:
+                    coauthor = self.researcher_id(j)
+            theses.append({
+                "thesis_id": rid * self._max_theses + k,
+                "title": " ".join(terms) + f" 연구 {k + 1}",
+                "journal_id": rng.randrange(self.journals) + 1,
+                "grade": rng.choice(_GRADES),
+                "jcr": round(rng.random() * 100, 2),
+                "impact_factor": round(rng.expovariate(0.5), 3),
+                "keywords": terms,
+                "coauthor": coauthor,
+                "corresponding": rng.random() < 0.4,
+            })
+        patents = []
+        n_patents = sum(1 for _ in range(self._max_patents) if rng.random() < self.patents_per / self._max_patents)
+        for k in range(n_patents):
+            terms = self._terms(rng, topic, self.keywords_per)
+            patents.append({
+                "patent_id": rid * self._max_patents + k,
+                "title": " ".join(terms) + " 장치 및 방법",
+                "keywords": terms,
+            })
+        return {
+            "researcher_id": rid,
+            "name": name,
+            "department": f"학과{topic % 50 + 1}",
+            "email": f"r{rid}@example.ac.kr",
+            "topic": topic,
+            "theses": theses,
+            "patents": patents,
+        }
+
+    def iter_researchers(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+        for i in range(start, self.n if stop is None else min(stop, self.n)):
+            yield self.researcher(i)
+
+    @staticmethod
+    def keywords(r: Dict) -> Tuple[List[str], List[str]]:
+        rk = list(dict.fromkeys(t for th in r["theses"] for t in th["keywords"]))
+        pk = list(dict.fromkeys(t for p in r["patents"] for t in p["keywords"]))
+        return rk, pk
+
+    @classmethod
+    def source_text(cls, r: Dict) -> str:
+        """임베딩 원문 (core.reembed.source_text와 같은 구성)."""
+        rk, pk = cls.keywords(r)
+        return " ".join([r["name"]] + rk + pk)
+
+    def queries(self, n: int, seed: int = 1) -> List[str]:
+        """주제 용어 2~3개로 된 검색 질의를 만듭니다."""
+        rng = random.Random(seed)
+        out = []
+        for _ in range(n):
+            topic = rng.randrange(self.topics)
+            out.append(" ".join(rng.sample(self.topic_terms[topic], rng.randint(2, 3))))
+        return out
+
+    # ---- 메모리 내 배열 (DB 없는 벤치마크용) ----
+
+    def arrays(self, encoder, batch: int = 4096):
+        """(ids, names, rk, pk, matrix)를 반환합니다. matrix는 encoder로 인코딩한 (n, dim) float32입니다."""
+        ids, names, rks, pks = [], [], [], []
+        mat = np.empty((self.n, encoder.dim), dtype=np.float32)
+        texts: List[str] = []
+        for i, r in enumerate(self.iter_researchers()):
+            rk, pk = self.keywords(r)
+            ids.append(r["researcher_id"])
+            names.append(r["name"])
+            rks.append(rk)
+            pks.append(pk)
+            texts.append(self.source_text(r))
+            if len(texts) == batch or i == self.n - 1:
+                mat[i + 1 - len(texts):i + 1] = encoder.encode(texts)
+                texts = []
+        return ids, names, rks, pks, mat
+
+    # ---- CSV / 엑셀 출력 ----
+
+    def write_csv(self, directory: str) -> Dict[str, str]:
+        """테이블별 CSV를 스트리밍으로 씁니다. {테이블: 경로}를 반환합니다."""
+        os.makedirs(directory, exist_ok=True)
+        tables = ["tb_researcher", "tb_jounal", "tb_thesis", "tb_thesis_author", "tb_thesis_keyword",
+                  "tb_patent", "tb_patent_holder", "tb_patent_keyword"]
+        paths = {t: os.path.join(directory, f"{t}.csv") for t in tables}
+        files = {t: open(p, "w", encoding="utf-8", newline="") for t, p in paths.items()}
+        try:
+            w = {t: csv.writer(f) for t, f in files.items()}
+            for j in range(1, self.journals + 1):
+                w["tb_jounal"].writerow([j, f"Journal of {self.vocab[j % len(self.vocab)]} {j}"])
+            for r in self.iter_researchers():
+                rid = r["researcher_id"]
+                w["tb_researcher"].writerow([rid, r["name"], r["department"], r["email"]])
+                for th in r["theses"]:
+                    tid = th["thesis_id"]
+                    w["tb_thesis"].writerow(
+                        [tid, th["title"], th["journal_id"], th["grade"], th["jcr"], th["impact_factor"]])
+                    w["tb_thesis_author"].writerow([tid, rid])
+                    if th["coauthor"] is not None:
+                        w["tb_thesis_author"].writerow([tid, th["coauthor"]])
+                    for term in th["keywords"]:
+                        w["tb_thesis_keyword"].writerow([tid, term])
+                for p in r["patents"]:
+                    w["tb_patent"].writerow([p["patent_id"], p["title"]])
+                    w["tb_patent_holder"].writerow([p["patent_id"], rid])
+                    for term in p["keywords"]:
+                        w["tb_patent_keyword"].writerow([p["patent_id"], term])
+        finally:
+            for f in files.values():
+                f.close()
+        return paths
+
+    def write_workbook(self, path: str, start: int = 0, stop: Optional[int] = None) -> str:
+        """엑셀 적재 벤치마크용 워크북(연구자/논문/특허/가명처리 시트)을 씁니다."""
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        sheets = {
+            '연구자': RESEARCHER_HEADER,
+            '논문': PAPER_HEADER,
+            '특허': PATENT_HEADER,
+            '가명처리': ['사용자번호', '가명'],
+        }
+        ws = {}
+        for title, header in sheets.items():
+            ws[title] = wb.create_sheet(title)
+            ws[title].append(header)
+        for r in self.iter_researchers(start, stop):
+            rid = r["researcher_id"]
+            ws['연구자'].append([rid, r["name"], r["department"], "교수", "", r["email"], r["department"],
+                               "", "", "", "", "", ", ".join(self.keywords(r)[0][:5])])
+            for th in r["theses"]:
+                ws['논문'].append([th["thesis_id"], th["title"], th["grade"], "출판사", "", "KR", th["jcr"],
+                                 th["impact_factor"], "X", "O", rid, "O" if th["corresponding"] else "X",
+                                 "; ".join(th["keywords"])])
+            for p in r["patents"]:
+                ws['특허'].append([p["patent_id"], "특허", p["title"], "", r["name"], rid, ", ".join(p["keywords"])])
+            ws['가명처리'].append([rid, f"연구자{rid}"])
+        wb.save(path)
+        return path
+
+
+# ---- DB 적재 ----
+
+_SCHOLAR_DDL = """
+CREATE SCHEMA IF NOT EXISTS {schema};
+CREATE EXTENSION IF NOT EXISTS vector;
+DROP MATERIALIZED VIEW IF EXISTS {schema}.mv_researcher_keywords;
+DROP TABLE IF EXISTS {schema}.tb_researcher, {schema}.tb_jounal, {schema}.tb_thesis,
+    {schema}.tb_thesis_author, {schema}.tb_thesis_keyword, {schema}.tb_patent,
+    {schema}.tb_patent_holder, {schema}.tb_patent_keyword, {schema}.tb_researcher_embedding_state CASCADE;
+CREATE TABLE {schema}.tb_researcher (
+    researcher_id BIGINT PRIMARY KEY, name TEXT NOT NULL, department TEXT, email TEXT, embedding vector({dim}));
+CREATE TABLE {schema}.tb_jounal (journal_id BIGINT PRIMARY KEY, name TEXT);
+CREATE TABLE {schema}.tb_thesis (
+    thesis_id BIGINT PRIMARY KEY, title TEXT, journal_id BIGINT, grade TEXT, jcr NUMERIC, impact_factor NUMERIC);
+CREATE TABLE {schema}.tb_thesis_author (thesis_id BIGINT NOT NULL, researcher_id BIGINT NOT NULL);
+CREATE TABLE {schema}.tb_thesis_keyword (thesis_id BIGINT NOT NULL, term TEXT NOT NULL);
+CREATE TABLE {schema}.tb_patent (patent_id BIGINT PRIMARY KEY, title TEXT);
+CREATE TABLE {schema}.tb_patent_holder (patent_id BIGINT NOT NULL, researcher_id BIGINT NOT NULL);
+CREATE TABLE {schema}.tb_patent_keyword (patent_id BIGINT NOT NULL, term TEXT NOT NULL);
+"""
+
+_SCHOLAR_INDEXES = """
+CREATE INDEX ON {schema}.tb_thesis_author (researcher_id);
+CREATE INDEX ON {schema}.tb_patent_holder (researcher_id);
+CREATE INDEX ON {schema}.tb_patent_keyword (patent_id);
+"""
+
+
+def _migration_sql(name: str, schema: str) -> str:
+    """마이그레이션 파일의 스키마 한정자(scholar./researcher.)를 벤치마크 스키마로 바꿉니다."""
+    with open(os.path.join(_MIGRATIONS, name), "r", encoding="utf-8") as f:
+        text = f.read()
+    text = re.sub(r"\b(scholar|researcher)\.", f"{schema}.", text)
+    return re.sub(r"CREATE SCHEMA IF NOT EXISTS \w+;", f"CREATE SCHEMA IF NOT EXISTS {schema};", text)
+
+
+def load_into_db(conn, data: SyntheticScholar, schema: str, encoder, batch: int = 10000,
+                 log=print) -> Dict[str, float]:
+    """합성 데이터를 schema에 적재합니다 (COPY → 임베딩 바이너리 COPY → 집계 뷰/인덱스).
+
+    엑셀 적재 벤치마크용 테이블(001_init, 007_ingest_changeset)도 같은 스키마에 만듭니다.
+    단계별 소요 시간(초)을 반환합니다.
+    """
+    from psycopg2 import sql
+
+    from core.pgvector_codec import update_vectors
+
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute(_SCHOLAR_DDL.format(schema=schema, dim=encoder.dim))
+    conn.commit()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        paths = data.write_csv(tmp)
+        timings["generate_csv"] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        with conn.cursor() as cur:
+            for table, path in paths.items():
+                cols = {
+                    "tb_researcher": "(researcher_id, name, department, email)",
+                }.get(table, "")
+                with open(path, "r", encoding="utf-8") as f:
+                    cur.copy_expert(f"COPY {schema}.{table} {cols} FROM STDIN WITH (FORMAT csv)", f)
+                log(f"[..] {table} loaded")
+        conn.commit()
+        timings["copy"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ids: List[int] = []
+    texts: List[str] = []
+    target = sql.Identifier(schema, "tb_researcher")
+
+    def flush():
+        with conn.cursor() as cur:
+            update_vectors(cur, target, "researcher_id", "bigint", ids, encoder.encode(texts))
+        conn.commit()
+        ids.clear()
+        texts.clear()
+
+    for r in data.iter_researchers():
+        ids.append(r["researcher_id"])
+        texts.append(SyntheticScholar.source_text(r))
+        if len(ids) >= batch:
+            flush()
+    if ids:
+        flush()
+    timings["embed"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute(_SCHOLAR_INDEXES.format(schema=schema))
+        for name in ("005_researcher_keywords.sql", "006_trigram_search.sql",
+                     "001_init.sql", "007_ingest_changeset.sql"):
+            cur.execute(_migration_sql(name, schema))
+    conn.commit()
+    timings["index"] = time.perf_counter() - t0
+    timings["total"] = time.perf_counter() - started
+    return {k: round(v, 3) for k, v in timings.items()}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from bench.stubs import StubEncoder
+    from core.config import AppConfig
+    from core.db import get_connection
+
+    parser = argparse.ArgumentParser(description="합성 scholar 데이터를 생성해 DB 스키마에 적재합니다.")
+    parser.add_argument("--researchers", type=int, default=10000)
+    parser.add_argument("--theses", type=float, default=4.0, help="연구자당 평균 논문 수")
+    parser.add_argument("--patents", type=float, default=0.5, help="연구자당 평균 특허 수")
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--vocab", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dim", type=int, default=None, help="임베딩 차원 (기본: EMBEDDING_DIM)")
+    parser.add_argument("--schema", default="bench_scholar")
+    parser.add_argument("--csv-dir", default=None, help="DB 대신 CSV로만 출력")
+    parser.add_argument("--xlsx", default=None, help="엑셀 적재용 워크북도 출력")
+    args = parser.parse_args(argv)
+
+    data = SyntheticScholar(args.researchers, args.theses, args.patents, topics=args.topics,
+                            vocab=args.vocab, seed=args.seed)
+    if args.xlsx:
+        data.write_workbook(args.xlsx)
+        print(f"[OK] workbook -> {args.xlsx}")
+    if args.csv_dir:
+        for table, path in data.write_csv(args.csv_dir).items():
+            print(f"[OK] {table} -> {path}")
+        return
+    config = AppConfig()
+    encoder = StubEncoder(args.dim or config.embedding_dim)
+    with get_connection(config) as conn:
+        timings = load_into_db(conn.raw, data, args.schema, encoder)
+    print(f"[DONE] schema={args.schema} researchers={args.researchers} {timings}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,14 @@
 from openai import OpenAI
 import base64
 
+from core.metrics import record_llm_usage, timed
+
 class Assistant:
     def __init__(self, config):
         self.client = OpenAI(api_key=config.openai_api_key)
         self.model = config.openai_model_name
 
+    @timed("assistant.analyze_image")
     def analyze_image(self, image):
         try:
             image_bytes = image.read()
@@ -27,12 +30,15 @@ class Assistant:
                 temperature=0.5,
                 max_tokens=600
             )
+            record_llm_usage("analyze_image", response)
             summary = response.choices[0].message.content.strip()
             return {"query": summary}
 
         except Exception as e:
+            record_llm_usage("analyze_image", error=e)
             return {"error": str(e)}
 
+    @timed("assistant.assist_from_text")
     def assist_from_text(self, text):
         #prompt = f"다음 문장을 기반으로 기술분석서를 작성해주세요. 1. 기술 항목별로 분류하고 마크다운 형식(마크다운 기호 중 #, *, =, $, **, ## 기호는 항목설명에 절대 사용금지 -, · 기호만 사용가능)으로 작성 2. 600 tokens 이내로 기술분석서 작성해주세요.\n\n{text}"
         prompt = f"""다음 문장을 기반으로 모든 항목의 기술분석서를 작성해주세요. ※ 매우 중요: 마크다운 기호 중 다음은 절대 사용하지 마세요 → #, *, =, $, **, ## 대신 아래 기호만 사용 가능:  - 항목 구분에는 '하이픈(-)' 또는 '중간점(·)'만 사용 - 들여쓰기나 강조 표현은 절대 사용하지 말 것  ※ 출력 예시는 다음과 같이 구성: 브랜드: Apple, Samsung  제작기술: 3D 프린팅 조건 1. 기술 항목별로 분류하여 작성 2. 최대 600 tokens 이내로 작성 입력 문장:{text}"""
@@ -46,8 +52,10 @@ class Assistant:
                 temperature=0.6,
                 max_tokens=600
             )
+            record_llm_usage("assist_from_text", response)
             summary = response.choices[0].message.content.strip()
             return {"query": summary}
 
         except Exception as e:
+            record_llm_usage("assist_from_text", error=e)
             return {"error": str(e)}
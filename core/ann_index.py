@@ -0,0 +1,158 @@
+# core/ann_index.py
+"""FAISS 검색 인덱스 팩토리 (Flat / HNSW / IVF-PQ).
+
+근사 인덱스는 학습·구축 후 정확(Flat) 결과와 비교한 recall@k를 함께 기록하며,
+디스크에 저장해 두었다가 같은 데이터 버전이면 다시 읽어 사용합니다.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import faiss  # type: ignore
+except Exception:  # pragma: no cover
+    faiss = None  # type: ignore
+
+INDEX_MODES = ("flat", "hnsw", "ivfpq")
+# 학습에 쓰는 최대 표본 수 / recall 자체 점검 질의 수
+_MAX_TRAIN = 100_000
+_RECALL_QUERIES = 200
+
+
+def _pq_subquantizers(dim: int, wanted: int) -> int:
+    """dim을 나누어떨어지게 하는 wanted 이하의 가장 큰 서브양자화기 개수를 고릅니다."""
+    for m in range(max(1, min(wanted, dim)), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def factory_string(mode: str, n_rows: int, dim: int, cfg) -> str:
+    """모드와 데이터 크기에 맞춘 faiss.index_factory 문자열을 만듭니다."""
+    if mode == "hnsw":
+        return f"HNSW{cfg.hnsw_m},Flat"
+    if mode == "ivfpq":
+        nlist = cfg.ivf_nlist or int(4 * np.sqrt(max(n_rows, 1)))
+        # k-means 학습에 리스트당 최소 39개 표본이 필요
+        nlist = max(1, min(nlist, n_rows // 39))
+        m = _pq_subquantizers(dim, cfg.ivf_pq_m)
+        nbits = cfg.ivf_pq_nbits
+        while nbits > 1 and (1 << nbits) * 39 > n_rows:
+            nbits -= 1
+        return f"IVF{nlist},PQ{m}x{nbits}"
+    return "Flat"
+
+
+def set_search_params(index, mode: str, cfg) -> None:
+    """ef_search / nprobe 검색 파라미터를 인덱스에 적용합니다."""
+    params = faiss.ParameterSpace()
+    if mode == "hnsw":
+        params.set_index_parameter(index, "efSearch", cfg.hnsw_ef_search)
+    elif mode == "ivfpq":
+        params.set_index_parameter(index, "nprobe", cfg.ivf_nprobe)
+
+
+def build_index(mat: np.ndarray, mode: str, cfg):
+    """정규화 행렬로 내적(코사인) 기준 인덱스를 학습·구축합니다."""
+    n_rows, dim = mat.shape
+    description = factory_string(mode, n_rows, dim, cfg)
+    index = faiss.index_factory(dim, description, faiss.METRIC_INNER_PRODUCT)
+    if mode == "hnsw":
+        faiss.downcast_index(index).hnsw.efConstruction = cfg.hnsw_ef_construction
+    if not index.is_trained:
+        if n_rows > _MAX_TRAIN:
+            sample = np.random.default_rng(42).choice(n_rows, _MAX_TRAIN, replace=False)
+            index.train(np.ascontiguousarray(mat[np.sort(sample)]))
+        else:
+            index.train(np.ascontiguousarray(mat))
+    index.add(np.ascontiguousarray(mat))
+    set_search_params(index, mode, cfg)
+    return index, description
+
+
+def recall_at_k(index, mat: np.ndarray, k: int, n_queries: int = _RECALL_QUERIES) -> float:
+    """행렬의 일부 행을 질의로 삼아 인덱스 결과와 정확 검색 결과의 recall@k를 계산합니다."""
+    n_rows = mat.shape[0]
+    k = max(1, min(k, n_rows))
+    rng = np.random.default_rng(0)
+    rows = np.sort(rng.choice(n_rows, min(n_queries, n_rows), replace=False))
+    queries = np.ascontiguousarray(mat[rows])
+    exact = np.empty((len(rows), k), dtype="int64")
+    # (질의 수, N) 유사도 행렬이 커지지 않도록 질의를 나눠 정확 검색
+    for start in range(0, len(rows), 16):
+        sims = queries[start:start + 16] @ np.asarray(mat).T
+        exact[start:start + 16] = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    _, approx = index.search(queries, k)
+    hits = sum(len(set(a.tolist()) & set(e.tolist())) for a, e in zip(approx, exact))
+    return hits / float(len(rows) * k)
+
+
+def save_index(index, path: str, info: Dict) -> None:
+    """인덱스와 구축 정보를 임시 파일에 쓴 뒤 원자적으로 교체합니다."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    faiss.write_index(index, tmp)
+    os.replace(tmp, path)
+    with open(f"{tmp}.json", "w", encoding="utf-8") as f:
+        json.dump(info, f)
+    os.replace(f"{tmp}.json", f"{path}.json")
+
+
+def load_index(path: str) -> Tuple[Optional[object], Dict]:
+    """저장된 인덱스를 읽습니다. 가능하면 mmap 플래그로 열어 워커 간 페이지를 공유합니다."""
+    if not os.path.exists(path):
+        return None, {}
+    try:
+        index = faiss.read_index(path, getattr(faiss, "IO_FLAG_MMAP", 0))
+    except Exception:
+        try:
+            index = faiss.read_index(path)
+        except Exception:
+            return None, {}
+    try:
+        with open(f"{path}.json", "r", encoding="utf-8") as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        info = {}
+    return index, info
+
+
+def index_file_name(mode: str, cfg) -> str:
+    """모드와 구축 파라미터를 반영한 인덱스 파일 이름을 만듭니다."""
+    if mode == "hnsw":
+        return f"index-hnsw-m{cfg.hnsw_m}-efc{cfg.hnsw_ef_construction}.faiss"
+    if mode == "ivfpq":
+        return f"index-ivfpq-nl{cfg.ivf_nlist}-m{cfg.ivf_pq_m}x{cfg.ivf_pq_nbits}.faiss"
+    return "index-flat.faiss"
+
+
+def get_or_build(mat: np.ndarray, mode: str, cfg, directory: Optional[str], recall_k: int):
+    """저장된 인덱스가 있으면 읽고, 없으면 구축·recall 점검 후 저장합니다."""
+    path = os.path.join(directory, index_file_name(mode, cfg)) if directory else None
+    if path:
+        index, info = load_index(path)
+        if index is not None and index.ntotal == mat.shape[0]:
+            set_search_params(index, mode, cfg)
+            info["loaded"] = True
+            return index, info
+    started = time.perf_counter()
+    index, description = build_index(mat, mode, cfg)
+    build_seconds = time.perf_counter() - started
+    info = {
+        "mode": mode,
+        "factory": description,
+        "rows": int(mat.shape[0]),
+        "build_seconds": round(build_seconds, 3),
+        "recall_k": int(min(recall_k, mat.shape[0])),
+        "recall_at_k": round(recall_at_k(index, mat, recall_k), 4),
+        "loaded": False,
+    }
+    if path:
+        try:
+            save_index(index, path, info)
+        except (OSError, RuntimeError):
+            pass
+    return index, info
@@ -1,57 +1,77 @@
 from typing import List
 from psycopg2.extras import RealDictCursor
 from core.db import get_connection
+from core.metrics import db_span
+
+
+def _like_pattern(text: str) -> str:
+    """ILIKE 부분 일치 패턴을 만듭니다 (입력의 %, _ 와일드카드는 이스케이프)."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
 # 논문 키워드 기반 검색
 def search_papers_by_keyword(keyword: str, limit: int = 20) -> List[dict]:
-    """키워드를 포함하는 논문을 검색하여 기본 메타 및 키워드를 반환합니다."""
+    """키워드를 포함하거나 비슷한 논문을 유사도 순으로 검색하여 기본 메타 및 키워드를 반환합니다.
+
+    키워드 매칭은 pg_trgm GIN 인덱스(migrations/006_trigram_search.sql)를 사용하고,
+    상위 limit건을 고른 뒤에만 키워드/저자 목록을 모읍니다.
+    """
     sql = """
-    SELECT t.thesis_id,
-           t.title,
+    WITH hits AS (
+        SELECT tk.thesis_id,
+               MAX(similarity(tk.term, %(q)s)) AS score
+          FROM tb_thesis_keyword tk
+         WHERE tk.term ILIKE %(like)s
+            OR tk.term %% %(q)s
+      GROUP BY tk.thesis_id
+    ), top AS (
+        SELECT t.thesis_id, t.title, t.journal_id, t.grade, t.jcr, t.impact_factor, h.score
+          FROM hits h
+          JOIN tb_thesis t ON t.thesis_id = h.thesis_id
+      ORDER BY h.score DESC, t.jcr DESC NULLS LAST, t.impact_factor DESC NULLS LAST
+         LIMIT %(limit)s
+    )
+    SELECT top.thesis_id,
+           top.title,
            j.name AS journal_name,
-           t.grade,
-           t.jcr,
-           t.impact_factor,
-           array_agg(DISTINCT tk.term) AS keywords,
-           array_agg(DISTINCT ta.researcher_id) AS author_ids
-      FROM tb_thesis t
- LEFT JOIN tb_thesis_keyword tk ON tk.thesis_id = t.thesis_id
- LEFT JOIN tb_thesis_author ta ON ta.thesis_id = t.thesis_id
- LEFT JOIN tb_jounal j ON j.journal_id = t.journal_id
-     WHERE EXISTS (
-           SELECT 1
-             FROM tb_thesis_keyword tk2
-            WHERE tk2.thesis_id = t.thesis_id
-              AND tk2.term ILIKE %s
-           )
-  GROUP BY t.thesis_id, t.title, j.name, t.grade, t.jcr, t.impact_factor
-  ORDER BY t.jcr DESC NULLS LAST, t.impact_factor DESC NULLS LAST
-  LIMIT %s
+           top.grade,
+           top.jcr,
+           top.impact_factor,
+           top.score,
+           (SELECT array_agg(DISTINCT tk.term)
+              FROM tb_thesis_keyword tk
+             WHERE tk.thesis_id = top.thesis_id) AS keywords,
+           (SELECT array_agg(DISTINCT ta.researcher_id)
+              FROM tb_thesis_author ta
+             WHERE ta.thesis_id = top.thesis_id) AS author_ids
+      FROM top
+ LEFT JOIN tb_jounal j ON j.journal_id = top.journal_id
+  ORDER BY top.score DESC, top.jcr DESC NULLS LAST, top.impact_factor DESC NULLS LAST
     """
-    with get_connection() as conn:
+    with db_span("search_papers"), get_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(sql, (f"%{keyword}%", limit))
+            cur.execute(sql, {"q": keyword, "like": _like_pattern(keyword), "limit": limit})
             return [dict(r) for r in cur.fetchall()]
 
 # 연구자 이름 기반 검색
 def search_researchers_by_name(name: str, limit: int = 20) -> List[dict]:
-    """이름에 부분 일치하는 연구자를 검색하여 기초 통계를 반환합니다."""
+    """이름이 부분 일치하거나 비슷한 연구자를 유사도 순으로 검색하여 기초 통계를 반환합니다."""
     sql = """
     SELECT r.researcher_id,
            r.name,
            r.department,
            r.email,
-           COUNT(DISTINCT ta.thesis_id) AS thesis_count,
-           COUNT(DISTINCT ph.patent_id) AS patent_count
+           COALESCE(k.thesis_count, 0) AS thesis_count,
+           COALESCE(k.patent_count, 0) AS patent_count,
+           similarity(r.name, %(q)s) AS score
       FROM tb_researcher r
- LEFT JOIN tb_thesis_author ta ON ta.researcher_id = r.researcher_id
- LEFT JOIN tb_patent_holder ph ON ph.researcher_id = r.researcher_id
-     WHERE r.name ILIKE %s
-  GROUP BY r.researcher_id, r.name, r.department, r.email
-  ORDER BY thesis_count DESC, patent_count DESC
-  LIMIT %s
+ LEFT JOIN mv_researcher_keywords k ON k.researcher_id = r.researcher_id
+     WHERE r.name ILIKE %(like)s
+        OR r.name %% %(q)s
+  ORDER BY score DESC, thesis_count DESC, patent_count DESC
+  LIMIT %(limit)s
     """
-    with get_connection() as conn:
+    with db_span("search_researchers"), get_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(sql, (f"%{name}%", limit))
+            cur.execute(sql, {"q": name, "like": _like_pattern(name), "limit": limit})
             return [dict(r) for r in cur.fetchall()]
@@ -0,0 +1,183 @@
+# core/autocomplete.py
+"""연구자 이름 자동완성용 인메모리 접두사/n-gram 색인.
+
+VectorUtils가 이미 메모리에 올려 둔 연구자 ID/이름으로 색인을 만들어
+키 입력마다 DB 왕복 없이 응답합니다. 한글 이름은 2~4음절이 대부분이라
+기본 n-gram 크기는 2(bigram)입니다. 증분 refresh 뒤에는 바뀐 연구자만
+사본 색인에 반영해 교체하고, 전체 재구축은 변경 내역을 알 수 없을 때만 합니다.
+"""
+
+import bisect
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# 변경/삭제 누적이 이 수/비율을 넘으면 증분 반영 대신 전체 재구축
+_REBUILD_MIN = 1024
+_REBUILD_RATIO = 0.05
+
+
+def _norm(text: str) -> str:
+    return unicodedata.normalize("NFKC", str(text or "")).casefold().strip()
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NameIndex:
+    """이름 접두사(정렬 목록 + 이분 탐색)와 부분 문자열(n-gram 역색인) 검색을 제공합니다."""
+
+    def __init__(self, ids: Sequence, names: Sequence[str], n: int = 2):
+        self.n = max(1, n)
+        self._ids = list(ids)
+        self._names = [str(name or "") for name in names]
+        self._keys = [_norm(name) for name in self._names]
+        # 접두사 검색용 (정규화 이름, 행 위치) 정렬 목록
+        self._sorted: List[Tuple[str, int]] = sorted((key, pos) for pos, key in enumerate(self._keys))
+        self._postings: Dict[str, List[int]] = {}
+        for pos, key in enumerate(self._keys):
+            for gram in _grams(key, self.n):
+                self._postings.setdefault(gram, []).append(pos)
+        self._positions = {rid: pos for pos, rid in enumerate(self._ids)}
+        self.tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def updated(self, changes: Dict) -> "NameIndex":
+        """{연구자 ID: 새 이름 또는 None(삭제)}를 반영한 새 색인을 반환합니다.
+
+        자신은 고치지 않고(copy-on-write) 바뀐 이름의 n-gram 목록만 복사해 고치므로,
+        검색 중인 요청은 이전 색인을 그대로 읽습니다. 삭제된 행 위치는 빈 슬롯으로 남습니다.
+        """
+        new = NameIndex.__new__(NameIndex)
+        new.n = self.n
+        new._ids = list(self._ids)
+        new._names = list(self._names)
+        new._keys = list(self._keys)
+        new._sorted = list(self._sorted)
+        new._postings = dict(self._postings)
+        new._positions = dict(self._positions)
+        new.tombstones = self.tombstones
+        copied: Set[str] = set()
+
+        def posting(gram: str) -> List[int]:
+            if gram not in copied:
+                copied.add(gram)
+                new._postings[gram] = list(new._postings.get(gram, ()))
+            return new._postings[gram]
+
+        for rid, name in changes.items():
+            pos = new._positions.get(rid)
+            if pos is not None:
+                old = new._keys[pos]
+                del new._sorted[bisect.bisect_left(new._sorted, (old, pos))]
+                for gram in _grams(old, new.n):
+                    positions = posting(gram)
+                    positions.remove(pos)
+                    if not positions:
+                        del new._postings[gram]
+                        copied.discard(gram)
+            if name is None:
+                if pos is not None:
+                    del new._positions[rid]
+                    new._names[pos] = new._keys[pos] = ""
+                    new.tombstones += 1
+                continue
+            name = str(name)
+            key = _norm(name)
+            if pos is None:
+                pos = len(new._ids)
+                new._ids.append(rid)
+                new._names.append(name)
+                new._keys.append(key)
+                new._positions[rid] = pos
+            else:
+                new._names[pos] = name
+                new._keys[pos] = key
+            bisect.insort(new._sorted, (key, pos))
+            for gram in _grams(key, new.n):
+                posting(gram).append(pos)
+        return new
+
+    def _prefix(self, key: str, limit: int) -> List[int]:
+        start = bisect.bisect_left(self._sorted, (key, -1))
+        out = []
+        for name_key, pos in self._sorted[start:]:
+            if not name_key.startswith(key) or len(out) >= limit:
+                break
+            out.append(pos)
+        return out
+
+    def _contains(self, key: str) -> List[int]:
+        if len(key) < self.n:
+            # n-gram보다 짧은 질의는 색인 전체를 훑어야 하므로 접두사 일치만 반환
+            return []
+        postings = [self._postings.get(gram) for gram in _grams(key, self.n)]
+        if not all(postings):
+            return []
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for positions in postings[1:]:
+            candidates.intersection_update(positions)
+            if not candidates:
+                return []
+        return [pos for pos in candidates if key in self._keys[pos]]
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """접두사 일치를 먼저, 그다음 부분 일치를 짧은 이름 순으로 최대 limit건 반환합니다."""
+        key = _norm(query)
+        if not key or limit <= 0:
+            return []
+        ranked = self._prefix(key, limit)
+        if len(ranked) < limit:
+            seen = set(ranked)
+            rest = sorted(
+                (pos for pos in self._contains(key) if pos not in seen),
+                key=lambda pos: (len(self._keys[pos]), self._keys[pos]),
+            )
+            ranked.extend(rest[: limit - len(ranked)])
+        return [{"researcher_id": self._ids[pos], "name": self._names[pos]} for pos in ranked]
+
+
+class NameAutocomplete:
+    """VectorUtils의 data_version이 바뀔 때 바뀐 연구자만 NameIndex에 반영하는 래퍼."""
+
+    def __init__(self, vector_utils, n: int = 2):
+        self.vector_utils = vector_utils
+        self.n = n
+        self._index: NameIndex = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _current(self) -> NameIndex:
+        version = self.vector_utils.data_version
+        if self._index is None or self._version != version:
+            with self._lock:
+                if self._index is None or self._version != version:
+                    self._index = self._updated(version) or self._rebuild()
+                    self._version = version
+        return self._index
+
+    def _updated(self, version: str) -> Optional[NameIndex]:
+        """직전 색인에 refresh 변경분만 반영합니다. 변경 내역을 모르거나 많으면 None."""
+        index = self._index
+        if index is None:
+            return None
+        changed = self.vector_utils.changed_since(self._version)
+        if changed is None:
+            return None
+        limit = max(_REBUILD_MIN, int(len(index) * _REBUILD_RATIO))
+        if len(changed) + index.tombstones > limit:
+            return None
+        return index.updated(self.vector_utils.live_names(changed))
+
+    def _rebuild(self) -> NameIndex:
+        ids, names = self.vector_utils.live_researchers()
+        return NameIndex(ids, names, self.n)
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        return self._current().search(query, limit)
@@ -0,0 +1,226 @@
+# core/cache.py
+"""질의 임베딩/추천 결과용 LRU + TTL 캐시.
+
+메모리 LRU가 앞단을 맡고, 선택적으로 SQLite 파일 백엔드를 두어
+여러 워커 프로세스가 캐시 적중을 공유할 수 있습니다.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_WS = re.compile(r"\s+")
+_MISSING = object()
+
+
+def normalize_query(text: str) -> str:
+    """캐시 키용으로 질의를 정규화합니다 (NFKC + 공백 정리)."""
+    return _WS.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+class SQLiteBackend:
+    """여러 프로세스가 공유하는 SQLite 기반 키-값 저장소 (만료 시각 포함).
+
+    만료 시각이 없는 항목(질의 임베딩)도 있으므로, 주기적으로 만료 항목을 지운 뒤
+    행 수가 max_rows를 넘으면 마지막 사용 시각(accessed_at)이 오래된 항목부터 지웁니다.
+    """
+
+    _PURGE_EVERY = 256
+
+    def __init__(self, path: str, max_rows: int = 100000):
+        self.path = path
+        self.max_rows = max_rows
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        with self._conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            # 이전 버전 파일에는 accessed_at 열이 없음
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+            if "accessed_at" not in columns:
+                conn.execute("ALTER TABLE cache ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        now = time.time()
+        if expires_at is not None and expires_at < now:
+            return None
+        # 적중 항목은 메모리 LRU로 올라가므로 백엔드 접근 시각 갱신은 드묾 (잠금 경합 시 건너뜀)
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, namespace, key),
+                )
+        except sqlite3.OperationalError:
+            pass
+        return value
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float]) -> None:
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._writes_lock:
+            self._writes += 1
+            purge = self._writes % self._PURGE_EVERY == 0
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, sqlite3.Binary(value), expires_at, now),
+            )
+            if purge:
+                self._purge(conn, now)
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> None:
+        """만료 항목을 지우고, 남은 행이 max_rows를 넘으면 가장 오래 쓰이지 않은 항목부터 지웁니다."""
+        conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+        if self.max_rows <= 0:
+            return
+        excess = conn.execute("SELECT count(*) FROM cache").fetchone()[0] - self.max_rows
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+
+
+class LRUCache:
+    """스레드 안전한 LRU 캐시. ttl(초)을 주면 만료된 항목은 미스로 처리합니다.
+
+    backend가 있으면 메모리 미스 시 백엔드를 조회하고, set 시 함께 기록합니다.
+    이때 dumps/loads로 값을 bytes로 직렬화합니다.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        backend: Optional[SQLiteBackend] = None,
+        namespace: str = "default",
+        dumps: Callable[[Any], bytes] = None,
+        loads: Callable[[bytes], Any] = None,
+    ):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.backend = backend if (dumps and loads) else None
+        self.namespace = namespace
+        self._dumps = dumps
+        self._loads = loads
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "backend_hits": 0}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._get_local(key)
+        if value is not _MISSING:
+            return value
+        if self.backend is not None:
+            try:
+                raw = self.backend.get(self.namespace, key)
+            except sqlite3.Error:
+                raw = None
+            if raw is not None:
+                value = self._loads(raw)
+                self._put_local(key, value)
+                with self._lock:
+                    self._stats["hits"] += 1
+                    self._stats["backend_hits"] += 1
+                return value
+        with self._lock:
+            self._stats["misses"] += 1
+        return default
+
+    def _get_local(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self._stats["expired"] += 1
+                return _MISSING
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._put_local(key, value)
+        if self.backend is not None:
+            try:
+                self.backend.set(self.namespace, key, self._dumps(value), self.ttl)
+            except sqlite3.Error:
+                pass
+
+    def _put_local(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """적중/미스/축출 카운터와 현재 크기를 반환합니다."""
+        with self._lock:
+            out = dict(self._stats)
+            out["size"] = len(self._data)
+        out["maxsize"] = self.maxsize
+        return out
+
+
+_backends: Dict[str, SQLiteBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(config) -> Optional[SQLiteBackend]:
+    """설정에 따라 공유 캐시 백엔드를 반환합니다 (CACHE_BACKEND=sqlite일 때만)."""
+    if (config.cache_backend or "memory").lower() != "sqlite":
+        return None
+    path = config.cache_sqlite_path
+    with _backends_lock:
+        backend = _backends.get(path)
+        if backend is None:
+            backend = SQLiteBackend(path, config.cache_sqlite_max_rows)
+            _backends[path] = backend
+        return backend
@@ -16,14 +16,70 @@ class AppConfig:
         self.db_user = os.getenv("DB_USER", "")
         self.db_password = os.getenv("DB_PASSWORD", "")
         self.db_schema = os.getenv("DB_SCHEMA", "scholar")
+        # connection pool: 최소/최대 연결 수, 대기 제한(초), 유휴 연결 점검 주기(초)
+        self.db_pool_min = int(os.getenv("DB_POOL_MIN", "1"))
+        self.db_pool_max = int(os.getenv("DB_POOL_MAX", "10"))
+        self.db_pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", "10.0"))
+        self.db_pool_ping_interval = float(os.getenv("DB_POOL_PING_INTERVAL", "30.0"))
         self.embedding_dim = int(os.getenv("EMBEDDING_DIM", "1024"))
         self.top_k = int(os.getenv("TOP_K", "5"))
+        # 요청으로 받을 수 있는 top_k 상한 / 일괄 추천 1회당 최대 질의 수
+        self.max_top_k = int(os.getenv("MAX_TOP_K", "50"))
+        self.recommend_batch_max_queries = int(os.getenv("RECOMMEND_BATCH_MAX_QUERIES", "100"))
         self.max_faiss_distance = float(os.getenv("MAX_FAISS_DISTANCE", "15.0"))
         self.retriever_limit = int(os.getenv("RETRIEVER_LIMIT", "20"))
         self.rag_temperature = float(os.getenv("RAG_TEMPERATURE", "0.4"))
         self.rag_max_tokens = int(os.getenv("RAG_MAX_TOKENS", "500"))
+        # 추천 사유(LLM) 병렬 생성: 호출별 타임아웃 / 전체 마감시간(초) / 동시 실행 수
+        self.llm_timeout = float(os.getenv("LLM_TIMEOUT", "15.0"))
+        self.llm_deadline = float(os.getenv("LLM_DEADLINE", "20.0"))
+        self.llm_max_workers = int(os.getenv("LLM_MAX_WORKERS", "8"))
         self.journal_impact_weight = float(os.getenv("JOURNAL_IMPACT_WEIGHT", "0.2"))
         self.keyword_weight = float(os.getenv("KEYWORD_WEIGHT", "0.3"))
         self.keyword_language_priority = os.getenv("KEYWORD_LANGUAGE_PRIORITY", "ko,en")
         self.embedding_model_name = os.getenv("EMBEDDING_MODEL", "intfloat/multilingual-e5-large")
+        # 질의 인코더 백엔드: torch(fp32) | onnx | onnx-int8, ONNX 모델 디렉터리, 스레드 수/최대 토큰 길이(0이면 기본값)
+        self.encoder_backend = os.getenv("ENCODER_BACKEND", "torch")
+        self.encoder_onnx_dir = os.getenv("ENCODER_ONNX_DIR", "data/encoder/onnx")
+        self.encoder_threads = int(os.getenv("ENCODER_THREADS", "0"))
+        self.encoder_max_length = int(os.getenv("ENCODER_MAX_LENGTH", "0"))
+        # 동시 질의 인코딩 병합: 배치 최대 크기(1 이하면 비활성화), 첫 요청 후 최대 대기(ms)
+        self.encoder_batch_max = int(os.getenv("ENCODER_BATCH_MAX", "32"))
+        self.encoder_batch_wait_ms = float(os.getenv("ENCODER_BATCH_WAIT_MS", "5"))
+        # 연구자 임베딩 스냅샷 디렉터리 (빈 값이면 비활성화)
+        self.vector_snapshot_dir = os.getenv("VECTOR_SNAPSHOT_DIR", "data/snapshot")
+        # 검색 인덱스: flat(정확) | hnsw | ivfpq, 및 근사 인덱스 파라미터 (IVF_NLIST=0이면 4*sqrt(N))
+        self.vector_index = os.getenv("VECTOR_INDEX", "flat")
+        self.hnsw_m = int(os.getenv("HNSW_M", "32"))
+        self.hnsw_ef_construction = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+        self.hnsw_ef_search = int(os.getenv("HNSW_EF_SEARCH", "64"))
+        self.ivf_nlist = int(os.getenv("IVF_NLIST", "0"))
+        self.ivf_nprobe = int(os.getenv("IVF_NPROBE", "16"))
+        self.ivf_pq_m = int(os.getenv("IVF_PQ_M", "64"))
+        self.ivf_pq_nbits = int(os.getenv("IVF_PQ_NBITS", "8"))
+        # 검색 방식: dense | hybrid(dense + 키워드 BM25 융합), 융합 방식 rrf|weighted,
+        # 검색기별 후보 수, RRF 상수, BM25 쪽 가중치, BM25 파라미터
+        self.vector_search = os.getenv("VECTOR_SEARCH", "dense")
+        self.hybrid_fusion = os.getenv("HYBRID_FUSION", "rrf")
+        self.hybrid_pool = int(os.getenv("HYBRID_POOL", "200"))
+        self.hybrid_rrf_k = float(os.getenv("HYBRID_RRF_K", "60"))
+        self.hybrid_sparse_weight = float(os.getenv("HYBRID_SPARSE_WEIGHT", "1.0"))
+        self.bm25_k1 = float(os.getenv("BM25_K1", "1.2"))
+        self.bm25_b = float(os.getenv("BM25_B", "0.75"))
+        # 변경 로그(tb_researcher_change) 폴링 주기(초). 0이면 증분 갱신 비활성화
+        self.vector_refresh_interval = float(os.getenv("VECTOR_REFRESH_INTERVAL", "0"))
+        # 캐시: 질의 임베딩 LRU 크기, 추천 결과 LRU 크기/TTL(초), 공유 백엔드(memory|sqlite)
+        self.cache_embedding_size = int(os.getenv("CACHE_EMBEDDING_SIZE", "1024"))
+        self.cache_result_size = int(os.getenv("CACHE_RESULT_SIZE", "256"))
+        self.cache_result_ttl = float(os.getenv("CACHE_RESULT_TTL", "600"))
+        self.cache_backend = os.getenv("CACHE_BACKEND", "memory")
+        self.cache_sqlite_path = os.getenv("CACHE_SQLITE_PATH", "data/cache/cache.sqlite3")
+        # SQLite 공유 캐시 최대 행 수 (넘으면 오래 쓰이지 않은 항목부터 삭제, 0이면 무제한)
+        self.cache_sqlite_max_rows = int(os.getenv("CACHE_SQLITE_MAX_ROWS", "100000"))
+        # 이름 자동완성 인메모리 n-gram 크기 (0이면 비활성화, DB 트라이그램 검색 사용) / 요청 limit 상한
+        self.name_autocomplete_ngram = int(os.getenv("NAME_AUTOCOMPLETE_NGRAM", "2"))
+        self.name_autocomplete_max_limit = int(os.getenv("NAME_AUTOCOMPLETE_MAX_LIMIT", "50"))
         self.similarity_threshold = float(os.getenv("SIMILARITY_THRESHOLD", "0.3"))
+        # 지표: /metrics(Prometheus) 노출 여부, 요청별 단계 타이밍 JSON 로그(metrics.request 로거)
+        self.metrics_enabled = os.getenv("METRICS_ENABLED", "1") == "1"
+        self.metrics_request_log = os.getenv("METRICS_REQUEST_LOG", "0") == "1"
@@ -1,18 +1,233 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
 import psycopg2
+from psycopg2 import extensions
+from pgvector.psycopg2 import register_vector
+from psycopg2.pool import ThreadedConnectionPool
 from core.config import AppConfig
 
 
-def get_connection(config: AppConfig = None):
-    """PostgreSQL 연결을 생성합니다. 설정된 스키마와 public을 search_path로 사용합니다."""
-    cfg = config or AppConfig()
-    schema = cfg.db_schema
-    search_path = schema if isinstance(schema, str) else ",".join(schema)
-    return psycopg2.connect(
-        host=cfg.db_host,
-        dbname=cfg.db_name,
-        user=cfg.db_user,
-        password=cfg.db_password,
-        options=f"-c search_path={search_path},public"
-    )
+class PoolTimeoutError(psycopg2.OperationalError):
+    """풀에서 제한 시간 안에 연결을 얻지 못했을 때 발생합니다."""
+
+
+class PooledConnection:
+    """풀에서 꺼낸 psycopg2 연결의 래퍼.
+
+    기존 psycopg2 연결과 같이 ``with get_connection() as conn`` 블록을 벗어나면
+    commit/rollback을 수행하고, 이어서 연결을 닫는 대신 풀로 반환합니다.
+    close()도 풀 반환으로 동작하며 여러 번 호출해도 안전합니다.
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn):
+        self._pool = pool
+        self._conn = conn
+
+    @property
+    def raw(self):
+        """풀이 관리하는 원본 psycopg2 연결을 반환합니다."""
+        if self._conn is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return self._conn
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self._conn is not None and not self._conn.closed:
+                if exc_type is None:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self.close()
+        return False
+
+    def close(self) -> None:
+        """연결을 풀로 반환합니다."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+
+class ConnectionPool:
+    """ThreadedConnectionPool 위에 대기/헬스체크/지표를 더한 연결 풀."""
+
+    def __init__(self, cfg: AppConfig):
+        schema = cfg.db_schema
+        search_path = schema if isinstance(schema, str) else ",".join(schema)
+        self.minconn = max(0, cfg.db_pool_min)
+        self.maxconn = max(1, cfg.db_pool_max, self.minconn)
+        self.timeout = cfg.db_pool_timeout
+        self.ping_interval = cfg.db_pool_ping_interval
+        self._pool = ThreadedConnectionPool(
+            self.minconn,
+            self.maxconn,
+            host=cfg.db_host,
+            dbname=cfg.db_name,
+            user=cfg.db_user,
+            password=cfg.db_password,
+            options=f"-c search_path={search_path},public",
+        )
+        # ThreadedConnectionPool은 고갈 시 즉시 PoolError를 내므로 세마포어로 대기시킴
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._lock = threading.Lock()
+        self._last_used: Dict[int, float] = {}
+        # vector 타입캐스터를 등록한 연결 (id 기준)
+        self._vector_ready: set = set()
+        self._stats = {
+            "checkouts": 0,
+            "in_use": 0,
+            "timeouts": 0,
+            "discarded": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def acquire(self) -> PooledConnection:
+        """헬스체크를 통과한 연결을 꺼내 래퍼로 반환합니다."""
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise PoolTimeoutError(f"no database connection available within {self.timeout}s")
+        try:
+            conn = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["in_use"] += 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+        return PooledConnection(self, conn)
+
+    def _checkout(self):
+        """풀에서 연결을 꺼내고, 끊긴 연결은 폐기 후 새로 받습니다."""
+        for _ in range(self.maxconn + 1):
+            conn = self._pool.getconn()
+            if self._healthy(conn):
+                self._prepare(conn)
+                return conn
+            with self._lock:
+                self._stats["discarded"] += 1
+                self._last_used.pop(id(conn), None)
+                self._vector_ready.discard(id(conn))
+            self._pool.putconn(conn, close=True)
+        raise psycopg2.OperationalError("could not obtain a healthy database connection")
+
+    def _prepare(self, conn) -> None:
+        """새 연결에 pgvector 타입캐스터를 한 번 등록합니다 (embedding 값을 ndarray로 수신)."""
+        if id(conn) in self._vector_ready:
+            return
+        try:
+            # vector 확장이 없으면 ProgrammingError: 롤백 후 embedding을 텍스트로 받음
+            with conn.cursor() as cur:
+                register_vector(cur)
+            conn.rollback()
+        except psycopg2.Error:
+            conn.rollback()
+        with self._lock:
+            self._vector_ready.add(id(conn))
+
+    def _healthy(self, conn) -> bool:
+        """연결 상태를 확인하고, 오래 쉬었던 연결은 SELECT 1로 점검합니다."""
+        if conn.closed:
+            return False
+        if conn.info.transaction_status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        last = self._last_used.get(id(conn))
+        if last is not None and time.monotonic() - last < self.ping_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def release(self, conn) -> None:
+        """연결을 풀로 돌려놓습니다."""
+        try:
+            broken = conn.closed or conn.info.transaction_status == extensions.TRANSACTION_STATUS_UNKNOWN
+            with self._lock:
+                self._stats["in_use"] -= 1
+                if broken:
+                    self._stats["discarded"] += 1
+                    self._last_used.pop(id(conn), None)
+                    self._vector_ready.discard(id(conn))
+                else:
+                    self._last_used[id(conn)] = time.monotonic()
+            self._pool.putconn(conn, close=broken)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, float]:
+        """체크아웃 횟수, 대기 시간 등 풀 지표를 반환합니다."""
+        with self._lock:
+            out = dict(self._stats)
+        out["min_size"] = self.minconn
+        out["max_size"] = self.maxconn
+        out["wait_seconds_avg"] = out["wait_seconds_total"] / out["checkouts"] if out["checkouts"] else 0.0
+        return out
+
+    def closeall(self) -> None:
+        """풀의 모든 연결을 닫습니다."""
+        self._pool.closeall()
+
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_pid: Optional[int] = None
+_pools_lock = threading.Lock()
+_default_config: Optional[AppConfig] = None
+
+
+def _pool_key(cfg: AppConfig) -> Tuple:
+    return (cfg.db_host, cfg.db_name, cfg.db_user, cfg.db_password, str(cfg.db_schema))
+
+
+def get_pool(config: AppConfig = None) -> ConnectionPool:
+    """접속 정보별 프로세스 전역 연결 풀을 반환합니다(fork 이후에는 새로 생성)."""
+    global _pools_pid, _default_config
+    cfg = config
+    if cfg is None:
+        # 호출마다 AppConfig를 새로 만들지 않도록 기본 설정은 한 번만 생성
+        if _default_config is None:
+            _default_config = AppConfig()
+        cfg = _default_config
+    key = _pool_key(cfg)
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            # 부모 프로세스의 소켓을 공유하지 않도록 fork 후 풀을 버림
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(cfg)
+            _pools[key] = pool
+        return pool
+
+
+def get_connection(config: AppConfig = None) -> PooledConnection:
+    """풀에서 PostgreSQL 연결을 꺼냅니다. 설정된 스키마와 public을 search_path로 사용합니다.
+
+    ``with get_connection() as conn`` 블록이 끝나면 commit/rollback 후 풀로 반환됩니다.
+    """
+    return get_pool(config).acquire()
 
 
+def pool_stats() -> Dict[str, Dict[str, float]]:
+    """현재 프로세스의 풀별 지표를 반환합니다."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {f"{key[0]}/{key[1]}": pool.stats() for key, pool in pools}
@@ -0,0 +1,337 @@
+# core/encoders.py
+"""질의 인코더 백엔드 (ENCODER_BACKEND=torch | onnx | onnx-int8).
+
+- torch: 기존 SentenceTransformer(fp32 PyTorch). GPU가 있으면 GPU를 사용합니다.
+- onnx: export_onnx로 내보낸 fp32 ONNX 모델을 ONNX Runtime(CPU)으로 실행합니다.
+- onnx-int8: 같은 모델의 동적 int8 양자화(가중치 int8, 활성값은 실행 시 양자화) 버전.
+
+ONNX 백엔드는 onnxruntime과 tokenizers만 사용하므로 API 프로세스가 torch를 불러오지 않습니다.
+내보내기에는 sentence-transformers/torch가 필요합니다:
+
+    python -m core.encoders export --model intfloat/multilingual-e5-large --out data/encoder/onnx
+
+모든 백엔드는 SentenceTransformer.encode와 같은 모양의 encode(...)를 제공합니다.
+BatchingEncoder는 여러 스레드의 단건 encode 요청을 수 ms 동안 모아 한 번의 배치 호출로 처리합니다.
+백엔드별 지연/처리량과 fp32 대비 코사인 일치도는 ``python -m bench --suites encoder``로 측정합니다.
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from core import metrics
+
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+META_FILE = "encoder.json"
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+
+def load_torch_encoder(model_name: str):
+    """SentenceTransformer를 불러옵니다. sentence-transformers가 없으면 None을 반환합니다."""
+    try:
+        import torch  # type: ignore
+        from sentence_transformers import SentenceTransformer  # type: ignore
+    except Exception:  # pragma: no cover
+        return None
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return SentenceTransformer(model_name, device=device)
+
+
+class OnnxEncoder:
+    """ONNX Runtime 기반 문장 인코더 (mean/cls 풀링 + 선택적 L2 정규화, 내보낼 때의 설정을 따름)."""
+
+    def __init__(self, model_dir: str, quantized: bool = False, threads: int = 0, max_length: Optional[int] = None):
+        try:
+            import onnxruntime as ort  # type: ignore
+            from tokenizers import Tokenizer  # type: ignore
+        except ImportError as exc:
+            raise RuntimeError(
+                "ONNX 인코더에는 onnxruntime과 tokenizers가 필요합니다. pip install onnxruntime tokenizers 로 설치하세요."
+            ) from exc
+        meta_path = os.path.join(model_dir, META_FILE)
+        if not os.path.exists(meta_path):
+            raise RuntimeError(
+                f"{meta_path}가 없습니다. python -m core.encoders export --out {model_dir} 로 먼저 내보내세요."
+            )
+        with open(meta_path, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.model_name = self.meta.get("model_name", "")
+        self.pooling = self.meta.get("pooling", "mean")
+        self.normalize = bool(self.meta.get("normalize", True))
+        self.max_length = int(max_length or self.meta.get("max_length", 512))
+        path = os.path.join(model_dir, INT8_FILE if quantized else FP32_FILE)
+        if not os.path.exists(path):
+            raise RuntimeError(f"{path}가 없습니다 (int8 모델은 export 시 --no-quantize 없이 생성됩니다).")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+        self.tokenizer.enable_padding(pad_id=int(self.meta.get("pad_token_id", 1)), pad_token=self.meta.get("pad_token", "<pad>"))
+
+    def _run(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        ids = np.asarray([e.ids for e in encodings], dtype=np.int64)
+        mask = np.asarray([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self._inputs:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self.session.run(None, feeds)[0]
+        if self.pooling == "cls":
+            pooled = hidden[:, 0]
+        else:
+            weights = mask[:, :, None].astype(np.float32)
+            pooled = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+        pooled = pooled.astype(np.float32, copy=False)
+        if self.normalize:
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False,
+        normalize_embeddings: bool = False,
+    ) -> np.ndarray:
+        """SentenceTransformer.encode 호환. 길이순으로 묶어 배치 내 패딩을 줄입니다."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else [str(s) for s in sentences]
+        if not texts:
+            return np.zeros((0, int(self.meta.get("dim", 0))), dtype=np.float32)
+        order = np.argsort([len(t) for t in texts], kind="stable")
+        out: Optional[np.ndarray] = None
+        for start in range(0, len(texts), max(1, batch_size)):
+            idx = order[start:start + batch_size]
+            vecs = self._run([texts[i] for i in idx])
+            if out is None:
+                out = np.empty((len(texts), vecs.shape[1]), dtype=np.float32)
+            out[idx] = vecs
+        if normalize_embeddings and not self.normalize:
+            out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+        return out[0] if single else out
+
+
+class BatchingEncoder:
+    """동시 단건 encode 요청을 모아 배치로 인코딩하는 래퍼 (요청 병합 마이크로 배처).
+
+    첫 요청이 들어온 뒤 max_wait_ms 동안 또는 max_batch개가 찰 때까지 기다렸다가
+    한 번의 encoder.encode(texts)를 실행하고 호출자별 벡터를 돌려줍니다. 처리 중이거나
+    대기 중인 같은 문장은 하나의 요청으로 합칩니다. 목록 입력(오프라인 배치)은 그대로 위임합니다.
+    """
+
+    def __init__(self, encoder, max_batch: int = 32, max_wait_ms: float = 5.0):
+        self.encoder = encoder
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def __getattr__(self, name):
+        # 원래 인코더의 속성(meta, max_seq_length 등)은 그대로 노출
+        if name == "encoder":
+            raise AttributeError(name)
+        return getattr(self.encoder, name)
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False,
+        normalize_embeddings: bool = False,
+    ) -> np.ndarray:
+        if not isinstance(sentences, str) or normalize_embeddings:
+            return self.encoder.encode(
+                sentences,
+                batch_size=batch_size,
+                convert_to_numpy=convert_to_numpy,
+                show_progress_bar=show_progress_bar,
+                normalize_embeddings=normalize_embeddings,
+            )
+        return self.submit(sentences).result()
+
+    def submit(self, text: str) -> Future:
+        """문장 하나를 배치 대기열에 넣고 벡터를 돌려줄 Future를 반환합니다."""
+        with self._lock:
+            fut = self._inflight.get(text)
+            if fut is not None:
+                metrics.ENCODER_DEDUPED.inc()
+                return fut
+            fut = self._inflight[text] = Future()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._loop, name="encoder-batcher", daemon=True)
+                self._worker.start()
+        self._queue.put(text)
+        return fut
+
+    def _collect(self) -> List[str]:
+        texts = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(texts) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                texts.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return texts
+
+    def _loop(self) -> None:
+        while True:
+            texts = self._collect()
+            with self._lock:
+                futures = [self._inflight[t] for t in texts]
+            metrics.ENCODER_BATCH_SIZE.observe(len(texts))
+            try:
+                with metrics.span("encoder.batch"):
+                    vecs = np.asarray(self.encoder.encode(texts, batch_size=len(texts), convert_to_numpy=True))
+            except BaseException as exc:
+                results = [exc] * len(texts)
+            else:
+                results = [vecs[i] for i in range(len(texts))]
+            # 결과를 넘기기 전에 대기 목록에서 빼야 이후 같은 문장이 새 요청으로 들어옵니다
+            with self._lock:
+                for t in texts:
+                    self._inflight.pop(t, None)
+            for fut, result in zip(futures, results):
+                if isinstance(result, BaseException):
+                    fut.set_exception(result)
+                else:
+                    fut.set_result(result)
+
+
+def load_encoder(config, backend: Optional[str] = None):
+    """설정의 ENCODER_BACKEND로 질의 인코더를 만듭니다 (ENCODER_BATCH_MAX > 1이면 BatchingEncoder로 감쌈).
+
+    torch 백엔드는 sentence-transformers가 없으면 None을 반환하고(인코딩 시 오류),
+    ONNX 백엔드는 의존성/모델 파일이 없으면 바로 RuntimeError를 냅니다.
+    """
+    backend = backend or config.encoder_backend
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"ENCODER_BACKEND must be one of {ENCODER_BACKENDS}, got {backend!r}")
+    if backend == "torch":
+        encoder = load_torch_encoder(config.embedding_model_name)
+    else:
+        encoder = OnnxEncoder(
+            config.encoder_onnx_dir,
+            quantized=backend == "onnx-int8",
+            threads=config.encoder_threads,
+            max_length=config.encoder_max_length or None,
+        )
+    if encoder is not None and config.encoder_batch_max > 1:
+        encoder = BatchingEncoder(encoder, config.encoder_batch_max, config.encoder_batch_wait_ms)
+    return encoder
+
+
+def export_onnx(model_name: str, out_dir: str, max_length: int = 512, quantize: bool = True, opset: int = 17) -> dict:
+    """SentenceTransformer의 트랜스포머 본체를 ONNX로 내보내고 동적 int8 양자화 버전을 만듭니다.
+
+    풀링 방식과 정규화 여부는 원본 파이프라인에서 읽어 encoder.json에 기록합니다.
+    2GB를 넘는 모델(e5-large 등)은 가중치가 외부 데이터 파일로 저장됩니다.
+    """
+    import torch  # type: ignore
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer = st[0].auto_model.eval()
+    tokenizer = st.tokenizer
+    pooling = "mean"
+    normalize = False
+    for module in st:
+        kind = type(module).__name__
+        if kind == "Pooling":
+            pooling = "cls" if module.get_pooling_mode_str() == "cls" else "mean"
+        elif kind == "Normalize":
+            normalize = True
+
+    class _Body(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+    os.makedirs(out_dir, exist_ok=True)
+    fp32_path = os.path.join(out_dir, FP32_FILE)
+    dummy = tokenizer(["query: export"], return_tensors="pt")
+    with torch.no_grad():
+        torch.onnx.export(
+            _Body(transformer),
+            (dummy["input_ids"], dummy["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "last_hidden_state": {0: "batch", 1: "seq"},
+            },
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    tokenizer.save_pretrained(out_dir)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic  # type: ignore
+
+        large = sum(p.numel() for p in transformer.parameters()) * 4 >= 2 ** 31
+        quantize_dynamic(
+            fp32_path,
+            os.path.join(out_dir, INT8_FILE),
+            weight_type=QuantType.QInt8,
+            use_external_data_format=large,
+        )
+
+    meta = {
+        "model_name": model_name,
+        "pooling": pooling,
+        "normalize": normalize,
+        "max_length": min(max_length, int(getattr(st, "max_seq_length", max_length) or max_length)),
+        "dim": int(st.get_sentence_embedding_dimension()),
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": int(tokenizer.pad_token_id),
+        "quantized": quantize,
+    }
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
+
+
+def main(argv=None) -> None:
+    from core.config import AppConfig
+
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="질의 인코더를 ONNX(fp32 + 동적 int8)로 내보냅니다.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export")
+    export.add_argument("--model", default=config.embedding_model_name)
+    export.add_argument("--out", default=config.encoder_onnx_dir)
+    export.add_argument("--max-length", type=int, default=config.encoder_max_length or 512)
+    export.add_argument("--opset", type=int, default=17)
+    export.add_argument("--no-quantize", action="store_true")
+    args = parser.parse_args(argv)
+    meta = export_onnx(args.model, args.out, args.max_length, quantize=not args.no_quantize, opset=args.opset)
+    print(f"[DONE] {args.out}: {json.dumps(meta, ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,203 +1,426 @@
-from typing import Iterable, Optional
+import argparse
+import csv
+import io
+import json
+from typing import Dict, Iterator, List, Optional, Sequence
 from pathlib import Path
 
 import pandas as pd
-import psycopg2
-from psycopg2.extras import execute_values
+from openpyxl import load_workbook
+from psycopg2 import sql
 
 from core.db import get_connection
 
+# 시트를 한 번에 메모리에 올리지 않고 이 행 수만큼씩 읽어 staging 테이블로 COPY
+CHUNK_ROWS = 20000
 
-def _bool_from_ox(value: object) -> bool:
-    s = str(value).strip().upper()
-    return s == 'O' or s == 'Y' or s == 'TRUE'
+_KEYWORD_SEPARATORS = r"[;\n\t·•]"
+_COPY_NULL = r"\N"
+# 복합 키를 row_key 문자열로 합칠 때 쓰는 구분자 (migrations/007_ingest_changeset.sql)
+_KEY_SEPARATOR = "\x1f"
 
+RESEARCHER_COLUMNS = {
+    '사용자번호': 'researcher_id',
+    '연구자명': 'name',
+    '소속': 'department',
+    '직급': 'rank',
+    '연락처': 'phone',
+    '이메일': 'email',
+    '전공': 'major',
+    '연구실 위치': 'office_location',
+    '실험실': 'lab_name',
+    '웹사이트': 'website',
+    '주요약력': 'biography',
+    '주요경력': 'career',
+    '연구분야': 'research_area',
+}
 
-def _split_keywords(text: Optional[str]) -> Iterable[str]:
-    if text is None:
-        return []
-    s = str(text)
-    if not s:
-        return []
-    # split by common separators
-    parts = []
-    for sep in [';', ',', '\n', '\t', '·', '•']:
-        if sep in s:
-            s = s.replace(sep, ',')
-    for token in s.split(','):
-        token = token.strip()
-        if token:
-            parts.append(token)
-    return parts
+PAPER_COLUMNS = {
+    '순번': 'paper_id',
+    '제목': 'title',
+    '논문등급': 'grade',
+    '발행기관': 'publisher',
+    'ISBN': 'issn',
+    '발행국가': 'country',
+    'JCR': 'jcr',
+    'IF': 'impact_factor',
+    '노션여부': 'notion_flag',
+    'ISBN온라인여부': 'online_issn_flag',
+}
 
+PATENT_COLUMNS = {
+    '순번': 'patent_id',
+    '기술구분': 'tech_type',
+    '기술명': 'title',
+    '기술분류': 'category',
+    '대표 발명자': 'lead_inventor_name',
+    '대표 발명자 번호': 'lead_inventor_id',
+    '키워드': 'keywords',
+}
 
-def ingest_excel_to_db(excel_path: Path):
-    xls = pd.ExcelFile(excel_path, engine='openpyxl')
-    sheets = {name: xls.parse(name) for name in xls.sheet_names}
 
-    conn = get_connection()
+# ---- 벡터화된 열 변환 (행 단위 Python 루프 대신 Series 연산) ----
+
+def _text(s: pd.Series) -> pd.Series:
+    """빈 값은 ''로, 나머지는 문자열로 변환합니다."""
+    return s.where(s.notna(), '').astype(str)
+
+
+def _int(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s, errors='coerce').astype('Int64')
+
+
+def _float(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s, errors='coerce').fillna(0.0)
+
+
+def _ox(s: pd.Series) -> pd.Series:
+    """'O'/'Y'/'TRUE' 표기를 bool로 변환합니다."""
+    return _text(s).str.strip().str.upper().isin(['O', 'Y', 'TRUE'])
+
+
+def _explode_keywords(ids: pd.Series, text: pd.Series, id_name: str) -> pd.DataFrame:
+    """구분자(; , 줄바꿈 탭 · •)로 나눈 키워드를 (id, keyword) 행으로 펼칩니다."""
+    tokens = text[text.notna()].astype(str).str.replace(_KEYWORD_SEPARATORS, ',', regex=True).str.split(',')
+    out = pd.DataFrame({id_name: ids[tokens.index], 'keyword': tokens}).explode('keyword')
+    out['keyword'] = out['keyword'].str.strip()
+    return out[out['keyword'].notna() & (out['keyword'] != '')]
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    return df[name] if name in df.columns else pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+# ---- 스트리밍 읽기 ----
+
+def _iter_sheet(ws, columns: Optional[Sequence[str]] = None, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """read-only 워크시트를 chunk_rows행씩 DataFrame으로 내보냅니다.
+
+    columns가 주어지면 헤더에서 해당 열만 골라 읽고(없는 열은 생략), None이면 모든 열을 읽습니다.
+    """
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    names = [str(h).strip() if h is not None else '' for h in header]
+    if columns is None:
+        picked = [(i, n) for i, n in enumerate(names)]
+    else:
+        wanted = set(columns)
+        picked = [(i, n) for i, n in enumerate(names) if n in wanted]
+    positions = [i for i, _ in picked]
+    labels = [n for _, n in picked]
+    buf: List[tuple] = []
+    for values in rows:
+        if values is None or all(v is None for v in values):
+            continue
+        buf.append(tuple(values[i] if i < len(values) else None for i in positions))
+        if len(buf) >= chunk_rows:
+            yield pd.DataFrame(buf, columns=labels)
+            buf = []
+    if buf:
+        yield pd.DataFrame(buf, columns=labels)
+
+
+# ---- staging COPY + set 기반 병합 ----
+
+def _create_stage(cur, table: str) -> str:
+    """대상 테이블과 같은 열(+ 입력 순서 _ord)을 가진 임시 staging 테이블을 만듭니다."""
+    stage = f"_stage_{table}"
+    cur.execute(
+        sql.SQL("CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS, _ord BIGSERIAL) ON COMMIT DROP").format(
+            sql.Identifier(stage), sql.Identifier(table)
+        )
+    )
+    return stage
+
+
+def _copy_frame(cur, stage: str, df: pd.DataFrame) -> None:
+    """DataFrame을 CSV로 직렬화해 staging 테이블에 COPY합니다 (NULL은 \\N)."""
+    if df.empty:
+        return
+    buf = io.StringIO()
+    df.to_csv(buf, header=False, index=False, na_rep=_COPY_NULL, quoting=csv.QUOTE_MINIMAL)
+    buf.seek(0)
+    cur.copy_expert(
+        sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL {})").format(
+            sql.Identifier(stage),
+            sql.SQL(', ').join(sql.Identifier(c) for c in df.columns),
+            sql.Literal(_COPY_NULL),
+        ).as_string(cur),
+        buf,
+    )
+
+
+def _row_key(keys: Sequence[str], alias: Optional[str] = None) -> sql.Composable:
+    """기본 키 열들을 row_key 텍스트로 합치는 SQL 식."""
+    parts = [sql.Identifier(alias, k) if alias else sql.Identifier(k) for k in keys]
+    return sql.SQL("concat_ws({}, {})").format(
+        sql.Literal(_KEY_SEPARATOR),
+        sql.SQL(', ').join(sql.SQL("{}::text").format(p) for p in parts),
+    )
+
+
+def _merge(cur, run_id: int, table: str, stage: str, columns: Sequence[str], keys: Sequence[str],
+           update: Optional[Sequence[str]] = None, delete_missing: bool = False) -> Dict[str, int]:
+    """staging → 대상 테이블 병합. 지문(md5)이 바뀐 행만 쓰고 변경분을 ingest_changeset에 기록합니다.
+
+    같은 키가 여러 번 나오면 마지막 행이 반영됩니다. update가 None이면 키 이외의 모든 열을
+    갱신하고, 빈 목록이면 DO NOTHING입니다. 이전 실행에는 있었으나 이번 시트에 없는 키는
+    'delete'로 보고하며, delete_missing이면 대상 테이블에서도 삭제합니다.
+    """
+    if update is None:
+        update = [c for c in columns if c not in keys]
+    cols = sql.SQL(', ').join(sql.Identifier(c) for c in columns)
+    key_list = sql.SQL(', ').join(sql.Identifier(k) for k in keys)
+    latest = sql.Identifier(f"_latest_{table}")
+    if update:
+        # 지문이 없던 행(첫 실행)도 값이 같으면 다시 쓰지 않음
+        action = sql.SQL("DO UPDATE SET {} WHERE ({}) IS DISTINCT FROM ({})").format(
+            sql.SQL(', ').join(sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in update),
+            sql.SQL(', ').join(sql.Identifier(table, c) for c in update),
+            sql.SQL(', ').join(sql.Identifier("excluded", c) for c in update),
+        )
+    else:
+        action = sql.SQL("DO NOTHING")
+    params = {"run_id": run_id, "table": table}
+
+    cur.execute(
+        sql.SQL(
+            """
+            CREATE TEMP TABLE {latest} ON COMMIT DROP AS
+            SELECT DISTINCT ON ({keys}) {cols},
+                   {row_key} AS _row_key,
+                   md5(ROW({cols})::text) AS _fp
+              FROM {stage}
+          ORDER BY {keys}, _ord DESC
+            """
+        ).format(latest=latest, keys=key_list, cols=cols, row_key=_row_key(keys), stage=sql.Identifier(stage))
+    )
+    cur.execute(sql.SQL("SELECT count(*) FROM {}").format(latest))
+    total = cur.fetchone()[0]
+
+    cur.execute(
+        sql.SQL(
+            """
+            WITH changed AS (
+                SELECT l.*
+                  FROM {latest} l
+             LEFT JOIN ingest_fingerprint f
+                    ON f.table_name = %(table)s AND f.row_key = l._row_key
+                 WHERE f.fingerprint IS DISTINCT FROM l._fp
+            ), written AS (
+                INSERT INTO {table} ({cols})
+                SELECT {cols} FROM changed
+                ON CONFLICT ({keys}) {action}
+                RETURNING {target_key} AS row_key, (xmax = 0) AS inserted
+            ), fingerprints AS (
+                INSERT INTO ingest_fingerprint (table_name, row_key, fingerprint, run_id)
+                SELECT %(table)s, _row_key, _fp, %(run_id)s FROM changed
+                ON CONFLICT (table_name, row_key) DO UPDATE
+                   SET fingerprint = EXCLUDED.fingerprint,
+                       run_id = EXCLUDED.run_id
+            )
+            INSERT INTO ingest_changeset (run_id, table_name, row_key, op)
+            SELECT %(run_id)s, %(table)s, row_key, CASE WHEN inserted THEN 'insert' ELSE 'update' END
+              FROM written
+            RETURNING op
+            """
+        ).format(
+            latest=latest,
+            table=sql.Identifier(table),
+            cols=cols,
+            keys=key_list,
+            action=action,
+            target_key=_row_key(keys, table),
+        ),
+        params,
+    )
+    ops = [row[0] for row in cur.fetchall()]
+
+    delete_target = sql.SQL("")
+    if delete_missing:
+        delete_target = sql.SQL(
+            ", removed AS (DELETE FROM {table} t USING gone g WHERE {key} = g.row_key)"
+        ).format(table=sql.Identifier(table), key=_row_key(keys, "t"))
+    cur.execute(
+        sql.SQL(
+            """
+            WITH gone AS (
+                DELETE FROM ingest_fingerprint f
+                 WHERE f.table_name = %(table)s
+                   AND NOT EXISTS (SELECT 1 FROM {latest} l WHERE l._row_key = f.row_key)
+             RETURNING f.row_key
+            ){delete_target}
+            INSERT INTO ingest_changeset (run_id, table_name, row_key, op)
+            SELECT %(run_id)s, %(table)s, row_key, 'delete' FROM gone
+            """
+        ).format(latest=latest, delete_target=delete_target),
+        params,
+    )
+    deleted = cur.rowcount
+    inserted = ops.count('insert')
+    updated = ops.count('update')
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": total - inserted - updated,
+        "deleted": deleted,
+    }
+
+
+def changed_keys(cur, table: str, since_run_id: int, ops: Sequence[str] = ('insert', 'update')) -> List[str]:
+    """since_run_id 이후 실행에서 바뀐 table의 row_key 목록을 반환합니다 (임베딩 작업용)."""
+    cur.execute(
+        """
+        SELECT DISTINCT row_key
+          FROM ingest_changeset
+         WHERE table_name = %s
+           AND run_id > %s
+           AND op = ANY(%s)
+        """,
+        (table, since_run_id, list(ops)),
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+# ---- 시트별 변환 ----
+
+def _researcher_frame(df: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame({col: _text(_column(df, src)) for src, col in RESEARCHER_COLUMNS.items()})
+    out['researcher_id'] = _int(_column(df, '사용자번호'))
+    return out[out['researcher_id'].notna()]
+
+
+def _paper_frames(df: pd.DataFrame):
+    pid = _int(_column(df, '순번'))
+    papers = pd.DataFrame({col: _text(_column(df, src)) for src, col in PAPER_COLUMNS.items()})
+    papers['paper_id'] = pid
+    papers['jcr'] = _float(_column(df, 'JCR'))
+    papers['impact_factor'] = _float(_column(df, 'IF'))
+    papers['notion_flag'] = _ox(_column(df, '노션여부'))
+    papers['online_issn_flag'] = _ox(_column(df, 'ISBN온라인여부'))
+    papers = papers[pid.notna()]
+
+    authors = pd.DataFrame({
+        'paper_id': pid,
+        'researcher_id': _int(_column(df, '사용자번호')),
+        'is_corresponding': _ox(_column(df, '교신저자여부')),
+    })
+    authors = authors[authors['paper_id'].notna() & authors['researcher_id'].notna()]
+
+    keywords = _explode_keywords(pid, _column(df, '키워드'), 'paper_id')
+    keywords = keywords[keywords['paper_id'].notna()]
+    return papers, authors, keywords
+
+
+def _patent_frame(df: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame({col: _text(_column(df, src)) for src, col in PATENT_COLUMNS.items()})
+    out['patent_id'] = _int(_column(df, '순번'))
+    out['lead_inventor_id'] = _int(_column(df, '대표 발명자 번호'))
+    return out[out['patent_id'].notna()]
+
+
+def _pseudonym_frame(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    if df.shape[1] < 2:
+        return None
+    out = pd.DataFrame({
+        'researcher_id': _int(df.iloc[:, 0]),
+        'pseudonym': _text(df.iloc[:, 1]),
+    })
+    return out[out['researcher_id'].notna()]
+
+
+def ingest_excel_to_db(excel_path: Path, chunk_rows: int = CHUNK_ROWS, delete_missing: bool = False) -> Dict:
+    """엑셀 워크북을 스트리밍으로 읽어 staging 테이블에 COPY한 뒤 바뀐 행만 병합합니다.
+
+    openpyxl read-only 모드로 필요한 열만 chunk_rows행씩 읽고, 열 단위로 벡터화 변환한 결과를
+    CSV COPY로 적재합니다. 행 지문(migrations/007_ingest_changeset.sql)과 비교해 추가/변경된 행만
+    대상 테이블에 쓰고, 변경분은 이번 run_id로 ingest_changeset에 남깁니다. 모든 시트가 하나의
+    트랜잭션으로 반영되며, {"run_id": ..., "tables": {테이블: 건수}}를 반환합니다.
+    """
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    merged: Dict[str, Dict[str, int]] = {}
     try:
-        with conn:
+        with get_connection() as conn:
             with conn.cursor() as cur:
+                cur.execute("INSERT INTO ingest_run (source) VALUES (%s) RETURNING run_id", (str(excel_path),))
+                run_id = cur.fetchone()[0]
+
                 # Researchers
-                if '연구자' in sheets:
-                    df = sheets['연구자']
-                    rows = []
-                    for _, r in df.iterrows():
-                        rows.append((
-                            int(r['사용자번호']),
-                            str(r['연구자명']),
-                            str(r.get('소속', '') or ''),
-                            str(r.get('직급', '') or ''),
-                            str(r.get('연락처', '') or ''),
-                            str(r.get('이메일', '') or ''),
-                            str(r.get('전공', '') or ''),
-                            str(r.get('연구실 위치', '') or ''),
-                            str(r.get('실험실', '') or ''),
-                            str(r.get('웹사이트', '') or ''),
-                            str(r.get('주요약력', '') or ''),
-                            str(r.get('주요경력', '') or ''),
-                            str(r.get('연구분야', '') or ''),
-                        ))
-                    execute_values(cur,
-                        """
-                        INSERT INTO researcher (
-                            researcher_id, name, department, rank, phone, email, major,
-                            office_location, lab_name, website, biography, career, research_area
-                        ) VALUES %s
-                        ON CONFLICT (researcher_id) DO UPDATE SET
-                            name=EXCLUDED.name,
-                            department=EXCLUDED.department,
-                            rank=EXCLUDED.rank,
-                            phone=EXCLUDED.phone,
-                            email=EXCLUDED.email,
-                            major=EXCLUDED.major,
-                            office_location=EXCLUDED.office_location,
-                            lab_name=EXCLUDED.lab_name,
-                            website=EXCLUDED.website,
-                            biography=EXCLUDED.biography,
-                            career=EXCLUDED.career,
-                            research_area=EXCLUDED.research_area
-                        """,
-                        rows
-                    )
+                if '연구자' in wb.sheetnames:
+                    stage = _create_stage(cur, 'researcher')
+                    for df in _iter_sheet(wb['연구자'], list(RESEARCHER_COLUMNS), chunk_rows):
+                        _copy_frame(cur, stage, _researcher_frame(df))
+                    merged['researcher'] = _merge(
+                        cur, run_id, 'researcher', stage, list(RESEARCHER_COLUMNS.values()), ['researcher_id'],
+                        delete_missing=delete_missing)
 
                 # Papers and authors and keywords
-                if '논문' in sheets:
-                    df = sheets['논문']
-                    paper_rows = []
-                    author_rows = []
-                    keyword_rows = []
-                    for _, r in df.iterrows():
-                        pid = int(r['순번'])
-                        paper_rows.append((
-                            pid,
-                            str(r.get('제목', '') or ''),
-                            str(r.get('논문등급', '') or ''),
-                            str(r.get('발행기관', '') or ''),
-                            str(r.get('ISBN', '') or ''),
-                            str(r.get('발행국가', '') or ''),
-                            float(r.get('JCR', 0) or 0),
-                            float(r.get('IF', 0) or 0),
-                            _bool_from_ox(r.get('노션여부', 'X')),
-                            _bool_from_ox(r.get('ISBN온라인여부', 'X')),
-                        ))
-
-                        rid = int(r.get('사용자번호'))
-                        is_corr = _bool_from_ox(r.get('교신저자여부', 'X'))
-                        author_rows.append((pid, rid, is_corr))
-
-                        for kw in _split_keywords(r.get('키워드')):
-                            keyword_rows.append((pid, kw))
-
-                    execute_values(cur,
-                        """
-                        INSERT INTO paper (
-                            paper_id, title, grade, publisher, issn, country, jcr, impact_factor, notion_flag, online_issn_flag
-                        ) VALUES %s
-                        ON CONFLICT (paper_id) DO UPDATE SET
-                            title=EXCLUDED.title,
-                            grade=EXCLUDED.grade,
-                            publisher=EXCLUDED.publisher,
-                            issn=EXCLUDED.issn,
-                            country=EXCLUDED.country,
-                            jcr=EXCLUDED.jcr,
-                            impact_factor=EXCLUDED.impact_factor,
-                            notion_flag=EXCLUDED.notion_flag,
-                            online_issn_flag=EXCLUDED.online_issn_flag
-                        """,
-                        paper_rows
-                    )
-
-                    execute_values(cur,
-                        """
-                        INSERT INTO paper_author (paper_id, researcher_id, is_corresponding)
-                        VALUES %s
-                        ON CONFLICT (paper_id, researcher_id) DO UPDATE SET
-                            is_corresponding = EXCLUDED.is_corresponding
-                        """,
-                        author_rows
-                    )
-
-                    if keyword_rows:
-                        execute_values(cur,
-                            """
-                            INSERT INTO paper_keyword (paper_id, keyword)
-                            VALUES %s
-                            ON CONFLICT (paper_id, keyword) DO NOTHING
-                            """,
-                            keyword_rows
-                        )
+                if '논문' in wb.sheetnames:
+                    paper_stage = _create_stage(cur, 'paper')
+                    author_stage = _create_stage(cur, 'paper_author')
+                    keyword_stage = _create_stage(cur, 'paper_keyword')
+                    wanted = list(PAPER_COLUMNS) + ['사용자번호', '교신저자여부', '키워드']
+                    for df in _iter_sheet(wb['논문'], wanted, chunk_rows):
+                        papers, authors, keywords = _paper_frames(df)
+                        _copy_frame(cur, paper_stage, papers)
+                        _copy_frame(cur, author_stage, authors)
+                        _copy_frame(cur, keyword_stage, keywords)
+                    merged['paper'] = _merge(
+                        cur, run_id, 'paper', paper_stage, list(PAPER_COLUMNS.values()), ['paper_id'],
+                        delete_missing=delete_missing)
+                    merged['paper_author'] = _merge(
+                        cur, run_id, 'paper_author', author_stage,
+                        ['paper_id', 'researcher_id', 'is_corresponding'], ['paper_id', 'researcher_id'],
+                        delete_missing=delete_missing)
+                    merged['paper_keyword'] = _merge(
+                        cur, run_id, 'paper_keyword', keyword_stage, ['paper_id', 'keyword'], ['paper_id', 'keyword'],
+                        [], delete_missing=delete_missing)
 
                 # Patents
-                if '특허' in sheets:
-                    df = sheets['특허']
-                    rows = []
-                    for _, r in df.iterrows():
-                        rows.append((
-                            int(r['순번']),
-                            str(r.get('기술구분', '') or ''),
-                            str(r.get('기술명', '') or ''),
-                            str(r.get('기술분류', '') or ''),
-                            str(r.get('대표 발명자', '') or ''),
-                            int(r.get('대표 발명자 번호')) if pd.notna(r.get('대표 발명자 번호')) else None,
-                            str(r.get('키워드', '') or ''),
-                        ))
-                    execute_values(cur,
-                        """
-                        INSERT INTO patent (
-                            patent_id, tech_type, title, category, lead_inventor_name, lead_inventor_id, keywords
-                        ) VALUES %s
-                        ON CONFLICT (patent_id) DO UPDATE SET
-                            tech_type=EXCLUDED.tech_type,
-                            title=EXCLUDED.title,
-                            category=EXCLUDED.category,
-                            lead_inventor_name=EXCLUDED.lead_inventor_name,
-                            lead_inventor_id=EXCLUDED.lead_inventor_id,
-                            keywords=EXCLUDED.keywords
-                        """,
-                        rows
-                    )
+                if '특허' in wb.sheetnames:
+                    stage = _create_stage(cur, 'patent')
+                    for df in _iter_sheet(wb['특허'], list(PATENT_COLUMNS), chunk_rows):
+                        _copy_frame(cur, stage, _patent_frame(df))
+                    merged['patent'] = _merge(
+                        cur, run_id, 'patent', stage, list(PATENT_COLUMNS.values()), ['patent_id'],
+                        delete_missing=delete_missing)
 
                 # Pseudonym
-                if '가명처리' in sheets:
-                    df = sheets['가명처리']
-                    if df.shape[1] >= 2:
-                        id_col = df.columns[0]
-                        name_col = df.columns[1]
-                        rows = []
-                        for _, r in df.iterrows():
-                            rows.append((int(r[id_col]), str(r[name_col])))
-                        execute_values(cur,
-                            """
-                            INSERT INTO pseudonym (researcher_id, pseudonym)
-                            VALUES %s
-                            ON CONFLICT (researcher_id) DO UPDATE SET
-                                pseudonym=EXCLUDED.pseudonym
-                            """,
-                            rows
-                        )
+                if '가명처리' in wb.sheetnames:
+                    stage = _create_stage(cur, 'pseudonym')
+                    for df in _iter_sheet(wb['가명처리'], None, chunk_rows):
+                        frame = _pseudonym_frame(df)
+                        if frame is not None:
+                            _copy_frame(cur, stage, frame)
+                    merged['pseudonym'] = _merge(
+                        cur, run_id, 'pseudonym', stage, ['researcher_id', 'pseudonym'], ['researcher_id'],
+                        delete_missing=delete_missing)
+
+                cur.execute(
+                    "UPDATE ingest_run SET finished_at = now(), stats = %s WHERE run_id = %s",
+                    (json.dumps(merged), run_id),
+                )
     finally:
-        conn.close()
+        wb.close()
+    return {"run_id": run_id, "tables": merged}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="엑셀 워크북을 DB에 증분 적재합니다.")
+    parser.add_argument("excel_path", type=Path)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument(
+        "--delete-missing", action="store_true",
+        help="이전 실행에 있었으나 이번 워크북에 없는 행을 대상 테이블에서도 삭제",
+    )
+    args = parser.parse_args()
+    report = ingest_excel_to_db(args.excel_path, args.chunk_rows, args.delete_missing)
+    print(f"[INFO] run_id={report['run_id']}")
+    for table, counts in report["tables"].items():
+        print(f"[OK] {table}: " + " ".join(f"{k}={v}" for k, v in counts.items()))
 
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# core/keyword_index.py
+"""연구자 키워드 사전 처리와 키워드 → 연구자 역색인.
+
+VectorUtils가 적재될 때 연구자별 키워드를 한 번만 정리(공백 제거, 대소문자 무시 중복 제거,
+언어 우선순위 정렬)하고, 소문자 키워드를 정수 ID로 바꿔 연구자별 ID 목록과 역색인(posting)을 만듭니다.
+연구자별 목록은 문자열 대신 인턴된 정수 ID의 CSR 열(core.researcher_store.IntListColumn)로 보관합니다.
+추천 요청에서는 질의 토큰을 한 번 ID로 바꾼 뒤 집합/posting 조회만으로 키워드 가산점과
+일치 키워드를 구합니다 (recommendation.dedupe_keywords / 부분 문자열 일치와 같은 결과).
+"""
+
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from core.researcher_store import IntListColumn, TermListColumn
+
+
+def language_order(priority: str) -> List[str]:
+    """KEYWORD_LANGUAGE_PRIORITY("ko,en")를 언어 코드 목록으로 바꿉니다."""
+    return [lang.strip() for lang in (priority or "").split(",") if lang.strip()] or ["ko", "en"]
+
+
+def language_rank(word: str, lang_order: Sequence[str]) -> int:
+    """언어 우선순위(ko: 한글 포함, en: ASCII)에서 단어의 순위를 반환합니다."""
+    for idx, lang in enumerate(lang_order):
+        if lang == "ko" and any("가" <= ch <= "힣" for ch in word):
+            return idx
+        if lang == "en" and word.isascii():
+            return idx
+    return len(lang_order)
+
+
+def query_tokens(query: str) -> List[str]:
+    """질의를 쉼표/공백으로 나눈 소문자 토큰 목록 (중복 유지, 가산점은 토큰마다 셈)."""
+    return [t.strip().lower() for t in query.replace(",", " ").split() if t.strip()]
+
+
+class QueryTerms:
+    """질의 1건의 토큰과 키워드 ID, 키워드별 부분 일치 결과 메모."""
+
+    __slots__ = ("tokens", "key_ids", "pattern", "_substring")
+
+    def __init__(self, tokens: List[str], key_ids: List[int]):
+        self.tokens = tokens
+        self.key_ids = key_ids
+        # 토큰 중 하나라도 부분 문자열로 포함하는지 한 번의 search로 판정
+        self.pattern = re.compile("|".join(map(re.escape, sorted(set(tokens), key=len)))) if tokens else None
+        self._substring: Dict[int, bool] = {}
+
+
+class KeywordIndex:
+    """연구자 위치별 정리된 키워드와 소문자 키워드 ID 역색인.
+
+    - terms[term_id]: 정리된 표시용 키워드 (같은 문자열은 한 번만 저장)
+    - rk[pos] / pk[pos]: 정리·정렬된 표시용 키워드 튜플 (term ID CSR을 읽을 때 문자열로 풂)
+    - key_ids[pos]: 논문+특허 키워드의 소문자 ID 튜플 (중복 없음, CSR)
+    - postings[key_id]: 그 키워드를 가진 연구자 위치 (int32 배열)
+
+    연구자별 목록은 행 오프셋 + int32 ID 배열로만 저장해 연구자 10만 명 규모에서도
+    키워드 1개당 수 바이트로 유지합니다.
+    """
+
+    def __init__(self, lang_order: Sequence[str]):
+        self.lang_order = list(lang_order) or ["ko", "en"]
+        self.terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        # term ID → 언어 순위 / 소문자 키 ID
+        self._term_rank = array("i")
+        self._term_key = array("i")
+        self._key_ids: Dict[str, int] = {}
+        self.keys: List[str] = []
+        self._set_columns(IntListColumn(), IntListColumn(), IntListColumn())
+        self.postings: Dict[int, array] = {}
+
+    def _set_columns(self, rk_ids: IntListColumn, pk_ids: IntListColumn, key_ids: IntListColumn) -> None:
+        self.rk_ids = rk_ids
+        self.pk_ids = pk_ids
+        self.key_ids = key_ids
+        self.rk = TermListColumn(rk_ids, self.terms)
+        self.pk = TermListColumn(pk_ids, self.terms)
+
+    @classmethod
+    def build(cls, rk_lists: Iterable[Sequence[str]], pk_lists: Iterable[Sequence[str]],
+              lang_order: Sequence[str]) -> "KeywordIndex":
+        """전체 연구자를 한 번에 색인합니다 (행별 ID를 모아 CSR과 posting을 일괄 구성)."""
+        index = cls(lang_order)
+        rk_rows: List[Tuple[int, ...]] = []
+        pk_rows: List[Tuple[int, ...]] = []
+        key_rows: List[Tuple[int, ...]] = []
+        for rk, pk in zip(rk_lists, pk_lists):
+            rk_terms, rk_keys = index._clean(rk)
+            pk_terms, pk_keys = index._clean(pk)
+            rk_rows.append(rk_terms)
+            pk_rows.append(pk_terms)
+            key_rows.append(tuple(dict.fromkeys(rk_keys + pk_keys)))
+        index._set_columns(
+            IntListColumn.from_lists(rk_rows), IntListColumn.from_lists(pk_rows), IntListColumn.from_lists(key_rows)
+        )
+        del rk_rows, pk_rows, key_rows
+        # posting: 키 ID 기준 안정 정렬로 키별 연구자 위치 구간을 한 번에 만듦
+        offsets, values = index.key_ids.csr()
+        docs = np.repeat(np.arange(len(index.key_ids), dtype="int32"), np.diff(offsets))
+        order = np.argsort(values, kind="stable")
+        sorted_keys = values[order]
+        sorted_docs = docs[order]
+        bounds = np.searchsorted(sorted_keys, np.arange(len(index.keys) + 1))
+        for kid in range(len(index.keys)):
+            start, end = bounds[kid], bounds[kid + 1]
+            if end > start:
+                posting = index.postings[kid] = array("i")
+                posting.frombytes(sorted_docs[start:end].tobytes())
+        return index
+
+    def _key_id(self, key: str) -> int:
+        kid = self._key_ids.get(key)
+        if kid is None:
+            kid = self._key_ids[key] = len(self.keys)
+            self.keys.append(key)
+        return kid
+
+    def _term_id(self, word: str) -> int:
+        tid = self._term_ids.get(word)
+        if tid is None:
+            tid = self._term_ids[word] = len(self.terms)
+            self.terms.append(word)
+            self._term_rank.append(language_rank(word, self.lang_order))
+            self._term_key.append(self._key_id(word.lower()))
+        return tid
+
+    def _clean(self, keywords: Sequence[str]) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """dedupe_keywords와 같은 규칙으로 정리하고 (표시용 term ID 튜플, 같은 순서의 소문자 키 ID)를 반환합니다."""
+        seen: Set[int] = set()
+        kept: List[Tuple[int, int, int]] = []
+        for kw in keywords:
+            if not kw:
+                continue
+            word = kw.strip()
+            if not word:
+                continue
+            tid = self._term_id(word)
+            kid = self._term_key[tid]
+            if kid in seen:
+                continue
+            seen.add(kid)
+            kept.append((self._term_rank[tid], tid, kid))
+        kept.sort(key=lambda item: item[0])  # 안정 정렬: 같은 언어 안에서는 원래 순서
+        return tuple(tid for _, tid, _ in kept), tuple(kid for _, _, kid in kept)
+
+    def copy(self) -> "KeywordIndex":
+        """refresh용 사본: 연구자별 열과 posting 사전을 복사합니다.
+
+        용어/키 사전은 추가만 되므로 공유하며, posting 배열은 set()이 새 배열로 교체하므로 공유해도 됩니다.
+        """
+        new = KeywordIndex.__new__(KeywordIndex)
+        new.__dict__.update(self.__dict__)
+        new._set_columns(self.rk_ids.copy(), self.pk_ids.copy(), self.key_ids.copy())
+        new.postings = dict(self.postings)
+        return new
+
+    @property
+    def nbytes(self) -> int:
+        """연구자별 CSR 열과 posting 배열의 바이트 수 (사전 문자열 제외)."""
+        postings = sum(p.buffer_info()[1] * p.itemsize for p in self.postings.values())
+        return self.rk_ids.nbytes + self.pk_ids.nbytes + self.key_ids.nbytes + postings
+
+    def set(self, pos: int, rk: Sequence[str], pk: Sequence[str]) -> None:
+        """연구자 위치 pos의 키워드를 (다시) 색인합니다. 새 위치(pos == 연구자 수)는 끝에 추가됩니다.
+
+        바뀌는 posting은 제자리에서 고치지 않고 새 배열로 교체합니다 (copy() 원본과 공유 중일 수 있음).
+        """
+        rk_terms, rk_keys = self._clean(rk)
+        pk_terms, pk_keys = self._clean(pk)
+        keys = tuple(dict.fromkeys(rk_keys + pk_keys))
+        old: Tuple[int, ...] = ()
+        if pos < len(self.key_ids):
+            old = self.key_ids[pos]
+            for kid in set(old).difference(keys):
+                posting = array("i", self.postings[kid])
+                posting.remove(pos)
+                self.postings[kid] = posting
+            self.rk_ids[pos] = rk_terms
+            self.pk_ids[pos] = pk_terms
+            self.key_ids[pos] = keys
+        else:
+            self.rk_ids.append(rk_terms)
+            self.pk_ids.append(pk_terms)
+            self.key_ids.append(keys)
+        for kid in set(keys).difference(old):
+            posting = array("i", self.postings.get(kid, ()))
+            posting.append(pos)
+            self.postings[kid] = posting
+
+    def query(self, query: str) -> QueryTerms:
+        """질의 토큰을 키워드 ID로 바꿉니다 (색인에 없는 토큰은 가산점에 기여하지 않음)."""
+        tokens = query_tokens(query)
+        key_ids = [kid for kid in (self._key_ids.get(t) for t in tokens) if kid is not None]
+        return QueryTerms(tokens, key_ids)
+
+    def overlap(self, pos: int, terms: QueryTerms) -> int:
+        """질의 토큰 중 연구자 pos의 키워드와 정확히 같은 토큰 수 (중복 토큰은 각각 셈)."""
+        if not terms.key_ids:
+            return 0
+        keys = self.key_ids[pos]
+        return sum(1 for kid in terms.key_ids if kid in keys)
+
+    def researchers_with(self, keyword: str) -> Set[int]:
+        """키워드(대소문자 무시)를 가진 연구자 위치 집합 (posting 조회)."""
+        kid = self._key_ids.get(keyword.strip().lower())
+        return set(self.postings.get(kid, ())) if kid is not None else set()
+
+    def candidates(self, terms: QueryTerms) -> Set[int]:
+        """질의 토큰과 정확히 일치하는 키워드를 하나 이상 가진 연구자 위치 (posting 합집합)."""
+        out: Set[int] = set()
+        for kid in set(terms.key_ids):
+            out.update(self.postings.get(kid, ()))
+        return out
+
+    def matched(self, pos: int, terms: QueryTerms, limit: Optional[int] = None) -> List[str]:
+        """연구자 pos의 논문 키워드 중 질의 토큰을 부분 문자열로 포함하는 것 (정렬 순서 유지).
+
+        키워드별 판정은 질의 단위로 메모해 후보들 사이에서 다시 계산하지 않습니다.
+        """
+        if terms.pattern is None:
+            return []
+        search = terms.pattern.search
+        memo = terms._substring
+        tids = self.rk_ids[pos]
+        out: List[str] = []
+        for tid, kid in zip(tids, map(self._term_key.__getitem__, tids)):
+            hit = memo.get(kid)
+            if hit is None:
+                hit = memo[kid] = search(self.keys[kid]) is not None
+            if hit:
+                out.append(self.terms[tid])
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
@@ -0,0 +1,319 @@
+# core/metrics.py
+"""단계별 지연 측정(span)과 Prometheus 텍스트 형식 지표.
+
+- ``with span("encode"):`` 블록의 소요 시간을 ``stage_seconds{stage="encode"}`` 히스토그램에 기록하고,
+  요청 처리 중이면 요청별 타이밍 목록에도 남깁니다 (구조화 요청 로그용).
+- ``db_span("fetch_contexts")``는 DB 질의 수/시간을, ``record_llm_usage``는 LLM 호출 수와 토큰을,
+  ``record_llm_abandoned``는 마감시간에 포기한 LLM 호출 수를 셉니다.
+- 캐시/연결 풀처럼 자체 카운터를 가진 구성 요소는 ``register_collector``로 스크레이프 시점에 읽습니다.
+
+외부 라이브러리 없이 /metrics 응답(text/plain; version=0.0.4)을 만듭니다.
+"""
+
+import bisect
+import contextvars
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+request_log = logging.getLogger("metrics.request")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨별 [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[Tuple, List[int]] = {}
+        self._sums: Dict[Tuple, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        pos = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[pos] += 1
+            self._sums[key] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in sorted(self._counts.items())]
+        lines = self.header()
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+# 수집기: () -> [(이름, 종류, 도움말, [(라벨 dict, 값), ...])]
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict, float]]]]]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                continue  # 수집 실패가 /metrics 전체를 막지 않도록
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram("stage_seconds", "Latency of instrumented stages", ["stage"]))
+STAGE_ERRORS = REGISTRY.register(Counter("stage_errors_total", "Instrumented stages that raised", ["stage"]))
+HTTP_SECONDS = REGISTRY.register(Histogram("http_request_seconds", "HTTP request latency", ["method", "route", "status"]))
+HTTP_REQUESTS = REGISTRY.register(Counter("http_requests_total", "HTTP requests", ["method", "route", "status"]))
+DB_QUERIES = REGISTRY.register(Counter("db_queries_total", "Database queries", ["query"]))
+DB_SECONDS = REGISTRY.register(Histogram("db_query_seconds", "Database query latency", ["query"]))
+LLM_REQUESTS = REGISTRY.register(Counter("llm_requests_total", "LLM API calls", ["caller", "outcome"]))
+LLM_TOKENS = REGISTRY.register(Counter("llm_tokens_total", "LLM tokens reported by the API", ["caller", "kind"]))
+LLM_ABANDONED = REGISTRY.register(Counter(
+    "llm_abandoned_total", "LLM calls given up at the deadline or on disconnect", ["caller", "state"]))
+ENCODER_BATCH_SIZE = REGISTRY.register(Histogram(
+    "encoder_batch_size", "Texts per coalesced encoder call", buckets=(1, 2, 4, 8, 16, 32, 64, 128)))
+ENCODER_DEDUPED = REGISTRY.register(Counter("encoder_deduplicated_total", "Encode requests merged into an in-flight identical text"))
+
+
+# ---- 요청 단위 타이밍 ----
+
+class _RequestTiming:
+    __slots__ = ("request_id", "method", "route", "started", "spans")
+
+    def __init__(self, method: str, route: str):
+        self.request_id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.route = route
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+
+
+_current: contextvars.ContextVar[Optional[_RequestTiming]] = contextvars.ContextVar("metrics_request", default=None)
+
+
+def enable_request_log(handler: Optional[logging.Handler] = None) -> None:
+    """metrics.request 로거가 INFO 수준의 요청 타이밍 JSON 줄을 출력하도록 설정합니다 (기본: stderr)."""
+    request_log.setLevel(logging.INFO)
+    if handler is not None or not request_log.handlers:
+        request_log.addHandler(handler or logging.StreamHandler())
+
+
+def begin_request(method: str, route: str) -> None:
+    """요청 처리 시작을 기록합니다 (Flask before_request)."""
+    _current.set(_RequestTiming(method, route))
+
+
+def end_request(status: int, log: bool = False) -> Optional[float]:
+    """요청 처리 종료를 기록하고 소요 시간(초)을 반환합니다. log면 구조화 타이밍 로그를 남깁니다."""
+    timing = _current.get()
+    if timing is None:
+        return None
+    _current.set(None)
+    elapsed = time.perf_counter() - timing.started
+    labels = {"method": timing.method, "route": timing.route, "status": str(status)}
+    HTTP_SECONDS.observe(elapsed, **labels)
+    HTTP_REQUESTS.inc(**labels)
+    if log:
+        request_log.info(json.dumps({
+            "request_id": timing.request_id,
+            "method": timing.method,
+            "route": timing.route,
+            "status": status,
+            "ms": round(elapsed * 1000, 2),
+            "spans": [{"stage": name, "ms": round(sec * 1000, 2)} for name, sec in timing.spans],
+        }, ensure_ascii=False))
+    return elapsed
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """블록 소요 시간을 stage 히스토그램과 현재 요청 타이밍에 기록합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timing = _current.get()
+        if timing is not None:
+            timing.spans.append((stage, elapsed))
+
+
+@contextmanager
+def db_span(query: str) -> Iterator[None]:
+    """DB 질의 1회의 수와 시간을 기록합니다 (stage 이름은 db.<query>)."""
+    started = time.perf_counter()
+    DB_QUERIES.inc(query=query)
+    try:
+        with span(f"db.{query}"):
+            yield
+    finally:
+        DB_SECONDS.observe(time.perf_counter() - started, query=query)
+
+
+def timed(stage: str):
+    """함수 전체를 span(stage)로 감싸는 데코레이터."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_llm_usage(caller: str, response=None, error: Optional[BaseException] = None) -> None:
+    """LLM 호출 결과(성공/실패)와 응답의 usage 토큰 수를 기록합니다."""
+    LLM_REQUESTS.inc(caller=caller, outcome="error" if error is not None else "ok")
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        count = getattr(usage, kind, None)
+        if count:
+            LLM_TOKENS.inc(count, caller=caller, kind=kind.split("_")[0])
+
+
+def record_llm_abandoned(caller: str, cancelled: int, running: int) -> None:
+    """마감시간/연결 종료로 포기한 LLM 호출 수를 기록합니다 (cancelled: 시작 전 취소, running: 이미 실행 중)."""
+    if cancelled:
+        LLM_ABANDONED.inc(cancelled, caller=caller, state="cancelled")
+    if running:
+        LLM_ABANDONED.inc(running, caller=caller, state="running")
+
+
+def cache_collector(stats: Callable[[], Dict[str, Dict[str, int]]]) -> Collector:
+    """{캐시 이름: LRUCache.stats()}를 반환하는 함수를 지표 수집기로 바꿉니다."""
+    def collect():
+        events, sizes = [], []
+        for cache, counters in stats().items():
+            for event, value in counters.items():
+                if event in ("size", "maxsize"):
+                    sizes.append(({"cache": cache, "kind": event}, value))
+                else:
+                    events.append(({"cache": cache, "event": event}, value))
+        return [
+            ("cache_events_total", "counter", "Cache hits, misses and evictions", events),
+            ("cache_entries", "gauge", "Cache size and capacity", sizes),
+        ]
+    return collect
+
+
+def pool_collector(stats: Callable[[], Dict[str, Dict[str, float]]]) -> Collector:
+    """core.db.pool_stats()를 연결 풀 게이지로 내보내는 수집기."""
+    def collect():
+        samples = [
+            ({"pool": pool, "stat": stat}, value)
+            for pool, counters in stats().items()
+            for stat, value in counters.items()
+            if isinstance(value, (int, float))
+        ]
+        return [("db_pool", "gauge", "Connection pool counters (core.db.pool_stats)", samples)]
+    return collect
+
+
+def render() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,179 @@
+# core/pgvector_codec.py
+"""pgvector 바이너리 COPY 헬퍼.
+
+psycopg2의 일반 질의는 텍스트 프로토콜만 쓰므로, 대량 읽기/쓰기는
+``COPY ... (FORMAT binary)``로 pgvector의 send/recv 바이너리 형식
+(int16 차원, int16 예약, big-endian float4 배열)을 그대로 사용합니다.
+일반 질의의 타입캐스터/어댑터는 pgvector 패키지의 ``pgvector.psycopg2.register_vector``를 씁니다.
+"""
+
+import io
+import struct
+from typing import Callable, Iterable, List, Optional, Sequence
+
+import numpy as np
+import psycopg2
+from pgvector.utils import from_db_binary, to_db_binary
+from psycopg2 import sql
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_COPY_HEADER = _COPY_SIGNATURE + struct.pack(">ii", 0, 0)
+_COPY_TRAILER = struct.pack(">h", -1)
+
+
+def encode_vector(vec) -> bytes:
+    """벡터를 pgvector 바이너리(recv) 형식으로 인코딩합니다."""
+    return to_db_binary(np.asarray(vec).reshape(-1))
+
+
+def decode_vector(buf) -> np.ndarray:
+    """pgvector 바이너리(send) 형식을 float32 배열로 디코딩합니다."""
+    return from_db_binary(bytes(buf))
+
+
+class _BinaryCopyParser:
+    """COPY TO STDOUT (FORMAT binary) 스트림을 받아 행 단위로 필드를 나눕니다.
+
+    copy_expert의 파일 객체로 전달되며, 행이 완성되는 즉시 on_row(fields)를 호출하고
+    원시 바이트는 버립니다. 버퍼에는 아직 다 도착하지 않은 마지막 행만 남습니다.
+    """
+
+    def __init__(self, on_row: Callable[[List[Optional[bytes]]], None]):
+        self._buf = bytearray()
+        self._header_done = False
+        self._on_row = on_row
+        self.row_count = 0
+        self.finished = False
+
+    def write(self, data) -> int:
+        self._buf.extend(data)
+        self._parse()
+        return len(data)
+
+    def _parse(self) -> None:
+        buf = self._buf
+        pos = 0
+        if not self._header_done:
+            if len(buf) < 19:
+                return
+            if bytes(buf[:11]) != _COPY_SIGNATURE:
+                raise psycopg2.DataError("unexpected binary COPY signature")
+            ext_len = struct.unpack_from(">i", buf, 15)[0]
+            if len(buf) < 19 + ext_len:
+                return
+            pos = 19 + ext_len
+            self._header_done = True
+        n = len(buf)
+        while pos + 2 <= n:
+            nfields = struct.unpack_from(">h", buf, pos)[0]
+            if nfields == -1:
+                self.finished = True
+                pos += 2
+                break
+            cur = pos + 2
+            fields = []
+            for _ in range(nfields):
+                if cur + 4 > n:
+                    break
+                size = struct.unpack_from(">i", buf, cur)[0]
+                cur += 4
+                if size < 0:
+                    fields.append(None)
+                    continue
+                if cur + size > n:
+                    break
+                fields.append(bytes(buf[cur:cur + size]))
+                cur += size
+            if len(fields) != nfields:
+                break  # 행이 아직 다 도착하지 않음
+            self._on_row(fields)
+            self.row_count += 1
+            pos = cur
+        del buf[:pos]
+
+
+def copy_vectors_out(
+    cur,
+    query: sql.Composable,
+    on_row: Callable[[Optional[str], Optional[np.ndarray]], None],
+) -> int:
+    """(키, vector) 두 열을 내는 질의를 바이너리 COPY로 읽어 행마다 on_row(키 문자열, float32 배열)를 호출합니다.
+
+    키 열은 질의에서 text로 캐스팅해야 합니다 (예: ``researcher_id::text``). 행은 도착하는 대로
+    디코딩해 넘기므로 결과 전체를 모아 두지 않으며, 보관 여부와 방식은 on_row가 정합니다.
+    읽은 행 수를 반환합니다.
+    """
+
+    def emit(fields: List[Optional[bytes]]) -> None:
+        key, vec = fields
+        on_row(
+            key.decode("utf-8") if key is not None else None,
+            decode_vector(vec) if vec is not None else None,
+        )
+
+    parser = _BinaryCopyParser(emit)
+    copy_sql = sql.SQL("COPY ({}) TO STDOUT (FORMAT binary)").format(query)
+    cur.copy_expert(copy_sql.as_string(cur), parser)
+    return parser.row_count
+
+
+def _binary_copy_payload(keys: Sequence, vectors: Iterable) -> io.BytesIO:
+    out = io.BytesIO()
+    out.write(_COPY_HEADER)
+    for key, vec in zip(keys, vectors):
+        key_bytes = str(key).encode("utf-8")
+        vec_bytes = encode_vector(vec)
+        out.write(struct.pack(">hi", 2, len(key_bytes)))
+        out.write(key_bytes)
+        out.write(struct.pack(">i", len(vec_bytes)))
+        out.write(vec_bytes)
+    out.write(_COPY_TRAILER)
+    out.seek(0)
+    return out
+
+
+def column_type(cur, table: str, column: str) -> str:
+    """테이블 열의 SQL 타입 표기(예: ``bigint``)를 반환합니다. table은 regclass로 해석 가능한 이름입니다."""
+    cur.execute(
+        """
+        SELECT format_type(a.atttypid, a.atttypmod)
+          FROM pg_attribute a
+         WHERE a.attrelid = %s::regclass
+           AND a.attname = %s
+           AND a.attnum > 0
+           AND NOT a.attisdropped
+        """,
+        (table, column),
+    )
+    row = cur.fetchone()
+    if row is None:
+        raise psycopg2.ProgrammingError(f"column {column} not found in {table}")
+    return row[0]
+
+
+def update_vectors(
+    cur,
+    table: sql.Composable,
+    key_column: str,
+    key_type: str,
+    keys: Sequence,
+    vectors: Iterable,
+    column: str = "embedding",
+) -> int:
+    """키별 벡터를 임시 테이블에 바이너리 COPY로 적재한 뒤 한 번의 UPDATE ... FROM으로 반영합니다.
+
+    key_type은 대상 키 열의 타입(예: ``bigint``, ``text``, ``tid``)이며, 임시 테이블의 text 키를
+    이 타입으로 캐스팅해 대상 테이블의 키 인덱스를 그대로 사용합니다. 갱신한 행 수를 반환합니다.
+    """
+    cur.execute("CREATE TEMP TABLE IF NOT EXISTS _vector_stage (k text NOT NULL, v vector)")
+    cur.execute("TRUNCATE _vector_stage")
+    cur.copy_expert("COPY _vector_stage (k, v) FROM STDIN (FORMAT binary)", _binary_copy_payload(keys, vectors))
+    cur.execute(
+        sql.SQL("UPDATE {} AS t SET {} = s.v FROM _vector_stage s WHERE t.{} = s.k::{}").format(
+            table,
+            sql.Identifier(column),
+            sql.Identifier(key_column),
+            sql.SQL(key_type),
+        )
+    )
+    return cur.rowcount
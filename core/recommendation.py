@@ -1,10 +1,19 @@
 # core/recommendation.py
 
+import json
 import numpy as np
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from typing import Any, Dict, Iterator, List, Tuple
 from openai import OpenAI
+from core.cache import LRUCache, get_backend, normalize_query
 from core.db import get_connection
 from core.config import AppConfig
+from core.keyword_index import language_order, language_rank
+from core.metrics import db_span, record_llm_abandoned, record_llm_usage, span
+
+
+# _summarize 실패 시 반환하는 사유 문자열의 머리말 (결과 캐시에서 제외하는 기준)
+SUMMARY_FAILURE_PREFIX = "- 사유 생성 실패"
 
 
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
@@ -16,7 +25,10 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
 
 
 def dedupe_keywords(keywords: List[str], lang_order: List[str]) -> List[str]:
-    """키워드 중복을 제거하고 언어 우선순위에 따라 정렬합니다."""
+    """키워드 중복을 제거하고 언어 우선순위에 따라 정렬합니다.
+
+    추천 경로는 VectorUtils.keyword_index에 미리 정리된 결과를 사용합니다 (같은 규칙).
+    """
     seen = set()
     result = []
     for kw in keywords:
@@ -26,48 +38,65 @@ def dedupe_keywords(keywords: List[str], lang_order: List[str]) -> List[str]:
         seen.add(normalized.lower())
         result.append(normalized)
     # 한국어 우선 정렬
-    def order_key(word: str):
-        for idx, lang in enumerate(lang_order):
-            if lang == "ko" and any("가" <= ch <= "힣" for ch in word):
-                return idx
-            if lang == "en" and word.isascii():
-                return idx
-        return len(lang_order)
-    return sorted(result, key=order_key)
+    return sorted(result, key=lambda word: language_rank(word, lang_order))
 
 
-def fetch_researcher_context(researcher_id: str, limit: int = 5) -> Dict[str, List[str]]:
-    """연구자의 대표 논문 정보를 조회합니다."""
+def fetch_researcher_contexts(researcher_ids: List[str], limit: int = 5) -> Dict[str, Dict[str, List[Dict]]]:
+    """여러 연구자의 대표 논문 정보를 한 번의 쿼리로 조회합니다.
+
+    연구자별로 임팩트 팩터 상위 limit편을 ROW_NUMBER() 윈도로 고르며,
+    결과는 researcher_id -> {"papers": [...]} 형태입니다(논문이 없으면 빈 목록).
+    """
+    ids = list(dict.fromkeys(researcher_ids))
+    if not ids:
+        return {}
     sql = """
-    SELECT t.thesis_id,
-           t.title,
-           COALESCE(t.impact_factor, 0) AS impact_factor,
+    WITH ranked AS (
+        SELECT ta.researcher_id,
+               t.thesis_id,
+               t.title,
+               COALESCE(t.impact_factor, 0) AS impact_factor,
+               t.journal_id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY ta.researcher_id
+                   ORDER BY t.impact_factor DESC NULLS LAST, t.thesis_id
+               ) AS rn
+          FROM tb_thesis_author ta
+          JOIN tb_thesis t ON t.thesis_id = ta.thesis_id
+         WHERE ta.researcher_id = ANY(%s)
+    )
+    SELECT r.researcher_id,
+           r.thesis_id,
+           r.title,
+           r.impact_factor,
            array_agg(DISTINCT tk.term) AS keywords,
            j.name AS journal_name
-      FROM tb_thesis t
- LEFT JOIN tb_thesis_author ta ON ta.thesis_id = t.thesis_id
- LEFT JOIN tb_thesis_keyword tk ON tk.thesis_id = t.thesis_id
- LEFT JOIN tb_jounal j ON j.journal_id = t.journal_id
-     WHERE ta.researcher_id = %s
-  GROUP BY t.thesis_id, t.title, t.impact_factor, j.name
-  ORDER BY t.impact_factor DESC NULLS LAST
-  LIMIT %s
+      FROM ranked r
+ LEFT JOIN tb_thesis_keyword tk ON tk.thesis_id = r.thesis_id
+ LEFT JOIN tb_jounal j ON j.journal_id = r.journal_id
+     WHERE r.rn <= %s
+  GROUP BY r.researcher_id, r.rn, r.thesis_id, r.title, r.impact_factor, j.name
+  ORDER BY r.researcher_id, r.rn
     """
-    with get_connection() as conn:
+    with db_span("researcher_contexts"), get_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(sql, (researcher_id, limit))
+            cur.execute(sql, (ids, limit))
             rows = cur.fetchall()
-    papers = []
-    for thesis_id, title, impact, keywords, journal in rows:
-        keywords = keywords or []
-        papers.append({
+    contexts: Dict[str, Dict[str, List[Dict]]] = {rid: {"papers": []} for rid in ids}
+    for researcher_id, thesis_id, title, impact, keywords, journal in rows:
+        contexts.setdefault(researcher_id, {"papers": []})["papers"].append({
             "thesis_id": thesis_id,
             "title": title,
             "impact": float(impact or 0),
-            "keywords": keywords,
+            "keywords": keywords or [],
             "journal": journal,
         })
-    return {"papers": papers}
+    return contexts
+
+
+def fetch_researcher_context(researcher_id: str, limit: int = 5) -> Dict[str, List[str]]:
+    """연구자의 대표 논문 정보를 조회합니다."""
+    return fetch_researcher_contexts([researcher_id], limit).get(researcher_id, {"papers": []})
 
 
 def similarity_to_score(sim: float) -> float:
@@ -77,75 +106,237 @@ def similarity_to_score(sim: float) -> float:
 
 class ResearcherRecommender:
     """연구자 추천(유사도 계산, 점수화, 요약 생성)을 담당합니다."""
-    def __init__(self, vector_utils, config: AppConfig):
-        """벡터 유틸과 설정을 받아 추천 준비를 수행합니다."""
+    def __init__(self, vector_utils, config: AppConfig, client=None):
+        """벡터 유틸과 설정을 받아 추천 준비를 수행합니다. client를 주면 OpenAI 대신 사용합니다."""
         self.vector_utils = vector_utils
         self.cfg = config
-        self.client = OpenAI(api_key=config.openai_api_key)
+        self.client = client or OpenAI(api_key=config.openai_api_key)
         self.model_name = config.openai_text_model_name
-        (
-            self.ids,
-            self.names,
-            self.vectors,
-            self.rk_cnt,
-            self.pk_cnt,
-            self.rk,
-            self.pk,
-        ) = self.vector_utils.get_all_data()
-        order = []
-        for lang in self.cfg.keyword_language_priority.split(','):
-            order.append(lang.strip())
-        self.keyword_lang_order = order or ["ko", "en"]
+        self.keyword_lang_order = language_order(self.cfg.keyword_language_priority)
+        # 추천 사유 생성용 스레드 풀(요청 간 재사용)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, self.cfg.llm_max_workers),
+            thread_name_prefix="rationale",
+        )
+        # 정규화된 질의 기준 추천 결과 캐시(TTL, 연구자 데이터 버전이 키에 포함되어 변경 시 무효화)
+        self._result_cache = None
+        if self.cfg.cache_result_size > 0:
+            self._result_cache = LRUCache(
+                self.cfg.cache_result_size,
+                ttl=self.cfg.cache_result_ttl,
+                backend=get_backend(self.cfg),
+                namespace="recommend",
+                dumps=lambda value: json.dumps(value, ensure_ascii=False).encode("utf-8"),
+                loads=lambda raw: json.loads(raw.decode("utf-8")),
+            )
+
+    # 연구자 열은 refresh 때마다 새 저장소로 교체되므로 보관하지 않고 항상 현재 저장소에서 읽음
+    @property
+    def ids(self):
+        return self.vector_utils.researcher_ids
+
+    @property
+    def names(self):
+        return self.vector_utils.researcher_names
+
+    @property
+    def vectors(self):
+        return self.vector_utils.researcher_vectors
+
+    @property
+    def rk(self):
+        return self.vector_utils.researcher_rk
+
+    @property
+    def pk(self):
+        return self.vector_utils.researcher_pk
+
+    @property
+    def rk_cnt(self):
+        return self.vector_utils.rk_cnt
+
+    @property
+    def pk_cnt(self):
+        return self.vector_utils.pk_cnt
 
     def recommend(self, query: str, top_k: int = None):
         """질의를 받아 상위 연구자 추천 결과를 반환합니다."""
         top_k = top_k or self.cfg.top_k
-        q_vec = self.vector_utils.encode(query)
+        cache_key = None
+        if self._result_cache is not None:
+            cache_key = f"{self.vector_utils.data_version}:{top_k}:{normalize_query(query)}"
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        with span("recommend.encode"):
+            q_vec = self.vector_utils.encode(query)
         # 1단계: 빠른 벡터 검색으로 상위 후보 추출
-        idxs, sims = self.vector_utils.topk(q_vec, max(top_k * 10, top_k))
+        with span("recommend.topk"):
+            idxs, sims = self.vector_utils.topk(q_vec, max(top_k * 10, top_k), text=query)
+        return self._rank(query, self._prelim(idxs, sims, top_k), top_k, cache_key=cache_key)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """질의 임베딩/추천 결과 캐시의 적중·미스·축출 카운터를 반환합니다."""
+        return {
+            "embedding": self.vector_utils.cache_stats(),
+            "result": self._result_cache.stats() if self._result_cache is not None else {},
+        }
+
+    def recommend_many(self, queries: List[str], top_k: int = None, rationale: bool = False) -> List[List[Dict]]:
+        """여러 질의를 한 번에 인코딩/검색하여 질의별 추천 결과 목록을 반환합니다.
+
+        기본은 LLM 호출 없이 템플릿 요약을 사용합니다(대량 오프라인 매칭용). rationale=True이면
+        모든 질의의 사유 생성을 한 번에 스레드 풀에 넣고 llm_deadline 하나로 묶어, 질의 수와 관계없이
+        요청이 마감시간 한 번 이상 기다리지 않습니다.
+        """
+        top_k = top_k or self.cfg.top_k
+        if not queries:
+            return []
+        with span("recommend.encode"):
+            q_mat = self.vector_utils.encode_many(queries)
+        with span("recommend.topk"):
+            idx_mat, sim_mat = self.vector_utils.topk_many(q_mat, max(top_k * 10, top_k), texts=queries)
+        prelims = [self._prelim(idx_mat[j], sim_mat[j], top_k) for j in range(len(queries))]
+        # 모든 질의의 후보 컨텍스트를 한 번에 조회
+        ids = [self.ids[i] for prelim in prelims for i, _ in prelim]
+        with span("recommend.context"):
+            contexts = fetch_researcher_contexts(ids) if ids else {}
+        candidates = [self._prepare(query, prelim, top_k, contexts) for query, prelim in zip(queries, prelims)]
+        llm_texts: List[Dict[int, str]] = [{} for _ in queries]
+        if rationale:
+            jobs = {(j, cand["rank"]): (queries[j], cand) for j, cands in enumerate(candidates) for cand in cands}
+            with span("recommend.rationales"):
+                for (j, rank), text in self._iter_rationale_jobs(jobs):
+                    llm_texts[j][rank] = text
+        with span("recommend.assemble"):
+            return [
+                self._assemble(query, cands, texts, top_k)
+                for query, cands, texts in zip(queries, candidates, llm_texts)
+            ]
+
+    def _prelim(self, idxs: np.ndarray, sims: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """유사도 임계값을 넘는 상위 top_k 후보 (인덱스, 유사도) 목록을 만듭니다."""
         prelim = []
         for i, s in zip(idxs.tolist(), sims.tolist()):
-            if s >= self.cfg.similarity_threshold:
+            if i >= 0 and s >= self.cfg.similarity_threshold:
                 prelim.append((i, s))
+        return prelim[:top_k]
+
+    def recommend_stream(self, query: str, top_k: int = None) -> Iterator[Tuple[str, Any]]:
+        """추천 결과를 단계별 (이벤트, 데이터)로 내보냅니다 (SSE 스트리밍용).
+
+        벡터 검색과 점수 계산이 끝나면 곧바로 ("candidates", 결과 목록)을 템플릿 사유와 함께 보내고,
+        LLM 사유가 완성되는 대로 ("reason", {"researcher_id", "reason_markdown"})을 보낸 뒤
+        마지막에 ("done", {"complete": bool})을 보냅니다. 점수는 사유와 무관하므로 순서는 바뀌지 않습니다.
+        """
+        top_k = top_k or self.cfg.top_k
+        cache_key = None
+        if self._result_cache is not None:
+            cache_key = f"{self.vector_utils.data_version}:{top_k}:{normalize_query(query)}"
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                yield "candidates", cached
+                yield "done", {"complete": True, "cached": True}
+                return
+        with span("recommend.encode"):
+            q_vec = self.vector_utils.encode(query)
+        with span("recommend.topk"):
+            idxs, sims = self.vector_utils.topk(q_vec, max(top_k * 10, top_k), text=query)
+        prelim = self._prelim(idxs, sims, top_k)
+        if not prelim:
+            yield "candidates", []
+            yield "done", {"complete": True}
+            return
+        candidates = self._prepare(query, prelim, top_k)
+        yield "candidates", self._assemble(query, candidates, {}, top_k)
+
+        llm_texts: Dict[int, str] = {}
+        by_rank = {cand["rank"]: cand for cand in candidates}
+        for rank, text in self._iter_rationales(query, candidates):
+            llm_texts[rank] = text
+            if text:
+                yield "reason", {
+                    "researcher_id": self.ids[by_rank[rank]["index"]],
+                    "reason_markdown": text,
+                }
+        complete = self._rationales_complete(candidates, llm_texts)
+        if cache_key is not None and complete:
+            self._result_cache.set(cache_key, self._assemble(query, candidates, llm_texts, top_k))
+        yield "done", {"complete": complete}
+
+    def _rank(self, query: str, prelim: List[Tuple[int, float]], top_k: int, contexts: Dict = None, rationale: bool = True, cache_key: str = None):
+        """후보 목록에 보너스/요약을 붙여 점수순 추천 결과를 만듭니다.
+
+        cache_key가 있으면 모든 LLM 사유가 정상 생성된 결과만 결과 캐시에 저장합니다.
+        """
         if not prelim:
             return []
-        prelim = prelim[:top_k]
+        candidates = self._prepare(query, prelim, top_k, contexts)
+        llm_texts = {}
+        if rationale:
+            with span("recommend.rationales"):
+                llm_texts = self._generate_rationales(query, candidates)
+        with span("recommend.assemble"):
+            results = self._assemble(query, candidates, llm_texts, top_k)
+        if cache_key is not None and rationale and self._rationales_complete(candidates, llm_texts):
+            self._result_cache.set(cache_key, results)
+        return results
 
+    def _prepare(self, query: str, prelim: List[Tuple[int, float]], top_k: int, contexts: Dict = None) -> List[Dict]:
+        """후보별 키워드/기본·키워드 점수와 대표 논문 컨텍스트/임팩트 가산점을 계산합니다."""
         # 2단계: 모든 후보에 컨텍스트/요약(OpenAI) 수행 (요청에 따라 5명 모두)
-        llm_cap = top_k
+        # 키워드 정리/정렬은 적재 시 역색인에 미리 되어 있으므로 질의 토큰만 한 번 ID로 바꿉니다
+        keywords = self.vector_utils.keyword_index
+        terms = keywords.query(query)
+        candidates = []
+        for rank, (i, sim) in enumerate(prelim[:top_k]):
+            candidates.append({
+                "rank": rank,
+                "index": i,
+                "base_score": similarity_to_score(sim),
+                "keyword_bonus": self._keyword_bonus(keywords.overlap(i, terms)),
+                "rk": list(keywords.rk[i]),
+                "pk": list(keywords.pk[i]),
+                "matched": keywords.matched(i, terms, limit=5),
+            })
+
+        # 대표 논문 컨텍스트를 한 번에 조회
+        if contexts is None:
+            with span("recommend.context"):
+                contexts = fetch_researcher_contexts([self.ids[c["index"]] for c in candidates])
+        for cand in candidates:
+            cand["context"] = contexts.get(self.ids[cand["index"]], {"papers": []})
+            cand["impact_bonus"] = self._journal_bonus(cand["context"])
+        return candidates
+
+    def _assemble(self, query: str, candidates: List[Dict], llm_texts: Dict[int, str], top_k: int) -> List[Dict]:
+        """후보와 LLM 사유(없으면 템플릿 요약)로 점수순 추천 결과 목록을 만듭니다."""
         results = []
-        # 토큰 전처리(폴백 요약에 활용)
-        tokens = [t.strip().lower() for t in query.replace(',', ' ').split() if t.strip()]
-        for rank, (i, sim) in enumerate(prelim):
-            base_score = similarity_to_score(sim)
-            rk = dedupe_keywords(self.rk[i], self.keyword_lang_order)
-            pk = dedupe_keywords(self.pk[i], self.keyword_lang_order)
-            impact_bonus = 0.0
-            keyword_bonus = self._keyword_bonus(query, rk, pk)
-            context = {}
-            top_papers = []
+        for cand in candidates:
+            rank, i, rk, pk = cand["rank"], cand["index"], cand["rk"], cand["pk"]
+            row = self.vector_utils.store[i]
+            base_score = cand["base_score"]
+            keyword_bonus = cand["keyword_bonus"]
+            context = cand.get("context", {})
+            impact_bonus = cand.get("impact_bonus", 0.0)
+            top_papers = (context.get("papers", []) or [])[:3] if context else []
 
             # 폴백 요약(점수 언급 제거, 입력-연구자 유사내용 설명)
-            matched = [kw for kw in rk if kw and (kw.lower() in tokens or any(tok in kw.lower() for tok in tokens))]
+            matched = cand["matched"]
             matched_str = ", ".join(matched[:5]) if matched else (", ".join(rk[:5]) if rk else "연관 키워드 없음")
             summary_md = (
-                f"{self.names[i]} 연구자는 사용자 입력과 '{matched_str}' 등에서 주제가 맞물립니다. "
+                f"{row.name} 연구자는 사용자 입력과 '{matched_str}' 등에서 주제가 맞물립니다. "
                 f"관련 연구 키워드와 대표 성과를 바탕으로 추천합니다."
             )
-
-            if rank < llm_cap:
-                context = fetch_researcher_context(self.ids[i])
-                impact_bonus = self._journal_bonus(context)
-                top_papers = (context.get("papers", []) or [])[:3]
-                llm_text = self._summarize(query, self.names[i], rk, pk, context, base_score, impact_bonus, keyword_bonus).strip()
-                if llm_text:
-                    summary_md = llm_text
+            llm_text = llm_texts.get(rank, "")
+            if llm_text:
+                summary_md = llm_text
 
             score = base_score + impact_bonus + keyword_bonus
             references = [p.get("thesis_id") for p in (context.get("papers", []) if context else [])]
             results.append({
-                "researcher_id": self.ids[i],
-                "name": self.names[i],
+                "researcher_id": row.researcher_id,
+                "name": row.name,
                 "base_score": round(base_score, 2),
                 "score": round(score, 2),
                 "impact_bonus": round(impact_bonus, 2),
@@ -159,16 +350,82 @@ class ResearcherRecommender:
         results.sort(key=lambda x: x["score"], reverse=True)
         return results[:top_k]
 
+    @staticmethod
+    def _rationales_complete(candidates: List[Dict], llm_texts: Dict[int, str]) -> bool:
+        """모든 후보의 LLM 사유가 정상 생성되었는지(결과 캐시 저장 가능 여부) 확인합니다."""
+        return len(llm_texts) == len(candidates) and not any(
+            text.startswith(SUMMARY_FAILURE_PREFIX) for text in llm_texts.values()
+        )
+
+    def _generate_rationales(self, query: str, candidates: List[Dict]) -> Dict[int, str]:
+        """후보별 LLM 요약을 스레드 풀에서 동시에 수행합니다.
+
+        각 호출은 llm_timeout으로, 전체 단계는 llm_deadline으로 제한됩니다.
+        마감시간까지 끝나지 않은 후보는 결과에서 빠지며 호출부에서 템플릿 요약을 사용합니다.
+        """
+        return dict(self._iter_rationales(query, candidates))
+
+    def _iter_rationales(self, query: str, candidates: List[Dict]) -> Iterator[Tuple[int, str]]:
+        """후보별 LLM 요약을 동시에 실행하고 끝나는 순서대로 (rank, 사유)를 내보냅니다."""
+        return self._iter_rationale_jobs({cand["rank"]: (query, cand) for cand in candidates})
+
+    def _iter_rationale_jobs(self, jobs: Dict[Any, Tuple[str, Dict]]) -> Iterator[Tuple[Any, str]]:
+        """{키: (질의, 후보)} 작업을 한 번에 풀에 넣고 끝나는 순서대로 (키, 사유)를 내보냅니다.
+
+        llm_deadline이 지나거나 호출부가 제너레이터를 닫으면(SSE 연결 종료 등) 남은 후보는 내보내지 않고,
+        아직 시작하지 않은 호출은 취소해 공유 스레드 풀 자리를 다음 요청에 돌려줍니다.
+        """
+        if not jobs:
+            return
+
+        def run(query: str, cand: Dict) -> str:
+            return self._summarize(
+                query,
+                self.names[cand["index"]],
+                cand["rk"],
+                cand["pk"],
+                cand["context"],
+                cand["base_score"],
+                cand["impact_bonus"],
+                cand["keyword_bonus"],
+            ).strip()
+
+        futures = {self._executor.submit(run, query, cand): key for key, (query, cand) in jobs.items()}
+        try:
+            for fut in as_completed(futures, timeout=self.cfg.llm_deadline):
+                try:
+                    text = fut.result()
+                except Exception:
+                    continue
+                yield futures[fut], text
+        except FuturesTimeoutError:
+            return
+        finally:
+            self._abandon(futures)
+
+    @staticmethod
+    def _abandon(futures) -> None:
+        """끝나지 않은 사유 생성 호출을 취소하고 포기한 수를 지표에 기록합니다.
+
+        이미 실행 중인 호출은 취소할 수 없으므로 llm_timeout까지 자리를 차지한 뒤 결과가 버려집니다.
+        """
+        cancelled = running = 0
+        for fut in futures:
+            if fut.done():
+                continue
+            if fut.cancel():
+                cancelled += 1
+            else:
+                running += 1
+        record_llm_abandoned("rationale", cancelled, running)
+
     def _journal_bonus(self, context: Dict) -> float:
         """논문 임팩트 합에 비례한 가산점을 계산합니다."""
         impact_sum = sum(p.get("impact", 0) for p in context.get("papers", []))
         return impact_sum * self.cfg.journal_impact_weight
 
-    def _keyword_bonus(self, query: str, rk: List[str], pk: List[str]) -> float:
-        """질의 토큰과 연구자 키워드의 겹침에 따른 가산점을 계산합니다."""
-        all_keywords = set([kw.lower() for kw in rk + pk])
-        tokens = [tok.strip().lower() for tok in query.replace(',', ' ').split() if tok.strip()]
-        overlaps = len([t for t in tokens if t in all_keywords])
+    def _keyword_bonus(self, overlaps: int) -> float:
+        """질의 토큰과 연구자 키워드의 겹침 수(KeywordIndex.overlap)에 따른 가산점을 계산합니다."""
         return overlaps * self.cfg.keyword_weight
 
     def _summarize(self, query: str, name: str, rk: List[str], pk: List[str], context: Dict, base_score: float, impact_bonus: float, keyword_bonus: float) -> str:
@@ -194,14 +451,18 @@ class ResearcherRecommender:
             "대표 성과를 한두 개 덧붙이고, 불필요한 나열은 피하여 자연스러운 단락으로 작성하세요."
         )
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "당신은 전문 연구자 추천 시스템입니다. 한국어로 정중하고 간결한 문장 단락(500자 이내)만 작성하세요."},
-                    {"role": "user", "content": prompt},
-                ],
-                max_completion_tokens=min(self.cfg.rag_max_tokens, 350),
-            )
+            with span("llm.rationale"):
+                response = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[
+                        {"role": "system", "content": "당신은 전문 연구자 추천 시스템입니다. 한국어로 정중하고 간결한 문장 단락(500자 이내)만 작성하세요."},
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_completion_tokens=min(self.cfg.rag_max_tokens, 350),
+                    timeout=self.cfg.llm_timeout,
+                )
+            record_llm_usage("rationale", response)
             return response.choices[0].message.content.strip()
         except Exception as e:
-            return f"- 사유 생성 실패: {e}"
+            record_llm_usage("rationale", error=e)
+            return f"{SUMMARY_FAILURE_PREFIX}: {e}"
@@ -0,0 +1,161 @@
+# core/reembed.py
+"""연구자 임베딩 재생성 엔진 (내용 해시 기반 증분 + 체크포인트 커밋).
+
+연구자별 원문(이름 + 논문/특허 키워드)의 해시를 tb_researcher_embedding_state에 저장하고,
+해시가 바뀌었거나 임베딩이 없는 연구자만 다시 인코딩합니다. 원문 길이순으로 정렬해
+비슷한 길이끼리 배치로 인코딩하며, checkpoint_rows마다 벡터(바이너리 COPY)와 해시를
+함께 커밋하므로 중단된 실행은 다음 실행에서 남은 연구자부터 이어집니다.
+"""
+
+import hashlib
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+
+from core.pgvector_codec import column_type, update_vectors
+
+STATE_TABLE = "tb_researcher_embedding_state"
+
+
+def source_text(name, thesis_keywords: Optional[Sequence], patent_keywords: Optional[Sequence]) -> str:
+    """임베딩 원문을 만듭니다 (이름 + 논문 키워드 + 특허 키워드)."""
+    return " ".join([str(name)] + [str(x) for x in (thesis_keywords or [])] + [str(x) for x in (patent_keywords or [])])
+
+
+def source_hash(text: str, model_name: str, dim: int) -> str:
+    """원문과 모델/차원을 묶은 해시. 모델이나 차원이 바뀌면 전원이 다시 인코딩됩니다."""
+    return hashlib.sha256(f"{model_name}\x00{dim}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def ensure_state_table(cur) -> None:
+    """해시 상태 테이블을 만듭니다 (researcher_id는 tb_researcher와 같은 타입)."""
+    id_type = column_type(cur, "tb_researcher", "researcher_id")
+    cur.execute(
+        sql.SQL(
+            """
+            CREATE TABLE IF NOT EXISTS {} (
+                researcher_id {} PRIMARY KEY,
+                source_hash TEXT NOT NULL,
+                embedded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+            """
+        ).format(sql.Identifier(STATE_TABLE), sql.SQL(id_type))
+    )
+
+
+class ResearcherReembedder:
+    """변경된 연구자만 배치 인코딩해 체크포인트 단위로 기록합니다."""
+
+    def __init__(
+        self,
+        conn,
+        model,
+        model_name: str,
+        dim: int,
+        batch_size: int = 64,
+        checkpoint_rows: int = 2048,
+        log: Callable[[str], None] = print,
+    ):
+        self.conn = conn
+        self.model = model
+        self.model_name = model_name
+        self.dim = dim
+        self.batch_size = max(1, batch_size)
+        self.checkpoint_rows = max(self.batch_size, checkpoint_rows)
+        self.log = log
+
+    def pending(self, force: bool = False) -> Tuple[List[Tuple], int]:
+        """다시 인코딩할 (researcher_id, 원문, 해시) 목록과 전체 연구자 수를 반환합니다.
+
+        키워드는 mv_researcher_keywords에서 읽으므로, 호출 전에 뷰를 갱신해야 키워드 변경이 반영됩니다
+        (reembed_researchers_e5.py는 기본으로 갱신).
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(
+                sql.SQL(
+                    """
+                    SELECT r.researcher_id,
+                           r.name,
+                           k.thesis_keywords,
+                           k.patent_keywords,
+                           s.source_hash,
+                           r.embedding IS NULL AS missing
+                      FROM tb_researcher r
+                 LEFT JOIN mv_researcher_keywords k ON k.researcher_id = r.researcher_id
+                 LEFT JOIN {} s ON s.researcher_id = r.researcher_id
+                    """
+                ).format(sql.Identifier(STATE_TABLE))
+            )
+            rows = cur.fetchall()
+        todo = []
+        for rid, name, rk, pk, stored, missing in rows:
+            text = source_text(name, rk, pk)
+            digest = source_hash(text, self.model_name, self.dim)
+            if force or missing or digest != stored:
+                todo.append((rid, text, digest))
+        return todo, len(rows)
+
+    def _fit_dim(self, embs: np.ndarray) -> np.ndarray:
+        embs = np.asarray(embs, dtype="float32").reshape(len(embs), -1)
+        if embs.shape[1] > self.dim:
+            return embs[:, :self.dim]
+        if embs.shape[1] < self.dim:
+            return np.pad(embs, ((0, 0), (0, self.dim - embs.shape[1])))
+        return embs
+
+    def _write(self, cur, key_type: str, chunk: List[Tuple], embs: np.ndarray) -> None:
+        ids = [rid for rid, _, _ in chunk]
+        update_vectors(cur, sql.Identifier("tb_researcher"), "researcher_id", key_type, ids, embs)
+        execute_values(
+            cur,
+            sql.SQL(
+                """
+                INSERT INTO {} (researcher_id, source_hash, embedded_at)
+                VALUES %s
+                ON CONFLICT (researcher_id) DO UPDATE
+                   SET source_hash = EXCLUDED.source_hash,
+                       embedded_at = EXCLUDED.embedded_at
+                """
+            ).format(sql.Identifier(STATE_TABLE)).as_string(cur),
+            [(rid, digest) for rid, _, digest in chunk],
+            template="(%s, %s, now())",
+            page_size=1000,
+        )
+
+    def run(self, force: bool = False) -> Dict[str, float]:
+        """변경된 연구자를 재인코딩하고 처리 통계를 반환합니다."""
+        with self.conn.cursor() as cur:
+            ensure_state_table(cur)
+            key_type = column_type(cur, "tb_researcher", "researcher_id")
+        self.conn.commit()
+
+        todo, total = self.pending(force)
+        self.log(f"[INFO] researchers={total} changed={len(todo)} skipped={total - len(todo)}")
+        # 길이순 정렬: 같은 배치 안의 패딩을 줄임
+        todo.sort(key=lambda item: len(item[1]))
+        started = time.perf_counter()
+        done = 0
+        for start in range(0, len(todo), self.checkpoint_rows):
+            chunk = todo[start:start + self.checkpoint_rows]
+            embs = self.model.encode(
+                [text for _, text, _ in chunk],
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            with self.conn.cursor() as cur:
+                self._write(cur, key_type, chunk, self._fit_dim(embs))
+            # 체크포인트: 벡터와 해시를 함께 커밋해 중단 시 이어서 실행 가능
+            self.conn.commit()
+            done += len(chunk)
+            rate = done / max(time.perf_counter() - started, 1e-9)
+            self.log(f"[..] {done}/{len(todo)} re-embedded ({rate:.1f} rows/s)")
+        return {
+            "total": total,
+            "reembedded": done,
+            "skipped": total - len(todo),
+            "seconds": round(time.perf_counter() - started, 3),
+        }
@@ -0,0 +1,42 @@
+# core/researcher_keywords.py
+"""연구자별 논문/특허 키워드·건수 집계(mv_researcher_keywords) 갱신.
+
+migrations/005_researcher_keywords.sql로 만든 materialized view를 새로 고칩니다.
+엑셀 적재나 임베딩 갱신 뒤에 실행합니다::
+
+    python -m core.researcher_keywords            # 조회를 막지 않는 CONCURRENTLY 갱신
+    python -m core.researcher_keywords --blocking # 최초 1회 또는 빠른 전체 갱신
+"""
+
+import argparse
+import sys
+import time
+
+from core.db import get_connection
+
+VIEW_NAME = "mv_researcher_keywords"
+
+
+def refresh_researcher_keywords(config=None, concurrently: bool = True) -> float:
+    """집계 뷰를 갱신하고 소요 시간(초)을 반환합니다.
+
+    concurrently=True면 유니크 인덱스를 이용해 읽기를 막지 않고 갱신합니다.
+    """
+    started = time.perf_counter()
+    with get_connection(config) as conn:
+        with conn.cursor() as cur:
+            mode = "CONCURRENTLY " if concurrently else ""
+            cur.execute(f"REFRESH MATERIALIZED VIEW {mode}{VIEW_NAME}")
+    return time.perf_counter() - started
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Refresh the per-researcher keyword aggregate")
+    parser.add_argument("--blocking", action="store_true", help="refresh without CONCURRENTLY (locks readers)")
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+    elapsed = refresh_researcher_keywords(concurrently=not args.blocking)
+    print(f"[OK] {VIEW_NAME} refreshed in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
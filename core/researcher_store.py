@@ -0,0 +1,400 @@
+# core/researcher_store.py
+"""연구자 데이터의 열(column) 단위 메모리 저장소.
+
+VectorUtils는 워커마다 연구자 전체의 ID/이름/키워드/임베딩을 들고 있으므로,
+행마다 파이썬 객체(문자열, 리스트, 행 배열)를 두는 대신 몇 개의 연속 배열로 보관합니다.
+
+- ID: 모두 정수면 int64 배열(IntColumn), 문자열이면 UTF-8 바이트 열 + 오프셋(StringColumn)
+- 이름: StringColumn
+- 키워드: 행 오프셋 + 인턴된 정수 ID의 CSR(IntListColumn), 문자열은 사전에 한 번만 저장 (KeywordIndex)
+- 임베딩: 검색 상태와 공유하는 (n, dim) float32 행렬 1개 (행별 배열 사본 없음)
+
+적재 후 바뀌거나 추가된 행은 열별 patch 사전에 두었다가 patch가 커지면 본체 배열로 합칩니다.
+본체 배열은 만든 뒤 제자리에서 고치지 않습니다. refresh는 copy()로 만든 사본(본체 공유, patch 복사)에
+쓰고 새 저장소를 한 번에 게시하므로, 검색 스레드는 이전 저장소를 잠금 없이 그대로 읽습니다.
+"""
+
+import itertools
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# patch 행이 이 수/비율을 넘으면 본체 배열로 합침
+_COMPACT_MIN_ROWS = 1024
+_COMPACT_RATIO = 0.05
+
+
+def _check_pos(pos: int, n: int) -> int:
+    if pos < 0:
+        pos += n
+    if not 0 <= pos < n:
+        raise IndexError("column index out of range")
+    return pos
+
+
+class _RaggedColumn(ABC):
+    """가변 길이 값의 CSR 열 공통 부분: 본체(offsets, values) + patch {행: 값} + 행 수."""
+
+    __slots__ = ("_data",)
+    dtype = "int32"
+
+    def __init__(self, offsets: Optional[np.ndarray] = None, values: Optional[np.ndarray] = None):
+        if offsets is None:
+            offsets = np.zeros(1, dtype="int64")
+            values = np.zeros(0, dtype=self.dtype)
+        self._data: Tuple[np.ndarray, np.ndarray, Dict, int] = (offsets, values, {}, offsets.size - 1)
+
+    # 하위 클래스: 본체 구간 → 값, 값 → 본체 배열 조각
+    @abstractmethod
+    def _decode(self, values: np.ndarray, start: int, end: int):
+        """본체 values[start:end] 구간을 값으로 복원합니다."""
+
+    @abstractmethod
+    def _encode(self, value) -> np.ndarray:
+        """값을 본체에 붙일 배열 조각으로 바꿉니다."""
+
+    def _coerce(self, value):
+        return value
+
+    def __len__(self) -> int:
+        return self._data[3]
+
+    def __getitem__(self, pos):
+        offsets, values, patch, n = self._data
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(n))]
+        pos = _check_pos(pos, n)
+        hit = patch.get(pos)
+        if hit is not None:
+            return hit
+        return self._decode(values, int(offsets[pos]), int(offsets[pos + 1]))
+
+    def __iter__(self) -> Iterator:
+        for pos in range(len(self)):
+            yield self[pos]
+
+    def __setitem__(self, pos: int, value) -> None:
+        offsets, values, patch, n = self._data
+        patch[_check_pos(pos, n)] = self._coerce(value)
+        self._maybe_compact()
+
+    def append(self, value) -> int:
+        """끝에 행을 추가하고 그 위치를 반환합니다."""
+        offsets, values, patch, n = self._data
+        patch[n] = self._coerce(value)
+        self._data = (offsets, values, patch, n + 1)
+        self._maybe_compact()
+        return n
+
+    def lengths(self) -> np.ndarray:
+        """행별 값 길이 (int64, patch 반영)."""
+        offsets, values, patch, n = self._data
+        base = offsets.size - 1
+        out = np.zeros(n, dtype="int64")
+        out[:base] = np.diff(offsets)
+        for pos, value in list(patch.items()):
+            out[pos] = len(self._encode(value))
+        return out
+
+    def csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """patch까지 합친 (offsets, values) 배열을 반환합니다 (patch가 없으면 본체 그대로)."""
+        offsets, values, patch, n = self._data
+        if not patch:
+            return offsets, values
+        return self._merged(offsets, values, dict(patch), n)
+
+    def _merged(self, offsets: np.ndarray, values: np.ndarray, patch: Dict, n: int):
+        base = offsets.size - 1
+        encoded = {pos: self._encode(value) for pos, value in patch.items()}
+        lengths = np.zeros(n, dtype="int64")
+        lengths[:base] = np.diff(offsets)
+        keep = np.ones(n, dtype=bool)
+        keep[base:] = False
+        for pos, arr in encoded.items():
+            lengths[pos] = arr.size
+            keep[pos] = False
+        new_offsets = np.zeros(n + 1, dtype="int64")
+        np.cumsum(lengths, out=new_offsets[1:])
+        new_values = np.empty(int(new_offsets[-1]), dtype=values.dtype)
+        # 바뀌지 않은 본체 행은 구간 단위로 한 번에 복사
+        rows = np.flatnonzero(keep)
+        row_len = lengths[rows]
+        total = int(row_len.sum())
+        if total:
+            shift = np.repeat(offsets[rows] - new_offsets[rows], row_len)
+            dest = np.repeat(new_offsets[rows] - np.cumsum(row_len) + row_len, row_len) + np.arange(total)
+            new_values[dest] = values[dest + shift]
+        for pos, arr in encoded.items():
+            new_values[new_offsets[pos]:new_offsets[pos + 1]] = arr
+        return new_offsets, new_values
+
+    def copy(self):
+        """본체 배열은 공유하고 patch만 복사한 사본 (사본을 고쳐도 원본은 그대로)."""
+        offsets, values, patch, n = self._data
+        new = type(self).__new__(type(self))
+        new._data = (offsets, values, dict(patch), n)
+        return new
+
+    def _maybe_compact(self) -> None:
+        offsets, values, patch, n = self._data
+        if len(patch) > max(_COMPACT_MIN_ROWS, int(n * _COMPACT_RATIO)):
+            self.compact()
+
+    def compact(self) -> None:
+        """patch 행을 본체 배열로 합칩니다 (읽는 쪽은 교체 전 튜플을 그대로 사용)."""
+        offsets, values, patch, n = self._data
+        if patch:
+            new_offsets, new_values = self._merged(offsets, values, dict(patch), n)
+            self._data = (new_offsets, new_values, {}, n)
+
+    @property
+    def nbytes(self) -> int:
+        offsets, values, patch, n = self._data
+        return int(offsets.nbytes + values.nbytes)
+
+
+class IntListColumn(_RaggedColumn):
+    """정수 목록 열 (CSR: int64 행 오프셋 + int32 값). 행은 정수 튜플로 읽힙니다."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_lists(cls, lists: Sequence[Sequence[int]]) -> "IntListColumn":
+        lengths = np.fromiter((len(row) for row in lists), dtype="int64", count=len(lists))
+        offsets = np.zeros(len(lists) + 1, dtype="int64")
+        np.cumsum(lengths, out=offsets[1:])
+        values = np.fromiter(itertools.chain.from_iterable(lists), dtype=cls.dtype, count=int(offsets[-1]))
+        return cls(offsets, values)
+
+    def _decode(self, values: np.ndarray, start: int, end: int) -> Tuple[int, ...]:
+        return tuple(values[start:end].tolist())
+
+    def _encode(self, value: Tuple[int, ...]) -> np.ndarray:
+        return np.asarray(value, dtype=self.dtype)
+
+    def _coerce(self, value: Iterable[int]) -> Tuple[int, ...]:
+        return tuple(value)
+
+
+class StringColumn(_RaggedColumn):
+    """문자열 열 (UTF-8 바이트 열 + int64 오프셋). 값은 읽을 때 디코딩합니다."""
+
+    __slots__ = ()
+    dtype = "uint8"
+
+    @classmethod
+    def from_values(cls, values: Sequence[str]) -> "StringColumn":
+        encoded = [("" if v is None else str(v)).encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype="int64")
+        np.cumsum(np.fromiter(map(len, encoded), dtype="int64", count=len(encoded)), out=offsets[1:])
+        return cls(offsets, np.frombuffer(b"".join(encoded), dtype="uint8"))
+
+    def _decode(self, values: np.ndarray, start: int, end: int) -> str:
+        return values[start:end].tobytes().decode("utf-8")
+
+    def _encode(self, value: str) -> np.ndarray:
+        return np.frombuffer(value.encode("utf-8"), dtype="uint8")
+
+    def _coerce(self, value) -> str:
+        return "" if value is None else str(value)
+
+
+class IntColumn:
+    """정수 스칼라 열 (int64 배열, 여유 용량을 두고 늘림). 값은 파이썬 int로 읽힙니다."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, values: Optional[np.ndarray] = None):
+        arr = np.zeros(0, dtype="int64") if values is None else np.asarray(values, dtype="int64")
+        self._data: Tuple[np.ndarray, int] = (arr, arr.size)
+
+    def __len__(self) -> int:
+        return self._data[1]
+
+    def __getitem__(self, pos):
+        arr, n = self._data
+        if isinstance(pos, slice):
+            return arr[:n][pos].tolist()
+        return int(arr[_check_pos(pos, n)])
+
+    def __iter__(self) -> Iterator[int]:
+        arr, n = self._data
+        return iter(arr[:n].tolist())
+
+    def __setitem__(self, pos: int, value: int) -> None:
+        arr, n = self._data
+        arr[_check_pos(pos, n)] = value
+
+    def append(self, value: int) -> int:
+        arr, n = self._data
+        if n == arr.size:
+            grown = np.zeros(max(16, int(n * 1.25) + 16), dtype="int64")
+            grown[:n] = arr
+            arr = grown
+        arr[n] = value
+        self._data = (arr, n + 1)
+        return n
+
+    def copy(self) -> "IntColumn":
+        """배열을 복사한 사본 (__setitem__은 제자리에서 고치므로 공유하지 않음)."""
+        arr, n = self._data
+        new = IntColumn.__new__(IntColumn)
+        new._data = (arr.copy(), n)
+        return new
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._data[0].nbytes)
+
+
+def id_column(values: Sequence):
+    """연구자 ID 목록을 열로 바꿉니다: 모두 정수면 IntColumn, 모두 문자열이면 StringColumn, 그 외는 list."""
+    values = list(values)
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return IntColumn(np.fromiter(values, dtype="int64", count=len(values)))
+    if all(isinstance(v, str) for v in values):
+        return StringColumn.from_values(values)
+    return values
+
+
+class TermListColumn:
+    """IntListColumn의 ID를 사전(terms)으로 풀어 문자열 튜플로 보여주는 읽기 전용 뷰."""
+
+    __slots__ = ("ids", "terms")
+
+    def __init__(self, ids: IntListColumn, terms: List[str]):
+        self.ids = ids
+        self.terms = terms
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, pos) -> Tuple[str, ...]:
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(len(self)))]
+        return tuple(map(self.terms.__getitem__, self.ids[pos]))
+
+    def __iter__(self) -> Iterator[Tuple[str, ...]]:
+        for pos in range(len(self)):
+            yield self[pos]
+
+    def lengths(self) -> np.ndarray:
+        return self.ids.lengths()
+
+
+class MatrixRows:
+    """저장소의 현재 행렬을 행 목록처럼 보여주는 뷰 (행은 사본이 아닌 행렬의 뷰)."""
+
+    __slots__ = ("_store",)
+
+    def __init__(self, store: "ResearcherStore"):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, pos):
+        mat = self._store.matrix
+        if mat is None:
+            raise IndexError("vector matrix not initialized")
+        return mat[: len(self._store)][pos]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        mat = self._store.matrix
+        return iter(mat[: len(self._store)]) if mat is not None else iter(())
+
+
+class ResearcherRow:
+    """연구자 1명의 행 뷰. 값은 접근할 때 저장소의 열에서 읽습니다."""
+
+    __slots__ = ("_store", "pos")
+
+    def __init__(self, store: "ResearcherStore", pos: int):
+        self._store = store
+        self.pos = pos
+
+    @property
+    def researcher_id(self):
+        return self._store.ids[self.pos]
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self.pos]
+
+    @property
+    def vector(self) -> np.ndarray:
+        return self._store.matrix[self.pos]
+
+    @property
+    def thesis_keywords(self) -> Tuple[str, ...]:
+        return self._store.keywords.rk[self.pos]
+
+    @property
+    def patent_keywords(self) -> Tuple[str, ...]:
+        return self._store.keywords.pk[self.pos]
+
+    def __repr__(self) -> str:
+        return f"ResearcherRow(pos={self.pos}, researcher_id={self.researcher_id!r}, name={self.name!r})"
+
+
+class ResearcherStore:
+    """연구자 행 위치로 맞춰진 열 묶음: ID, 이름, 키워드(KeywordIndex), 임베딩 행렬.
+
+    행렬은 VectorUtils가 검색 상태를 게시할 때 교체하며, 삭제된 연구자도 행 위치는 유지됩니다.
+    """
+
+    __slots__ = ("ids", "names", "keywords", "matrix", "vectors", "_positions")
+
+    def __init__(self, ids, names: StringColumn, keywords, matrix: Optional[np.ndarray] = None):
+        self.ids = ids
+        self.names = names
+        self.keywords = keywords
+        self.matrix = matrix
+        self.vectors = MatrixRows(self)
+        self._positions: Optional[Dict] = None
+
+    @classmethod
+    def build(cls, ids: Sequence, names: Sequence[str], keywords, matrix: Optional[np.ndarray] = None) -> "ResearcherStore":
+        return cls(id_column(ids), StringColumn.from_values(names), keywords, matrix)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, pos: int) -> ResearcherRow:
+        return ResearcherRow(self, _check_pos(pos, len(self)))
+
+    def __iter__(self) -> Iterator[ResearcherRow]:
+        for pos in range(len(self)):
+            yield ResearcherRow(self, pos)
+
+    def position(self, researcher_id) -> Optional[int]:
+        """연구자 ID의 행 위치 (ID → 위치 맵은 증분 갱신에서 처음 필요할 때 만듦)."""
+        if self._positions is None:
+            self._positions = {rid: pos for pos, rid in enumerate(self.ids)}
+        return self._positions.get(researcher_id)
+
+    def copy(self) -> "ResearcherStore":
+        """refresh용 사본: 열과 키워드 색인은 copy()로, 행렬은 그대로 공유합니다 (호출부가 새 행렬로 교체)."""
+        new = ResearcherStore(self.ids.copy(), self.names.copy(), self.keywords.copy(), self.matrix)
+        if self._positions is not None:
+            new._positions = dict(self._positions)
+        return new
+
+    def append(self, researcher_id, name: str) -> int:
+        """연구자 행을 끝에 추가하고 위치를 반환합니다 (키워드/벡터는 호출부가 같은 위치에 기록)."""
+        pos = len(self.ids)
+        if self._positions is not None:
+            self._positions[researcher_id] = pos
+        self.names.append(name)
+        self.ids.append(researcher_id)
+        return pos
+
+    def memory(self) -> Dict[str, int]:
+        """열별 배열 바이트 수 (행렬은 memmap이면 공유 페이지)."""
+        return {
+            "ids": getattr(self.ids, "nbytes", 0),
+            "names": self.names.nbytes,
+            "keywords": self.keywords.nbytes,
+            "matrix": int(self.matrix.nbytes) if self.matrix is not None else 0,
+        }
@@ -0,0 +1,142 @@
+# core/snapshot.py
+"""연구자 임베딩 행렬의 디스크 스냅샷.
+
+정규화된 float32 행렬(.npy)과 ID/이름/키워드 사이드카, DB 워터마크를 함께 저장합니다.
+워터마크는 변경 로그(tb_researcher_change)의 마지막 seq로, 트리거가 남긴 변경이 있을 때만 바뀝니다.
+워커는 np.load(mmap_mode="r")로 행렬을 열어 페이지 캐시를 공유하며,
+워터마크가 DB와 다를 때만 Postgres에서 다시 적재합니다.
+
+디렉터리 구조::
+
+    <snapshot_dir>/current.json      # 현재 빌드 이름 (원자적으로 교체)
+    <snapshot_dir>/<build>/vectors.npy
+    <snapshot_dir>/<build>/ids.json
+    <snapshot_dir>/<build>/names.json
+    <snapshot_dir>/<build>/keywords.json
+    <snapshot_dir>/<build>/meta.json
+"""
+
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_CURRENT = "current.json"
+# 다른 워커가 쓰는 중일 수 있는 최근 빌드는 정리 대상에서 제외(초)
+_STALE_BUILD_AGE = 300.0
+
+
+def db_watermark(conn, model_name: str = "") -> Optional[str]:
+    """변경 로그(tb_researcher_change)의 마지막 seq와 모델 이름으로 DB 워터마크 문자열을 만듭니다.
+
+    연구자 이름·임베딩·논문/특허 키워드가 바뀌면 트리거가 로그에 행을 남기므로 seq가 곧 데이터 버전이며,
+    기본 키 인덱스 한 번 조회로 끝나 워커 시작을 늦추지 않습니다. 로그 테이블이 없으면
+    (migrations/004 미적용) 신선도를 확인할 수 없으므로 None을 반환합니다.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('tb_researcher_change') IS NOT NULL")
+        if not cur.fetchone()[0]:
+            return None
+        cur.execute("SELECT COALESCE(MAX(seq), 0) FROM tb_researcher_change")
+        seq = int(cur.fetchone()[0])
+    return json.dumps({"model": model_name, "change_seq": seq}, sort_keys=True)
+
+
+def _write_json(path: str, obj) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+
+
+def _read_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_meta(snapshot_dir: str) -> Optional[Dict]:
+    """현재 스냅샷의 메타 정보를 반환합니다(없으면 None)."""
+    try:
+        build = _read_json(os.path.join(snapshot_dir, _CURRENT))["build"]
+        meta = _read_json(os.path.join(snapshot_dir, build, "meta.json"))
+    except (OSError, ValueError, KeyError):
+        return None
+    meta["build"] = build
+    return meta
+
+
+def save_snapshot(
+    snapshot_dir: str,
+    mat_norm: np.ndarray,
+    ids: List,
+    names: List[str],
+    rk: List[List[str]],
+    pk: List[List[str]],
+    watermark: str,
+    change_seq: Optional[int] = None,
+) -> str:
+    """스냅샷을 새 빌드 디렉터리에 쓰고 current.json을 원자적으로 교체합니다.
+
+    change_seq는 적재 직전의 변경 로그 위치로, 스냅샷을 재사용할 때 refresh가 이어서 재생할 지점입니다.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    build = uuid.uuid4().hex
+    build_dir = os.path.join(snapshot_dir, build)
+    os.makedirs(build_dir)
+    np.save(os.path.join(build_dir, "vectors.npy"), np.ascontiguousarray(mat_norm, dtype="float32"))
+    _write_json(os.path.join(build_dir, "ids.json"), list(ids))
+    _write_json(os.path.join(build_dir, "names.json"), list(names))
+    _write_json(os.path.join(build_dir, "keywords.json"), {"rk": rk, "pk": pk})
+    _write_json(os.path.join(build_dir, "meta.json"), {
+        "watermark": watermark,
+        "rows": int(mat_norm.shape[0]),
+        "dim": int(mat_norm.shape[1]),
+        "change_seq": change_seq,
+    })
+    tmp = os.path.join(snapshot_dir, f".{_CURRENT}.{os.getpid()}.{build}")
+    _write_json(tmp, {"build": build})
+    os.replace(tmp, os.path.join(snapshot_dir, _CURRENT))
+    _cleanup(snapshot_dir, keep=build)
+    return build
+
+
+def _cleanup(snapshot_dir: str, keep: str) -> None:
+    """오래된 이전 빌드를 지웁니다. 열려 있는 memmap은 unlink 후에도 유효합니다."""
+    now = time.time()
+    for name in os.listdir(snapshot_dir):
+        path = os.path.join(snapshot_dir, name)
+        if name == keep or not os.path.isdir(path):
+            continue
+        try:
+            if now - os.path.getmtime(path) < _STALE_BUILD_AGE:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def load_snapshot(snapshot_dir: str) -> Optional[Dict]:
+    """현재 스냅샷을 읽습니다. 행렬은 읽기 전용 memmap으로 엽니다."""
+    meta = read_meta(snapshot_dir)
+    if meta is None:
+        return None
+    build_dir = os.path.join(snapshot_dir, meta["build"])
+    try:
+        mat = np.load(os.path.join(build_dir, "vectors.npy"), mmap_mode="r")
+        ids = _read_json(os.path.join(build_dir, "ids.json"))
+        names = _read_json(os.path.join(build_dir, "names.json"))
+        keywords = _read_json(os.path.join(build_dir, "keywords.json"))
+    except (OSError, ValueError):
+        return None
+    if mat.ndim != 2 or mat.shape[0] != len(ids):
+        return None
+    return {
+        "meta": meta,
+        "matrix": mat,
+        "ids": ids,
+        "names": names,
+        "rk": keywords.get("rk", []),
+        "pk": keywords.get("pk", []),
+    }
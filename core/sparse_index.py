@@ -0,0 +1,199 @@
+# core/sparse_index.py
+"""연구자 키워드 BM25 희소 색인과 dense/BM25 순위 융합.
+
+문서는 연구자 1명이며, 내용은 KeywordIndex가 정리한 논문/특허 키워드 문구를 단어 토큰으로 나눈 것입니다.
+색인은 용어별 CSR(ptr/docs/weights)로 저장하고 BM25 가중치(idf × tf 포화 × 길이 정규화)를
+구축 시 미리 계산해 두므로, 질의는 질의 토큰 수만큼의 posting 구간을 점수 벡터에 더하는 연산뿐입니다.
+
+증분 갱신은 dense 인덱스와 같은 방식입니다: 바뀐 연구자는 본 색인에서 stale로 가리고
+구축 시점의 idf/평균 길이로 계산한 delta 행으로 점수를 더하며, delta가 커지면 다시 구축합니다.
+갱신은 새 객체를 만들어 교체하므로 검색 중인 스레드는 이전 상태를 그대로 읽습니다.
+"""
+
+import itertools
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+FUSION_MODES = ("rrf", "weighted")
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 단어 토큰 (문자/숫자 연속 구간, 한글 포함)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """연구자 위치별 BM25 점수를 계산하는 불변 희소 색인 (update는 새 인스턴스를 반환)."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype="float32")
+        self.ptr = np.zeros(1, dtype="int64")
+        self.docs = np.zeros(0, dtype="int32")
+        self.weights = np.zeros(0, dtype="float32")
+        self.n_docs = 0  # 구축 시 연구자 수
+        self.n_rows = 0  # 증분 갱신으로 추가된 연구자까지 포함한 행 수
+        self.avgdl = 1.0
+        # 증분 갱신: 본 색인에서 가릴 행, 행별 {용어 ID: 가중치}
+        self.stale: Optional[np.ndarray] = None
+        self.delta: Dict[int, Dict[int, float]] = {}
+
+    @classmethod
+    def build(cls, keyword_index, k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        """KeywordIndex의 연구자별 키워드 ID로 색인을 만듭니다 (문구 → 토큰 전개는 벡터화)."""
+        self = cls(k1, b)
+        n_docs = len(keyword_index.key_ids)
+        self.n_docs = self.n_rows = n_docs
+        # 키워드 문구 → 토큰 ID (문구 단위로 한 번만 토큰화)
+        phrase_tokens = [[self._term_id(t) for t in tokenize(key)] for key in keyword_index.keys]
+        tok_len = np.fromiter((len(t) for t in phrase_tokens), dtype="int64", count=len(phrase_tokens))
+        tok_ptr = np.concatenate([[0], np.cumsum(tok_len)])
+        tok_flat = np.fromiter(itertools.chain.from_iterable(phrase_tokens), dtype="int64", count=int(tok_ptr[-1]))
+
+        # 연구자 → 키워드 문구 (KeywordIndex의 CSR 그대로)
+        kid_ptr, kid_flat = keyword_index.key_ids.csr()
+        kid_len = np.diff(kid_ptr)
+        kid_flat = kid_flat.astype("int64")
+        pair_doc = np.repeat(np.arange(n_docs, dtype="int64"), kid_len)
+
+        # (연구자, 문구) → (연구자, 토큰) 전개
+        lengths = tok_len[kid_flat]
+        total = int(lengths.sum())
+        offsets = np.repeat(tok_ptr[kid_flat] - (np.cumsum(lengths) - lengths), lengths)
+        terms = tok_flat[offsets + np.arange(total, dtype="int64")] if total else np.zeros(0, dtype="int64")
+        docs = np.repeat(pair_doc, lengths)
+
+        n_terms = len(self.vocab)
+        # 용어 우선 정렬 키로 (용어, 연구자)별 tf
+        keys, tf = np.unique(terms * max(n_docs, 1) + docs, return_counts=True)
+        term_of = keys // max(n_docs, 1)
+        doc_of = keys % max(n_docs, 1)
+        dl = np.bincount(doc_of, weights=tf, minlength=n_docs).astype("float32")
+        self.avgdl = float(dl.mean()) if n_docs and dl.sum() > 0 else 1.0
+        df = np.bincount(term_of, minlength=n_terms).astype("float32")
+        self.idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype("float32")
+        tf = tf.astype("float32")
+        norm = k1 * (1.0 - b + b * dl[doc_of] / self.avgdl)
+        self.weights = (self.idf[term_of] * tf * (k1 + 1.0) / (tf + norm)).astype("float32")
+        self.docs = doc_of.astype("int32")
+        self.ptr = np.searchsorted(term_of, np.arange(n_terms + 1)).astype("int64")
+        return self
+
+    def _term_id(self, token: str) -> int:
+        tid = self.vocab.get(token)
+        if tid is None:
+            tid = self.vocab[token] = len(self.vocab)
+        return tid
+
+    @property
+    def nnz(self) -> int:
+        return int(self.docs.size)
+
+    def _doc_weights(self, keys: Sequence[str]) -> Dict[int, float]:
+        """키워드 문구 목록을 구축 시점 idf/평균 길이 기준의 {용어 ID: BM25 가중치}로 바꿉니다."""
+        tf: Dict[int, int] = {}
+        for key in keys:
+            for token in tokenize(key):
+                tid = self.vocab.get(token)
+                if tid is not None:  # 구축 후 처음 나온 용어는 재구축 때 반영
+                    tf[tid] = tf.get(tid, 0) + 1
+        dl = sum(len(tokenize(key)) for key in keys)
+        norm = self.k1 * (1.0 - self.b + self.b * dl / self.avgdl)
+        return {tid: float(self.idf[tid]) * n * (self.k1 + 1.0) / (n + norm) for tid, n in tf.items()}
+
+    def updated(self, changes: Dict[int, Optional[Sequence[str]]]) -> "BM25Index":
+        """{연구자 위치: 키워드 문구 목록 또는 None(삭제)}을 반영한 새 색인을 반환합니다."""
+        new = BM25Index.__new__(BM25Index)
+        new.__dict__.update(self.__dict__)
+        n_rows = max([self.n_rows] + [pos + 1 for pos in changes])
+        stale = np.zeros(self.n_docs, dtype=bool) if self.stale is None else self.stale.copy()
+        delta = dict(self.delta)
+        for pos, keys in changes.items():
+            if pos < self.n_docs:
+                stale[pos] = True
+            weights = self._doc_weights(keys) if keys else {}
+            if weights:
+                delta[pos] = weights
+            else:
+                delta.pop(pos, None)
+        new.stale = stale
+        new.delta = delta
+        new.n_rows = n_rows
+        return new
+
+    def query_terms(self, text: str) -> np.ndarray:
+        """질의 토큰의 용어 ID (색인에 없는 토큰 제외, 중복 토큰은 각각 더함)."""
+        ids = [self.vocab.get(t) for t in tokenize(text)]
+        return np.array([t for t in ids if t is not None], dtype="int64")
+
+    def scores(self, text: str, n_rows: Optional[int] = None) -> np.ndarray:
+        """전체 연구자에 대한 BM25 점수 벡터 (길이 n_rows, 키워드가 겹치지 않으면 0)."""
+        out = np.zeros(max(n_rows or 0, self.n_rows), dtype="float32")
+        terms = self.query_terms(text)
+        if terms.size == 0:
+            return out
+        for tid in terms.tolist():
+            start, end = self.ptr[tid], self.ptr[tid + 1]
+            # 한 용어 안에서 연구자는 중복되지 않으므로 fancy-index 누적이 안전
+            out[self.docs[start:end]] += self.weights[start:end]
+        if self.stale is not None:
+            out[: self.n_docs][self.stale] = 0.0
+        if self.delta:
+            term_list = terms.tolist()
+            for pos, weights in self.delta.items():
+                score = sum(weights.get(t, 0.0) for t in term_list)
+                if score:
+                    out[pos] = score
+        return out
+
+    def needs_rebuild(self, min_rows: int, ratio: float) -> bool:
+        """구축 후 바뀐 행(가려진 행 + 추가된 행)이 기준을 넘었는지.
+
+        구축 후 처음 나온 용어만 가진 행은 delta에 남지 않으므로 delta 크기가 아니라 바뀐 행 수로 셉니다.
+        """
+        changed = (int(self.stale.sum()) if self.stale is not None else 0) + (self.n_rows - self.n_docs)
+        return changed > max(min_rows, int(self.n_docs * ratio))
+
+
+def top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 상위 k개(0보다 큰 것만)의 위치를 내림차순으로 반환합니다."""
+    nonzero = np.flatnonzero(scores > 0)
+    if nonzero.size > k:
+        part = np.argpartition(-scores[nonzero], k)[:k]
+        nonzero = nonzero[part]
+    return nonzero[np.argsort(-scores[nonzero], kind="stable")]
+
+
+def fuse(
+    candidates: np.ndarray,
+    dense_idx: np.ndarray,
+    sparse_idx: np.ndarray,
+    dense_sims: np.ndarray,
+    sparse_scores: np.ndarray,
+    mode: str = "rrf",
+    rrf_k: float = 60.0,
+    sparse_weight: float = 1.0,
+) -> np.ndarray:
+    """후보(정렬된 dense 상위 ∪ BM25 상위)별 융합 점수를 반환합니다.
+
+    - dense_idx/sparse_idx: 각 검색기의 순위순 후보 위치 (candidates의 부분집합)
+    - dense_sims/sparse_scores: candidates 순서의 정확 코사인 / BM25 점수
+    - rrf: 1 / (rrf_k + dense 순위) + sparse_weight / (rrf_k + BM25 순위), 순위 밖은 0
+    - weighted: 코사인 + sparse_weight × (BM25 / 후보 중 최대 BM25)
+    """
+    if mode == "weighted":
+        top = float(sparse_scores.max()) if sparse_scores.size else 0.0
+        return dense_sims + (sparse_weight / top) * sparse_scores if top > 0 else dense_sims.copy()
+    if mode != "rrf":
+        raise ValueError(f"HYBRID_FUSION must be one of {FUSION_MODES}, got {mode!r}")
+    fused = np.zeros(candidates.size, dtype="float32")
+    fused[np.searchsorted(candidates, dense_idx)] += 1.0 / (rrf_k + np.arange(1, dense_idx.size + 1, dtype="float32"))
+    fused[np.searchsorted(candidates, sparse_idx)] += sparse_weight / (
+        rrf_k + np.arange(1, sparse_idx.size + 1, dtype="float32"))
+    return fused
@@ -0,0 +1,168 @@
+# core/text_model_store.py
+"""테이블별 TF-IDF + SVD 텍스트 임베딩 모델의 학습/저장소.
+
+학습은 코퍼스를 한 번 스트리밍하며 끝납니다:
+- HashingVectorizer는 어휘 사전이 없어 청크 단위로 변환할 수 있고,
+  문서 빈도(DF)는 전체 행에서 누적해 IDF를 계산합니다.
+- SVD는 최대 fit_rows행 표본(reservoir)에 randomized 알고리즘으로 학습합니다.
+
+학습된 모델은 버전 ID와 함께 디렉터리에 저장되며, 이후 실행은 같은 임베딩 공간에서
+새로 추가되거나 바뀐 행만 transform할 수 있습니다. 디렉터리 구조::
+
+    <root>/<schema>.<table>/current.json     # 현재 버전 (원자적으로 교체)
+    <root>/<schema>.<table>/<version>.pkl
+    <root>/<schema>.<table>/<version>.json   # 메타 (학습 시각, 행 수, 차원 등)
+"""
+
+import json
+import os
+import pickle
+import random
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.preprocessing import normalize
+except Exception:  # pragma: no cover
+    TruncatedSVD = None  # type: ignore
+    HashingVectorizer = None  # type: ignore
+    normalize = None  # type: ignore
+
+_CURRENT = "current.json"
+# 이전 버전은 최근 몇 개만 남김 (롤백용)
+_KEEP_VERSIONS = 3
+
+
+class TextModel:
+    """해싱 TF-IDF + SVD 변환기. transform은 학습 없이 같은 임베딩 공간으로 변환합니다."""
+
+    def __init__(self, n_features: int, idf: np.ndarray, svd, meta: Optional[Dict] = None):
+        self.n_features = n_features
+        self.idf = idf.astype(np.float32)
+        self.svd = svd
+        self.meta = meta or {}
+
+    @property
+    def version(self) -> str:
+        return self.meta.get("version", "")
+
+    @property
+    def dim(self) -> int:
+        return int(self.svd.n_components)
+
+    def _hasher(self):
+        return HashingVectorizer(n_features=self.n_features, alternate_sign=False, norm=None)
+
+    def tfidf(self, docs: List[str]):
+        X = self._hasher().transform(docs)
+        return normalize(X.multiply(self.idf).tocsr())
+
+    def transform(self, docs: List[str]) -> np.ndarray:
+        """문서 목록을 (n, dim) float32 임베딩으로 변환합니다."""
+        return self.svd.transform(self.tfidf(docs)).astype(np.float32)
+
+
+def fit_text_model(
+    doc_chunks: Iterable[List[str]],
+    dim: int,
+    fit_rows: int = 50000,
+    n_features: int = 2 ** 18,
+    seed: int = 42,
+) -> Tuple[Optional[TextModel], int]:
+    """문서 청크를 한 번 순회하며 모델을 학습합니다. (모델 또는 None, 전체 문서 수)를 반환합니다.
+
+    IDF는 전체 문서에서, SVD는 최대 fit_rows개의 균등 표본에서 학습합니다.
+    """
+    hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+    df = np.zeros(n_features, dtype=np.int64)
+    rng = random.Random(seed)
+    sample: List[str] = []
+    seen = 0
+    for docs in doc_chunks:
+        X = hasher.transform(docs)
+        X.sum_duplicates()
+        df += np.bincount(X.indices, minlength=n_features)
+        for doc in docs:
+            if len(sample) < fit_rows:
+                sample.append(doc)
+            else:
+                j = rng.randrange(seen + 1)
+                if j < fit_rows:
+                    sample[j] = doc
+            seen += 1
+    if not sample:
+        return None, 0
+    # sklearn TfidfTransformer(smooth_idf=True)와 같은 식
+    idf = np.log((1.0 + seen) / (1.0 + df)) + 1.0
+    model = TextModel(n_features, idf, None)
+    X = model.tfidf(sample)
+    active = int(np.count_nonzero(df))
+    n_components = min(dim, max(2, min(len(sample), active) - 1))
+    started = time.perf_counter()
+    model.svd = TruncatedSVD(n_components=n_components, algorithm="randomized", n_iter=5, random_state=seed).fit(X)
+    model.meta = {
+        "rows_seen": seen,
+        "rows_fitted": len(sample),
+        "n_features": n_features,
+        "dim": n_components,
+        "fit_seconds": round(time.perf_counter() - started, 3),
+    }
+    return model, seen
+
+
+class ModelStore:
+    """테이블별 TextModel을 버전과 함께 저장/로드합니다."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _dir(self, schema: str, table: str) -> str:
+        return os.path.join(self.root, f"{schema}.{table}")
+
+    def load(self, schema: str, table: str) -> Optional[TextModel]:
+        """현재 버전 모델을 읽습니다 (없거나 손상되면 None)."""
+        directory = self._dir(schema, table)
+        try:
+            with open(os.path.join(directory, _CURRENT), "r", encoding="utf-8") as f:
+                version = json.load(f)["version"]
+            with open(os.path.join(directory, f"{version}.pkl"), "rb") as f:
+                model = pickle.load(f)
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+            return None
+        return model
+
+    def save(self, schema: str, table: str, model: TextModel) -> str:
+        """새 버전으로 저장하고 current.json을 원자적으로 교체합니다. 버전 ID를 반환합니다."""
+        directory = self._dir(schema, table)
+        os.makedirs(directory, exist_ok=True)
+        version = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        model.meta = dict(model.meta, version=version, schema=schema, table=table, fitted_at=time.time())
+        tmp = os.path.join(directory, f".{version}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, os.path.join(directory, f"{version}.pkl"))
+        with open(os.path.join(directory, f"{version}.json"), "w", encoding="utf-8") as f:
+            json.dump(model.meta, f, ensure_ascii=False)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": version}, f)
+        os.replace(tmp, os.path.join(directory, _CURRENT))
+        self._cleanup(directory)
+        return version
+
+    def _cleanup(self, directory: str) -> None:
+        versions = sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".pkl"))
+        for version in versions[:-_KEEP_VERSIONS]:
+            for ext in (".pkl", ".json"):
+                try:
+                    os.remove(os.path.join(directory, version + ext))
+                except OSError:
+                    pass
+
+    def age_days(self, model: TextModel) -> float:
+        """모델 학습 후 경과 일수."""
+        return (time.time() - float(model.meta.get("fitted_at", 0))) / 86400.0
@@ -1,7 +1,10 @@
-from typing import List, Tuple, Optional
-import json
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import os
+import threading
+import time
+import uuid
+import logging
 import numpy as np
-import torch
 
 # Optional FAISS acceleration
 try:
@@ -11,132 +14,712 @@ except Exception:  # pragma: no cover
 
 # psycopg2와 커서는 필수
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
 
-# sentence_transformers는 선택적 의존성으로 처리
-try:
-    from sentence_transformers import SentenceTransformer  # type: ignore
-except Exception:  # pragma: no cover
-    SentenceTransformer = None  # type: ignore
-
+from core.ann_index import INDEX_MODES, get_or_build
+from core.cache import LRUCache, get_backend, normalize_query
 from core.db import get_connection
+from core.encoders import load_encoder
+from core.keyword_index import KeywordIndex, language_order
+from core.pgvector_codec import copy_vectors_out
+from core.researcher_store import ResearcherStore
+from core.sparse_index import BM25Index, fuse, top_indices
+from core.snapshot import db_watermark, load_snapshot, save_snapshot
+
+
+# 연구자 임베딩 + 사전 집계된 논문/특허 키워드 (migrations/005_researcher_keywords.sql)
+_RESEARCHER_SQL = """
+    SELECT r.researcher_id,
+           r.name,
+           COALESCE(k.thesis_keywords, '{}') AS thesis_keywords,
+           COALESCE(k.patent_keywords, '{}') AS patent_keywords
+      FROM tb_researcher r
+ LEFT JOIN mv_researcher_keywords k ON k.researcher_id = r.researcher_id
+"""
+
+# 임베딩은 바이너리 COPY로 별도 조회 (문자열 변환 없이 float32로 수신)
+_EMBEDDING_SQL = "SELECT researcher_id::text, embedding FROM tb_researcher WHERE embedding IS NOT NULL"
+
+# 증분 갱신 대상 연구자만 원본 테이블에서 직접 집계 (집계 뷰 갱신 전 변경도 반영)
+_RESEARCHER_DELTA_SQL = """
+    WITH thesis AS (
+        SELECT ta.researcher_id,
+               array_agg(DISTINCT tk.term) FILTER (WHERE tk.term IS NOT NULL) AS thesis_keywords
+          FROM tb_thesis_author ta
+     LEFT JOIN tb_thesis_keyword tk ON tk.thesis_id = ta.thesis_id
+         WHERE ta.researcher_id = ANY(%(ids)s)
+      GROUP BY ta.researcher_id
+    ), patent AS (
+        SELECT ph.researcher_id,
+               array_agg(DISTINCT pk.term) FILTER (WHERE pk.term IS NOT NULL) AS patent_keywords
+          FROM tb_patent_holder ph
+     LEFT JOIN tb_patent_keyword pk ON pk.patent_id = ph.patent_id
+         WHERE ph.researcher_id = ANY(%(ids)s)
+      GROUP BY ph.researcher_id
+    )
+    SELECT r.researcher_id,
+           r.name,
+           r.embedding,
+           COALESCE(t.thesis_keywords, '{}') AS thesis_keywords,
+           COALESCE(p.patent_keywords, '{}') AS patent_keywords
+      FROM tb_researcher r
+ LEFT JOIN thesis t ON t.researcher_id = r.researcher_id
+ LEFT JOIN patent p ON p.researcher_id = r.researcher_id
+     WHERE r.researcher_id = ANY(%(ids)s)
+"""
+
+logger = logging.getLogger(__name__)
+
+# 인덱스 밖(delta)에서 정확 검색하는 행이 이 수/비율을 넘으면 인덱스를 다시 구축
+_COMPACT_MIN_ROWS = 1024
+_COMPACT_RATIO = 0.05
+# changed_since()가 거슬러 볼 수 있는 refresh 기록 수 (넘어가면 소비자가 전체 재구축)
+_HISTORY_LIMIT = 256
+
+
+def _parse_embedding(vec) -> Optional[np.ndarray]:
+    """DB embedding 값을 float32 벡터로 변환합니다.
+
+    vector 타입캐스터가 등록된 연결은 이미 ndarray를 돌려주며, 텍스트 컬럼이면 '[x1,x2,...]'를 파싱합니다.
+    """
+    if vec is None:
+        return None
+    if isinstance(vec, str):
+        body = vec.strip()[1:-1].replace("'", "").replace('"', "")
+        return np.array(body.split(","), dtype="float32") if body.strip() else np.empty(0, dtype="float32")
+    return np.asarray(vec, dtype="float32")
+
+
+class _SearchState:
+    """검색 한 번이 참조하는 행렬/인덱스/마스크/BM25/저장소 묶음. 갱신 시 새 객체로 통째로 교체됩니다."""
+    __slots__ = ("mat", "index", "dead", "stale", "n_stale", "delta", "bm25", "store")
+
+    def __init__(self, mat, index=None, dead=None, stale=None, delta=None, bm25=None, store=None):
+        self.mat = mat
+        self.index = index
+        self.bm25 = bm25
+        self.store = store
+        # 삭제된 행 위치 (NumPy 경로에서 제외)
+        self.dead = dead
+        # 인덱스에 들어 있지만 더 이상 유효하지 않은 행 (bool, 길이 = index.ntotal)
+        self.stale = stale
+        self.n_stale = int(stale.sum()) if stale is not None else 0
+        # 인덱스 구축 이후 추가/변경되어 행렬에서 직접 정확 검색하는 행 위치
+        self.delta = delta if delta is not None else np.zeros(0, dtype="int64")
 
 
 class VectorUtils:
     """임베딩 인코딩과 후보 검색(NumPy/FAISS)을 담당하는 유틸리티."""
-    def __init__(self, config):
-        """모델 및 임베딩 데이터를 초기화하고 검색 인덱스를 준비합니다."""
-        self.config = config
-        self.model = None
-        if SentenceTransformer is not None:
-            device = 'cuda' if torch.cuda.is_available() else 'cpu'
-            self.model = SentenceTransformer(config.embedding_model_name, device=device)
+    def __init__(self, config, model=None):
+        """모델 및 임베딩 데이터를 초기화하고 검색 인덱스를 준비합니다.
+
+        인코더는 ENCODER_BACKEND(torch/onnx/onnx-int8)로 고르며, model을 주면 그 객체를 사용합니다
+        (encode(texts, ...) 호환 객체).
+        """
+        if model is None:
+            model = load_encoder(config)
+        self._init_state(config, model)
+        self._load_vectors()
+        self._init_cache()
 
+    @classmethod
+    def from_arrays(cls, config, ids, names, matrix, rk=None, pk=None, model=None) -> "VectorUtils":
+        """DB 없이 주어진 연구자 배열로 인스턴스를 만듭니다 (벤치마크/오프라인 도구용)."""
+        self = cls.__new__(cls)
+        self._init_state(config, model)
+        mat = np.asarray(matrix, dtype="float32")
+        ids = list(ids)
+        empty = [() for _ in ids]
+        self._set_store(ids, names, rk if rk is not None else empty, pk if pk is not None else empty)
+        self.embedding_dim = int(mat.shape[1])
+        self._mat_norm = mat / (np.linalg.norm(mat, axis=1, keepdims=True) + 1e-8)
+        self.data_version = uuid.uuid4().hex
+        self._reset_positions()
+        self._build_index()
+        self._init_cache()
+        return self
+
+    def _init_state(self, config, model) -> None:
+        self.config = config
+        self.model = model
         self.embedding_dim = config.embedding_dim
-        self.researcher_ids: List[str] = []
-        self.researcher_names: List[str] = []
-        self.researcher_vectors: List[np.ndarray] = []
-        self.researcher_rk: List[List[str]] = []
-        self.researcher_pk: List[List[str]] = []
-        self.rk_cnt: List[int] = []
-        self.pk_cnt: List[int] = []
+        # 연구자 ID/이름/정리된 키워드(역색인 포함)/행렬을 행 위치로 맞춘 열 저장소.
+        # 키워드는 적재 시 1회 정리하며, 증분 갱신 시 해당 행만 재색인합니다.
+        self.store = ResearcherStore.build([], [], KeywordIndex(language_order(config.keyword_language_priority)))
         self._mat_norm: Optional[np.ndarray] = None
         self._faiss_index = None
+        # VECTOR_SEARCH=hybrid일 때만 구성하는 키워드 BM25 색인 (갱신 시 새 객체로 교체)
+        self._bm25: Optional[BM25Index] = None
+        # 인덱스 모드와 구축 정보(근사 인덱스는 recall@k 점검 결과 포함)
+        self.index_info: dict = {}
+        self._snapshot_build_dir: Optional[str] = None
+        # 연구자 데이터가 바뀔 때마다 갱신되는 버전 토큰(결과 캐시 무효화용)
+        self.data_version = ""
+        # 증분 갱신 상태: 검색 상태(원자적 교체), 삭제/stale/delta 행, 변경 로그 위치
+        self._state: Optional[_SearchState] = None
+        self._alive: Optional[np.ndarray] = None
+        self._stale: Optional[np.ndarray] = None
+        self._delta: set = set()
+        self._buf: Optional[np.ndarray] = None
+        self._change_seq: Optional[int] = None
+        self._base_version = ""
+        # refresh마다 (반영 후 data_version, 바뀐 연구자 ID) 기록 (튜플 통째로 교체)
+        self._history: Tuple[Tuple[str, frozenset], ...] = ()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
 
-        self._load_vectors()
+    def _set_store(self, ids: Sequence, names: Sequence[str], rk: Sequence[Sequence[str]], pk: Sequence[Sequence[str]]) -> None:
+        """적재한 연구자 목록으로 열 저장소와 키워드 역색인을 만듭니다."""
+        keywords = KeywordIndex.build(rk, pk, language_order(self.config.keyword_language_priority))
+        self.store = ResearcherStore.build(ids, names, keywords)
+
+    # 기존 목록형 접근자: 열 저장소의 뷰 (키워드는 정리된 튜플, 건수는 정리 후 개수)
+    @property
+    def keyword_index(self) -> KeywordIndex:
+        return self.store.keywords
+
+    @property
+    def researcher_ids(self):
+        return self.store.ids
+
+    @property
+    def researcher_names(self):
+        return self.store.names
+
+    @property
+    def researcher_vectors(self):
+        return self.store.vectors
+
+    @property
+    def researcher_rk(self):
+        return self.store.keywords.rk
+
+    @property
+    def researcher_pk(self):
+        return self.store.keywords.pk
+
+    @property
+    def rk_cnt(self) -> np.ndarray:
+        return self.store.keywords.rk.lengths()
+
+    @property
+    def pk_cnt(self) -> np.ndarray:
+        return self.store.keywords.pk.lengths()
+
+    def _init_cache(self) -> None:
+        config = self.config
+        self._embedding_cache: Optional[LRUCache] = None
+        if config.cache_embedding_size > 0:
+            self._embedding_cache = LRUCache(
+                config.cache_embedding_size,
+                backend=get_backend(config),
+                namespace=f"emb:{config.embedding_model_name}:{config.encoder_backend}:{self.embedding_dim}",
+                dumps=lambda arr: np.asarray(arr, dtype="float32").tobytes(),
+                loads=lambda raw: self._frozen(np.frombuffer(raw, dtype="float32").copy()),
+            )
 
     def _load_vectors(self) -> None:
-        """DB에서 연구자 임베딩 및 키워드를 읽어와 메모리에 적재하고, 검색 인덱스를 구성합니다."""
-        # DB에서 연구자 임베딩과 키워드 정보를 로드
+        """연구자 임베딩을 적재하고 검색 인덱스를 구성합니다.
+
+        디스크 스냅샷의 워터마크가 DB와 같으면 행렬을 memmap으로 열어 워커 간 페이지를 공유하고,
+        다르거나 없으면 DB에서 적재한 뒤 스냅샷을 새로 씁니다. 워터마크는 변경 로그가 있어야
+        만들 수 있으므로(migrations/004) 로그가 없으면 스냅샷 없이 매번 DB에서 적재합니다.
+        """
+        snapshot_dir = self.config.vector_snapshot_dir
+        watermark = None
+        head = None
+        reachable = False
+        try:
+            with get_connection(self.config) as conn:
+                # 적재 전에 변경 로그 위치를 기록해 두어 적재 중 변경도 다음 refresh에서 반영
+                head = self._current_change_seq(conn)
+                if snapshot_dir:
+                    watermark = db_watermark(conn, self.config.embedding_model_name)
+            reachable = True
+        except Exception:
+            pass  # DB에 닿지 않으면 기존 스냅샷이라도 사용
+        if snapshot_dir and (not reachable or watermark is not None):
+            snap = load_snapshot(snapshot_dir)
+            if (
+                snap is not None
+                and (not reachable or snap["meta"].get("watermark") == watermark)
+                # 변경 로그가 있는데 스냅샷에 재생 위치가 없으면(구버전 스냅샷) 재사용하지 않음
+                and (head is None or snap["meta"].get("change_seq") is not None)
+            ):
+                # refresh는 현재 로그 끝이 아니라 스냅샷 자신의 위치부터 재생
+                self._apply_snapshot(snap)
+                self._build_index()
+                return
+
+        self._load_from_db()
+        self._change_seq = head
+        if snapshot_dir and watermark is not None:
+            try:
+                save_snapshot(
+                    snapshot_dir,
+                    self._mat_norm,
+                    list(self.researcher_ids),
+                    list(self.researcher_names),
+                    [list(kws) for kws in self.researcher_rk],
+                    [list(kws) for kws in self.researcher_pk],
+                    watermark,
+                    change_seq=head,
+                )
+                # 방금 쓴 스냅샷으로 다시 열어 힙 사본 대신 공유 페이지를 사용
+                snap = load_snapshot(snapshot_dir)
+                if snap is not None:
+                    self._apply_snapshot(snap)
+            except OSError:
+                pass
+        self._build_index()
+
+    def _apply_snapshot(self, snap: dict) -> None:
+        """스냅샷 내용을 인스턴스 필드에 반영합니다. 행렬은 memmap 그대로 사용합니다."""
+        mat = snap["matrix"]
+        self._set_store(snap["ids"], snap["names"], snap["rk"], snap["pk"])
+        self.embedding_dim = int(mat.shape[1])
+        self._mat_norm = mat
+        self.data_version = snap["meta"]["build"]
+        self._snapshot_build_dir = os.path.join(self.config.vector_snapshot_dir, snap["meta"]["build"])
+        self._change_seq = snap["meta"].get("change_seq")
+        self._reset_positions()
+
+    def _load_from_db(self) -> None:
+        """DB에서 연구자 임베딩 및 키워드를 읽어와 메모리에 적재합니다."""
+        # 연구자/키워드를 먼저 읽고, 임베딩(바이너리 COPY)은 도착하는 행마다 미리 할당한 행렬에 바로 채움
         with get_connection(self.config) as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(
-                    """
-                    SELECT r.researcher_id,
-                           r.name,
-                           r.embedding,
-                           COALESCE(array_agg(DISTINCT tk.term) FILTER (WHERE tk.term IS NOT NULL), '{}') AS thesis_keywords,
-                           COALESCE(array_agg(DISTINCT pk.term) FILTER (WHERE pk.term IS NOT NULL), '{}') AS patent_keywords
-                      FROM tb_researcher r
-                 LEFT JOIN tb_thesis_author ta ON ta.researcher_id = r.researcher_id
-                 LEFT JOIN tb_thesis_keyword tk ON tk.thesis_id = ta.thesis_id
-                 LEFT JOIN tb_patent_holder ph ON ph.researcher_id = r.researcher_id
-                 LEFT JOIN tb_patent_keyword pk ON pk.patent_id = ph.patent_id
-                 GROUP BY r.researcher_id, r.name, r.embedding
-                    """
-                )
+                cur.execute(_RESEARCHER_SQL)
                 rows = cur.fetchall()
+            positions = {str(row["researcher_id"]): pos for pos, row in enumerate(rows)}
+            filled = np.zeros(len(rows), dtype=bool)
+            mat = None
 
-        for row in rows:
-            vec = row["embedding"]
-            if isinstance(vec, str):
-                # 문자열이면 JSON으로 파싱 (단일/이중따옴표 혼용까지 보정)
-                try:
-                    vec = json.loads(vec)
-                except json.JSONDecodeError:
-                    vec = json.loads(vec.replace("'", '"'))
-
-            vector = np.array(vec, dtype="float32")
-            self.researcher_ids.append(row["researcher_id"])  # type: ignore[index]
-            self.researcher_names.append(row["name"])  # type: ignore[index]
-            self.researcher_vectors.append(vector)
-
-            thesis_keywords = [kw for kw in (row.get("thesis_keywords") or []) if kw]
-            patent_keywords = [kw for kw in (row.get("patent_keywords") or []) if kw]
-            self.researcher_rk.append(thesis_keywords)
-            self.researcher_pk.append(patent_keywords)
-            self.rk_cnt.append(len(thesis_keywords))
-            self.pk_cnt.append(len(patent_keywords))
-
-        if not self.researcher_vectors:
+            def put(key, vec) -> None:
+                nonlocal mat
+                pos = positions.get(key)
+                if pos is None or vec is None:
+                    return
+                if mat is None:
+                    # DB 값 기준 차원으로 행렬을 한 번만 할당
+                    mat = np.empty((len(rows), len(vec)), dtype="float32")
+                mat[pos] = vec
+                filled[pos] = True
+
+            with conn.cursor() as cur:
+                copy_vectors_out(cur, sql.SQL(_EMBEDDING_SQL), put)
+        del positions
+
+        # 임베딩이 아직 없는 연구자는 제외 (생성 후 refresh에서 추가)
+        keep = np.flatnonzero(filled)
+        if not len(keep):
             raise ValueError(
                 "No researcher embeddings found in scholar schema. Run aiuse/embed_all_tables.py first."
             )
+        if len(keep) < len(rows):
+            # 앞으로 당겨 제자리 압축 (dst <= src이므로 덮어쓰기 안전) 후 남는 꼬리를 잘라냄
+            for dst, src in enumerate(keep.tolist()):
+                if dst != src:
+                    mat[dst] = mat[src]
+            mat.resize((len(keep), mat.shape[1]), refcheck=False)
+            rows = [rows[i] for i in keep.tolist()]
+        self.embedding_dim = int(mat.shape[1])
+        mat /= np.linalg.norm(mat, axis=1, keepdims=True) + 1e-8
+        keywords = [self._row_keywords(row) for row in rows]
+        self._set_store(
+            [row["researcher_id"] for row in rows],
+            [row["name"] for row in rows],
+            [kws[0] for kws in keywords],
+            [kws[1] for kws in keywords],
+        )
+        self._mat_norm = mat
+        self.data_version = uuid.uuid4().hex
+        self._snapshot_build_dir = None
+        self._reset_positions()
+
+    def _reset_positions(self) -> None:
+        """전체 적재 직후 증분 갱신 상태를 초기화합니다 (ID → 행 위치 맵은 저장소가 필요할 때 만듦)."""
+        self._alive = None
+        self._buf = None
+        self._base_version = self.data_version
+        self._history = ()
+
+    @staticmethod
+    def _row_keywords(row) -> Tuple[List[str], List[str]]:
+        thesis_keywords = [kw for kw in (row.get("thesis_keywords") or []) if kw]
+        patent_keywords = [kw for kw in (row.get("patent_keywords") or []) if kw]
+        return thesis_keywords, patent_keywords
+
+    def _build_index(self) -> None:
+        """설정된 모드(VECTOR_INDEX=flat|hnsw|ivfpq)로 검색 인덱스를 구성하고 검색 상태를 게시합니다."""
+        mode = (self.config.vector_index or "flat").lower()
+        if mode not in INDEX_MODES:
+            raise ValueError(f"unknown VECTOR_INDEX mode: {mode} (expected one of {', '.join(INDEX_MODES)})")
+        self._faiss_index, self.index_info = self._make_index(self._mat_norm, mode, self._snapshot_build_dir)
+        self._build_bm25()
+        self._stale = None
+        self._delta = set()
+        self._publish(self._mat_norm)
+
+    def _build_bm25(self) -> None:
+        """VECTOR_SEARCH=hybrid이면 키워드 역색인으로 BM25 색인을 (다시) 만들고 구축 정보를 기록합니다."""
+        search = (self.config.vector_search or "dense").lower()
+        if search not in ("dense", "hybrid"):
+            raise ValueError(f"unknown VECTOR_SEARCH mode: {search} (expected dense or hybrid)")
+        self.index_info["search"] = search
+        if search != "hybrid":
+            self._bm25 = None
+            return
+        started = time.perf_counter()
+        self._bm25 = BM25Index.build(self.keyword_index, self.config.bm25_k1, self.config.bm25_b)
+        self.index_info.update({
+            "fusion": self.config.hybrid_fusion,
+            "bm25_terms": len(self._bm25.vocab),
+            "bm25_nnz": self._bm25.nnz,
+            "bm25_build_seconds": round(time.perf_counter() - started, 3),
+        })
 
-        # DB 값 기준으로 차원 보정 + 정규화 행렬/FAISS 인덱스 준비
-        self.embedding_dim = int(len(self.researcher_vectors[0]))
-        mat = np.vstack(self.researcher_vectors).astype("float32")
-        norms = np.linalg.norm(mat, axis=1, keepdims=True) + 1e-8
-        self._mat_norm = mat / norms
-        if faiss is not None:
+    def _make_index(self, mat: np.ndarray, mode: str, directory: Optional[str]):
+        """행렬로 FAISS 인덱스를 만듭니다. (인덱스 또는 None, 구축 정보)를 반환합니다.
+
+        flat: FAISS IndexFlatIP는 행렬 사본을 하나 더 들고 있고 CPU에서는 NumPy 행렬곱이 같거나 빠르므로,
+        GPU가 있을 때만 FAISS로 옮기고 그 외에는 저장소 행렬을 그대로 NumPy 경로로 검색합니다.
+        hnsw/ivfpq: directory에 저장된 인덱스를 읽거나, 학습·구축 후 recall@k를 점검해 저장합니다.
+        """
+        if faiss is None:
+            return None, {"mode": "numpy"}
+        if mode != "flat":
             try:
-                index = faiss.IndexFlatIP(self.embedding_dim)
-                if hasattr(faiss, "get_num_gpus") and faiss.get_num_gpus() > 0:
-                    res = faiss.StandardGpuResources()
-                    index = faiss.index_cpu_to_gpu(res, 0, index)
-                index.add(self._mat_norm)
-                self._faiss_index = index
+                return get_or_build(
+                    mat,
+                    mode,
+                    self.config,
+                    directory,
+                    max(self.config.top_k * 10, self.config.top_k),
+                )
             except Exception:
-                self._faiss_index = None
+                pass  # 근사 인덱스 실패 시 정확 검색으로 폴백
+        if isinstance(mat, np.memmap) or not (hasattr(faiss, "get_num_gpus") and faiss.get_num_gpus() > 0):
+            return None, {"mode": "numpy"}
+        try:
+            index = faiss.IndexFlatIP(self.embedding_dim)
+            res = faiss.StandardGpuResources()
+            index = faiss.index_cpu_to_gpu(res, 0, index)
+            index.add(np.ascontiguousarray(mat))
+            return index, {"mode": "flat"}
+        except Exception:
+            return None, {"mode": "numpy"}
+
+    def _publish(self, mat: np.ndarray) -> None:
+        """현재 행렬/인덱스/마스크/BM25/저장소로 새 검색 상태를 만들어 참조 하나로 교체합니다.
+
+        검색 중인 요청은 교체 전 상태 객체를 그대로 사용하므로 잠금 없이 일관된 결과를 얻습니다.
+        저장소는 상태보다 먼저 바꿔, 새 상태의 행 위치로 self.store를 읽어도 항상 그 행이 있습니다.
+        """
+        dead = None
+        if self._alive is not None and not self._alive.all():
+            dead = np.flatnonzero(~self._alive)
+        stale = self._stale.copy() if self._stale is not None and self._stale.any() else None
+        delta = np.array(sorted(self._delta), dtype="int64") if self._delta else None
+        self.store.matrix = mat
+        self._mat_norm = mat
+        self._state = _SearchState(mat, self._faiss_index, dead, stale, delta, self._bm25, self.store)
+
+    @staticmethod
+    def _current_change_seq(conn) -> Optional[int]:
+        """변경 로그의 현재 위치를 반환합니다. 로그 테이블이 없으면 None (증분 갱신 비활성)."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('tb_researcher_change') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                return None
+            cur.execute("SELECT COALESCE(MAX(seq), 0) FROM tb_researcher_change")
+            return int(cur.fetchone()[0])
+
+    def refresh(self) -> int:
+        """변경 로그(tb_researcher_change)에서 바뀐 연구자만 읽어 메모리 데이터와 인덱스에 반영합니다.
+
+        비용은 변경된 행 수에 비례합니다. 반영한 연구자 수를 반환하며,
+        변경 로그 테이블이 없으면(migrations/004 미적용) 아무 것도 하지 않습니다.
+        """
+        if self._change_seq is None:
+            return 0
+        with self._refresh_lock:
+            with get_connection(self.config) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        SELECT researcher_id, MAX(seq)
+                          FROM tb_researcher_change
+                         WHERE seq > %s
+                      GROUP BY researcher_id
+                        """,
+                        (self._change_seq,),
+                    )
+                    changes = cur.fetchall()
+                if not changes:
+                    return 0
+                ids = [rid for rid, _ in changes]
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute(_RESEARCHER_DELTA_SQL, {"ids": ids})
+                    rows = cur.fetchall()
+            self._apply_changes(ids, rows)
+            self._change_seq = max(seq for _, seq in changes)
+            version = f"{self._base_version}+{self._change_seq}"
+            # 기록을 먼저 남겨야 새 data_version을 본 소비자가 이번 변경을 놓치지 않음
+            self._history = (self._history + ((version, frozenset(ids)),))[-_HISTORY_LIMIT:]
+            self.data_version = version
+            return len(ids)
+
+    def changed_since(self, version: str) -> Optional[Set]:
+        """version 이후 refresh로 바뀐 연구자 ID 집합을 반환합니다.
+
+        그 사이 전체 적재가 있었거나 기록이 잘려 알 수 없으면 None을 반환하므로,
+        호출자는 이때 live_researchers()로 전체를 다시 만들어야 합니다.
+        """
+        history = self._history
+        if version == self._base_version:
+            start = 0
+        else:
+            start = next((i + 1 for i, (ver, _) in enumerate(history) if ver == version), None)
+            if start is None:
+                return None
+        changed: Set = set()
+        for _, ids in history[start:]:
+            changed.update(ids)
+        return changed
+
+    def start_refresh(self, interval: float) -> None:
+        """interval초마다 refresh()를 호출하는 데몬 스레드를 시작합니다."""
+        if interval <= 0 or self._refresh_thread is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception:
+                    # DB 일시 장애 등은 다음 주기에 재시도 (반영 전 상태는 그대로 유지됨)
+                    logger.exception("researcher refresh failed")
+
+        self._refresh_thread = threading.Thread(target=loop, name="vector-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def _apply_changes(self, ids: List, rows: List[dict]) -> None:
+        """변경된 연구자 행을 행렬/키워드 목록에 upsert 또는 삭제하고 검색 상태를 교체합니다.
+
+        행 위치는 유지되며, 삭제된 행은 0 벡터 + 마스크로 검색에서 제외됩니다.
+        인덱스가 있으면 변경 행을 stale로 표시하고 delta에서 정확 검색하며,
+        delta가 커지면 인덱스를 다시 구축합니다.
+        게시된 저장소/행렬/마스크는 고치지 않고 사본에 쓴 뒤 한 번에 교체하므로(copy-on-write),
+        검색 중인 요청은 이전 상태를 그대로 읽고 도중에 실패하면 아무 것도 바뀌지 않습니다.
+        """
+        by_id = {row["researcher_id"]: row for row in rows}
+        vectors = {}
+        for rid in ids:
+            row = by_id.get(rid)
+            vec = _parse_embedding(row["embedding"]) if row is not None else None
+            if vec is not None:
+                vec = self._fit_dim(vec.reshape(1, -1))[0]
+                vectors[rid] = vec / (np.linalg.norm(vec) + 1e-8)
+        store = self.store.copy()
+        n_rows = len(store)
+        n_new = sum(1 for rid in vectors if store.position(rid) is None)
+        # 기존 행을 고치거나 지우면 새 버퍼, 추가만 있으면 게시된 길이 뒤 여유 공간에 씀
+        rewrites = any(store.position(rid) is not None for rid in ids)
+        buf = self._reserve(n_rows + n_new, rewrites)
+        alive = self._alive.copy() if self._alive is not None else np.ones(n_rows, dtype=bool)
+        if n_new:
+            alive = np.concatenate([alive, np.ones(n_new, dtype=bool)])
+        index = self._faiss_index
+        stale = self._stale.copy() if self._stale is not None else None
+        delta = set(self._delta)
+        sparse_changes = {}
+
+        for rid in ids:
+            pos = store.position(rid)
+            vec = vectors.get(rid)
+            if vec is None:
+                # 삭제되었거나 임베딩이 비워진 연구자
+                if pos is not None:
+                    sparse_changes[pos] = None
+                    alive[pos] = False
+                    buf[pos] = 0.0
+                    stale = self._mark_stale(stale, index, pos)
+                    delta.discard(pos)
+                continue
+            thesis_keywords, patent_keywords = self._row_keywords(by_id[rid])
+            if pos is None:
+                pos = store.append(rid, by_id[rid]["name"])
+            else:
+                store.names[pos] = by_id[rid]["name"]
+                alive[pos] = True
+            store.keywords.set(pos, thesis_keywords, patent_keywords)
+            buf[pos] = vec
+            sparse_changes[pos] = [store.keywords.keys[kid] for kid in store.keywords.key_ids[pos]]
+            if index is not None:
+                stale = self._mark_stale(stale, index, pos)
+                delta.add(pos)
+
+        mat = buf[: len(store)]
+        index_info = self.index_info
+        if index is not None and len(delta) > max(_COMPACT_MIN_ROWS, int(mat.shape[0] * _COMPACT_RATIO)):
+            mode = (self.config.vector_index or "flat").lower()
+            index, info = self._make_index(mat, mode, None)
+            index_info = {**index_info, **info}
+            delta = set()
+            stale = ~alive if not alive.all() else None
+        bm25 = self._bm25
+        if bm25 is not None and sparse_changes:
+            bm25 = bm25.updated(sparse_changes)
+            if bm25.needs_rebuild(_COMPACT_MIN_ROWS, _COMPACT_RATIO):
+                # 삭제된 연구자는 검색 시 dead 마스크로 제외되므로 역색인 전체로 다시 구축
+                bm25 = BM25Index.build(store.keywords, self.config.bm25_k1, self.config.bm25_b)
+
+        # 모든 계산이 끝난 뒤에만 작업 필드를 바꾸고 검색 상태를 게시
+        self.store = store
+        self._buf = buf
+        self._alive = alive
+        self._stale = stale
+        self._delta = delta
+        self._faiss_index = index
+        self.index_info = index_info
+        self._bm25 = bm25
+        self._publish(mat)
+
+    def _reserve(self, n_needed: int, rewrites: bool) -> np.ndarray:
+        """증분 갱신용 쓰기 가능한 행렬 버퍼를 확보합니다 (여유 용량을 두고 늘림).
+
+        게시된 행렬은 검색 중인 요청이 읽고 있으므로, 기존 행을 고쳐야 하면(rewrites) 항상 새 버퍼에
+        복사합니다. 추가만 있으면 어떤 상태도 보지 않는 게시 길이 뒤 여유 공간에 쓰므로 버퍼를 재사용합니다.
+        처음 호출 시 memmap 스냅샷을 힙으로 한 번 복사합니다.
+        """
+        if not rewrites and self._buf is not None and self._buf.shape[0] >= n_needed:
+            return self._buf
+        n_cur = len(self.store)
+        capacity = max(n_needed, int(n_cur * 1.25) + 16)
+        if self._buf is not None and self._buf.shape[0] >= n_needed:
+            capacity = self._buf.shape[0]
+        buf = np.zeros((capacity, self.embedding_dim), dtype="float32")
+        buf[:n_cur] = self._state.mat[:n_cur]
+        return buf
+
+    @staticmethod
+    def _mark_stale(stale: Optional[np.ndarray], index, pos: int) -> Optional[np.ndarray]:
+        """인덱스에 포함된 행이면 stale로 표시한 마스크를 반환합니다."""
+        if index is None or pos >= index.ntotal:
+            return stale
+        if stale is None:
+            stale = np.zeros(index.ntotal, dtype=bool)
+        stale[pos] = True
+        return stale
 
     def encode(self, text: str) -> np.ndarray:
-        """문장을 임베딩 벡터로 인코딩하고 DB 차원에 맞춰 정렬합니다."""
-        if self.model is None:
-            raise RuntimeError(
-                "sentence-transformers가 설치되지 않았습니다. pip install sentence-transformers 로 설치하세요."
-            )
+        """문장을 임베딩 벡터로 인코딩하고 DB 차원에 맞춰 정렬합니다. 같은 질의는 캐시에서 반환합니다."""
+        key = normalize_query(text)
+        if self._embedding_cache is not None:
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                return cached
+        self._require_model()
         vec = self.model.encode(text)
         arr = np.array(vec, dtype="float32")
-        # DB 임베딩 차원에 맞춰 정렬 (차원 불일치 방지)
         if arr.ndim > 1:
             arr = arr.flatten()
-        if arr.shape[0] > self.embedding_dim:
-            arr = arr[: self.embedding_dim]
-        elif arr.shape[0] < self.embedding_dim:
-            pad = np.zeros(self.embedding_dim - arr.shape[0], dtype="float32")
-            arr = np.concatenate([arr, pad], axis=0)
+        arr = self._frozen(self._fit_dim(arr.reshape(1, -1))[0])
+        if self._embedding_cache is not None:
+            self._embedding_cache.set(key, arr)
+        return arr
+
+    def encode_many(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """여러 문장을 인코더 배치로 인코딩하여 (n, dim) 행렬을 반환합니다.
+
+        캐시에 있는 문장은 건너뛰고 나머지만 배치 인코딩합니다.
+        """
+        out = np.zeros((len(texts), self.embedding_dim), dtype="float32")
+        keys = [normalize_query(t) for t in texts]
+        pending: List[int] = []
+        for j, key in enumerate(keys):
+            cached = self._embedding_cache.get(key) if self._embedding_cache is not None else None
+            if cached is not None:
+                out[j] = cached
+            else:
+                pending.append(j)
+        if not pending:
+            return out
+        self._require_model()
+        vecs = self.model.encode([texts[j] for j in pending], batch_size=batch_size, convert_to_numpy=True)
+        arr = self._fit_dim(np.asarray(vecs, dtype="float32").reshape(len(pending), -1))
+        out[pending] = arr
+        if self._embedding_cache is not None:
+            for row, j in enumerate(pending):
+                self._embedding_cache.set(keys[j], self._frozen(arr[row].copy()))
+        return out
+
+    @staticmethod
+    def _frozen(arr: np.ndarray) -> np.ndarray:
+        """캐시에 공유되는 벡터가 호출부에서 바뀌지 않도록 읽기 전용으로 만듭니다."""
+        arr.setflags(write=False)
         return arr
 
+    def cache_stats(self) -> dict:
+        """질의 임베딩 캐시 카운터를 반환합니다."""
+        return self._embedding_cache.stats() if self._embedding_cache is not None else {}
+
+    def _require_model(self) -> None:
+        if self.model is None:
+            raise RuntimeError(
+                "질의 인코더를 불러오지 못했습니다. ENCODER_BACKEND=torch는 pip install sentence-transformers, "
+                "onnx/onnx-int8은 python -m core.encoders export 가 필요합니다."
+            )
+
+    def _fit_dim(self, arr: np.ndarray) -> np.ndarray:
+        """(n, d) 행렬을 DB 임베딩 차원에 맞춰 자르거나 0으로 채웁니다 (차원 불일치 방지)."""
+        if arr.shape[1] > self.embedding_dim:
+            arr = arr[:, : self.embedding_dim]
+        elif arr.shape[1] < self.embedding_dim:
+            pad = np.zeros((arr.shape[0], self.embedding_dim - arr.shape[1]), dtype="float32")
+            arr = np.concatenate([arr, pad], axis=1)
+        return np.ascontiguousarray(arr, dtype="float32")
+
+    def live_researchers(self) -> Tuple[List, List[str]]:
+        """삭제(tombstone)되지 않은 연구자의 ID/이름 목록을 반환합니다."""
+        # 게시된 상태 하나에서 저장소와 삭제 마스크를 함께 읽어 서로 어긋나지 않게 함
+        state = self._state
+        store = state.store if state is not None and state.store is not None else self.store
+        if state is None or state.dead is None:
+            return list(store.ids), list(store.names)
+        keep = np.ones(len(store), dtype=bool)
+        keep[state.dead] = False
+        keep = np.flatnonzero(keep)
+        return [store.ids[i] for i in keep], [store.names[i] for i in keep]
+
+    def live_names(self, ids: Iterable) -> Dict:
+        """주어진 연구자 ID별 이름을 반환합니다. 없거나 삭제된 연구자는 None입니다."""
+        state = self._state
+        store = state.store if state is not None and state.store is not None else self.store
+        dead = set(state.dead.tolist()) if state is not None and state.dead is not None else ()
+        out = {}
+        for rid in ids:
+            pos = store.position(rid)
+            out[rid] = store.names[pos] if pos is not None and pos not in dead else None
+        return out
+
     def get_all_data(self) -> Tuple[
-        List[str],
-        List[str],
-        List[np.ndarray],
-        List[int],
-        List[int],
-        List[List[str]],
-        List[List[str]],
+        Sequence[str],
+        Sequence[str],
+        Sequence[np.ndarray],
+        Sequence[int],
+        Sequence[int],
+        Sequence[Sequence[str]],
+        Sequence[Sequence[str]],
     ]:
-        """연구자 ID/이름/벡터/키워드 통계를 반환합니다."""
+        """연구자 ID/이름/벡터/키워드 통계를 반환합니다.
+
+        ID/이름/벡터/키워드는 현재 열 저장소의 뷰입니다. refresh는 새 저장소로 교체하므로
+        갱신 내용을 보려면 결과를 보관하지 말고 필요할 때마다 다시 호출합니다.
+        """
         return (
             self.researcher_ids,
             self.researcher_names,
@@ -147,22 +730,112 @@ class VectorUtils:
             self.researcher_pk,
         )
 
-    def topk(self, q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
-        """정규화 코사인 유사도 기준 상위 k개의 인덱스와 유사도를 반환합니다."""
-        if self._mat_norm is None:
+    def topk(self, q: np.ndarray, k: int, text: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """정규화 코사인 유사도 기준 상위 k개의 인덱스와 유사도를 반환합니다.
+
+        text를 주고 VECTOR_SEARCH=hybrid이면 dense와 키워드 BM25 순위를 융합한 상위 k개를 반환합니다.
+        """
+        idx, sims = self.topk_many(q.reshape(1, -1), k, texts=[text] if text is not None else None)
+        return idx[0], sims[0]
+
+    def topk_many(
+        self, Q: np.ndarray, k: int, chunk_size: int = 256, texts: Optional[List[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """여러 질의 벡터 (n, dim)에 대해 상위 k개의 인덱스/유사도 (n, k)를 한 번에 구합니다.
+
+        FAISS가 있으면 한 번의 search 호출로, 없으면 청크 단위 행렬곱으로 계산합니다.
+        증분 갱신으로 무효가 된 인덱스 결과는 제외하고 delta 행은 정확 검색으로 합칩니다.
+        후보가 k보다 적으면 남는 자리는 인덱스 -1, 유사도 -inf입니다.
+        texts(질의 원문)를 주고 BM25 색인이 있으면 하이브리드 검색(_hybrid_topk)을 사용합니다.
+        """
+        state = self._state
+        if state is None:
             raise RuntimeError("vector matrix not initialized")
-        q = q.astype("float32")
-        q = q / (np.linalg.norm(q) + 1e-8)
-        q = q.reshape(1, -1)
-        if self._faiss_index is not None:
-            sims, idx = self._faiss_index.search(q, k)  # type: ignore[attr-defined]
-            return idx[0], sims[0]
-        sims = (self._mat_norm @ q.T).ravel()
-        if k >= sims.shape[0]:
-            order = np.argsort(-sims)
-        else:
-            part = np.argpartition(-sims, k)[:k]
-            order = part[np.argsort(-sims[part])]
-        return order, sims[order]
+        mat = state.mat
+        Q = np.asarray(Q, dtype="float32").reshape(-1, mat.shape[1])
+        Q = Q / (np.linalg.norm(Q, axis=1, keepdims=True) + 1e-8)
+        k = min(k, mat.shape[0])
+        bm25 = state.bm25
+        if bm25 is not None and texts is not None:
+            return self._hybrid_topk(state, bm25, Q, texts, k, chunk_size)
+        return self._dense_topk(state, Q, k, chunk_size)
+
+    def _dense_topk(self, state: _SearchState, Q: np.ndarray, k: int, chunk_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """정규화된 질의 행렬의 dense 상위 k개 (FAISS 인덱스 또는 청크 행렬곱)."""
+        mat = state.mat
+        if state.index is not None:
+            return self._search_index(state, np.ascontiguousarray(Q), k)
+        idx_out = np.empty((Q.shape[0], k), dtype="int64")
+        sim_out = np.empty((Q.shape[0], k), dtype="float32")
+        # (n, N) 유사도 행렬이 커지지 않도록 질의를 청크로 나눠 계산
+        for start in range(0, Q.shape[0], chunk_size):
+            sims = Q[start:start + chunk_size] @ mat.T
+            if state.dead is not None:
+                sims[:, state.dead] = -np.inf
+            order = self._top_order(sims, k)
+            idx_out[start:start + chunk_size] = order
+            sim_out[start:start + chunk_size] = np.take_along_axis(sims, order, axis=1)
+        idx_out[~np.isfinite(sim_out)] = -1
+        return idx_out, sim_out
+
+    def _hybrid_topk(
+        self, state: _SearchState, bm25: BM25Index, Q: np.ndarray, texts: List[str], k: int, chunk_size: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """dense 상위 HYBRID_POOL개와 전체 연구자 BM25 상위 HYBRID_POOL개를 융합해 상위 k개를 고릅니다.
+
+        후보 합집합의 코사인은 행렬에서 정확히 다시 계산하며, 반환 순서는 융합 점수순이고
+        유사도 값은 dense 코사인입니다 (추천 점수/임계값은 기존 의미 그대로).
+        """
+        cfg = self.config
+        mat = state.mat
+        pool = min(max(k, cfg.hybrid_pool), mat.shape[0])
+        dense_idx, _ = self._dense_topk(state, Q, pool, chunk_size)
+        idx_out = np.full((Q.shape[0], k), -1, dtype="int64")
+        sim_out = np.full((Q.shape[0], k), -np.inf, dtype="float32")
+        for j, text in enumerate(texts):
+            d_idx = dense_idx[j][dense_idx[j] >= 0]
+            scores = bm25.scores(text or "", mat.shape[0])[: mat.shape[0]]
+            if state.dead is not None:
+                scores[state.dead] = 0.0
+            s_idx = top_indices(scores, pool)
+            candidates = np.union1d(d_idx, s_idx)
+            if candidates.size == 0:
+                continue
+            sims = mat[candidates] @ Q[j]
+            fused = fuse(candidates, d_idx, s_idx, sims, scores[candidates],
+                         mode=cfg.hybrid_fusion, rrf_k=cfg.hybrid_rrf_k, sparse_weight=cfg.hybrid_sparse_weight)
+            order = np.argsort(-fused, kind="stable")[:k]
+            idx_out[j, : order.size] = candidates[order]
+            sim_out[j, : order.size] = sims[order]
+        return idx_out, sim_out
 
+    @staticmethod
+    def _top_order(sims: np.ndarray, k: int) -> np.ndarray:
+        """행별 유사도 상위 k개의 열 위치를 내림차순으로 반환합니다."""
+        if k >= sims.shape[1]:
+            return np.argsort(-sims, axis=1)
+        part = np.argpartition(-sims, k, axis=1)[:, :k]
+        part_sims = np.take_along_axis(sims, part, axis=1)
+        return np.take_along_axis(part, np.argsort(-part_sims, axis=1), axis=1)
 
+    @staticmethod
+    def _search_index(state: _SearchState, Q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """FAISS 검색 결과에서 stale 행을 빼고 delta 행의 정확 검색 결과와 합칩니다."""
+        fetch = min(k + state.n_stale, state.index.ntotal)
+        sims, idx = state.index.search(Q, fetch)  # type: ignore[attr-defined]
+        if state.stale is None and state.delta.size == 0:
+            return idx, sims
+        sims = sims.astype("float32", copy=True)
+        invalid = idx < 0
+        if state.stale is not None:
+            invalid |= state.stale[np.maximum(idx, 0)]
+        sims[invalid] = -np.inf
+        idx = np.where(invalid, -1, idx)
+        if state.delta.size:
+            sims = np.concatenate([sims, Q @ state.mat[state.delta].T], axis=1)
+            idx = np.concatenate([idx, np.broadcast_to(state.delta, (Q.shape[0], state.delta.size))], axis=1)
+        order = VectorUtils._top_order(sims, min(k, sims.shape[1]))
+        idx_out = np.take_along_axis(idx, order, axis=1)
+        sim_out = np.take_along_axis(sims, order, axis=1)
+        idx_out[~np.isfinite(sim_out)] = -1
+        return idx_out, sim_out
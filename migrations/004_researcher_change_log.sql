@@ -0,0 +1,98 @@
+-- Change log for incremental researcher index refresh (VectorUtils.refresh).
+-- Triggers record the researcher_id of every researcher whose embedding,
+-- name or thesis/patent keywords changed. Running app workers poll rows
+-- with seq greater than their last seen value and update only those rows.
+-- Idempotent: safe to run more than once.
+
+-- researcher_id follows the type of scholar.tb_researcher.researcher_id
+DO $$
+DECLARE
+    id_type TEXT;
+BEGIN
+    SELECT format_type(a.atttypid, a.atttypmod)
+      INTO id_type
+      FROM pg_attribute a
+      JOIN pg_class c ON a.attrelid = c.oid
+      JOIN pg_namespace n ON c.relnamespace = n.oid
+     WHERE n.nspname = 'scholar'
+       AND c.relname = 'tb_researcher'
+       AND a.attname = 'researcher_id'
+       AND a.attnum > 0
+       AND NOT a.attisdropped;
+
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS scholar.tb_researcher_change (
+             seq BIGSERIAL PRIMARY KEY,
+             researcher_id %s NOT NULL,
+             changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+         )', id_type);
+END $$;
+
+CREATE INDEX IF NOT EXISTS tb_researcher_change_changed_at_idx
+    ON scholar.tb_researcher_change (changed_at);
+
+-- tb_researcher / tb_thesis_author / tb_patent_holder: the row carries researcher_id
+CREATE OR REPLACE FUNCTION scholar.fn_log_researcher_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO scholar.tb_researcher_change (researcher_id) VALUES (OLD.researcher_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO scholar.tb_researcher_change (researcher_id) VALUES (NEW.researcher_id);
+    END IF;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+-- tb_thesis_keyword: log every author of the thesis
+CREATE OR REPLACE FUNCTION scholar.fn_log_thesis_keyword_change() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO scholar.tb_researcher_change (researcher_id)
+    SELECT ta.researcher_id
+      FROM scholar.tb_thesis_author ta
+     WHERE ta.thesis_id = CASE WHEN TG_OP = 'DELETE' THEN OLD.thesis_id ELSE NEW.thesis_id END;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+-- tb_patent_keyword: log every holder of the patent
+CREATE OR REPLACE FUNCTION scholar.fn_log_patent_keyword_change() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO scholar.tb_researcher_change (researcher_id)
+    SELECT ph.researcher_id
+      FROM scholar.tb_patent_holder ph
+     WHERE ph.patent_id = CASE WHEN TG_OP = 'DELETE' THEN OLD.patent_id ELSE NEW.patent_id END;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_researcher_change_ins_del ON scholar.tb_researcher;
+CREATE TRIGGER trg_researcher_change_ins_del
+    AFTER INSERT OR DELETE ON scholar.tb_researcher
+    FOR EACH ROW EXECUTE FUNCTION scholar.fn_log_researcher_change();
+
+DROP TRIGGER IF EXISTS trg_researcher_change_upd ON scholar.tb_researcher;
+CREATE TRIGGER trg_researcher_change_upd
+    AFTER UPDATE OF name, embedding ON scholar.tb_researcher
+    FOR EACH ROW EXECUTE FUNCTION scholar.fn_log_researcher_change();
+
+DROP TRIGGER IF EXISTS trg_researcher_change ON scholar.tb_thesis_author;
+CREATE TRIGGER trg_researcher_change
+    AFTER INSERT OR UPDATE OR DELETE ON scholar.tb_thesis_author
+    FOR EACH ROW EXECUTE FUNCTION scholar.fn_log_researcher_change();
+
+DROP TRIGGER IF EXISTS trg_researcher_change ON scholar.tb_patent_holder;
+CREATE TRIGGER trg_researcher_change
+    AFTER INSERT OR UPDATE OR DELETE ON scholar.tb_patent_holder
+    FOR EACH ROW EXECUTE FUNCTION scholar.fn_log_researcher_change();
+
+DROP TRIGGER IF EXISTS trg_researcher_change ON scholar.tb_thesis_keyword;
+CREATE TRIGGER trg_researcher_change
+    AFTER INSERT OR UPDATE OR DELETE ON scholar.tb_thesis_keyword
+    FOR EACH ROW EXECUTE FUNCTION scholar.fn_log_thesis_keyword_change();
+
+DROP TRIGGER IF EXISTS trg_researcher_change ON scholar.tb_patent_keyword;
+CREATE TRIGGER trg_researcher_change
+    AFTER INSERT OR UPDATE OR DELETE ON scholar.tb_patent_keyword
+    FOR EACH ROW EXECUTE FUNCTION scholar.fn_log_patent_keyword_change();
+
+-- Note: the log only grows. Prune it periodically once every worker has
+-- caught up, e.g.:
+--   DELETE FROM scholar.tb_researcher_change WHERE changed_at < now() - interval '7 days';
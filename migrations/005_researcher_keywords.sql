@@ -0,0 +1,37 @@
+-- Pre-aggregated per-researcher keywords and counts.
+-- Thesis and patent sides are aggregated separately and then joined once,
+-- so the theses x patents fan-out of the old 4-way join never materializes.
+-- Read by VectorUtils (full load), aiuse/reembed_researchers_e5.py and
+-- core.api.search_researchers_by_name.
+-- Refresh after ingest: python -m core.researcher_keywords
+-- Idempotent: safe to run more than once.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS scholar.mv_researcher_keywords AS
+WITH thesis AS (
+    SELECT ta.researcher_id,
+           COUNT(DISTINCT ta.thesis_id) AS thesis_count,
+           array_agg(DISTINCT tk.term) FILTER (WHERE tk.term IS NOT NULL) AS thesis_keywords
+      FROM scholar.tb_thesis_author ta
+ LEFT JOIN scholar.tb_thesis_keyword tk ON tk.thesis_id = ta.thesis_id
+  GROUP BY ta.researcher_id
+), patent AS (
+    SELECT ph.researcher_id,
+           COUNT(DISTINCT ph.patent_id) AS patent_count,
+           array_agg(DISTINCT pk.term) FILTER (WHERE pk.term IS NOT NULL) AS patent_keywords
+      FROM scholar.tb_patent_holder ph
+ LEFT JOIN scholar.tb_patent_keyword pk ON pk.patent_id = ph.patent_id
+  GROUP BY ph.researcher_id
+)
+SELECT r.researcher_id,
+       COALESCE(t.thesis_keywords, '{}') AS thesis_keywords,
+       COALESCE(p.patent_keywords, '{}') AS patent_keywords,
+       COALESCE(t.thesis_count, 0) AS thesis_count,
+       COALESCE(p.patent_count, 0) AS patent_count
+  FROM scholar.tb_researcher r
+LEFT JOIN thesis t ON t.researcher_id = r.researcher_id
+LEFT JOIN patent p ON p.researcher_id = r.researcher_id
+WITH DATA;
+
+-- Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS mv_researcher_keywords_researcher_id_idx
+    ON scholar.mv_researcher_keywords (researcher_id);
@@ -0,0 +1,22 @@
+-- Trigram indexes for /papers/search and /researchers/search.
+-- core.api rewrites the ILIKE '%term%' searches so these GIN indexes serve
+-- both the substring match and the similarity (%) operator, and ranks
+-- results by similarity(). Idempotent: safe to run more than once.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS tb_thesis_keyword_term_trgm_idx
+    ON scholar.tb_thesis_keyword USING gin (term gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS tb_researcher_name_trgm_idx
+    ON scholar.tb_researcher USING gin (name gin_trgm_ops);
+
+-- Per-thesis lookups used after the top hits are chosen
+CREATE INDEX IF NOT EXISTS tb_thesis_keyword_thesis_id_idx
+    ON scholar.tb_thesis_keyword (thesis_id);
+
+CREATE INDEX IF NOT EXISTS tb_thesis_author_thesis_id_idx
+    ON scholar.tb_thesis_author (thesis_id);
+
+ANALYZE scholar.tb_thesis_keyword;
+ANALYZE scholar.tb_researcher;
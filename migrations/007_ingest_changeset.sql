@@ -0,0 +1,37 @@
+-- Change detection for the Excel ingest (core/ingest/excel_to_db.py).
+-- ingest_fingerprint keeps an md5 of every ingested row so a re-ingest writes
+-- only inserted or modified rows. Every run is recorded in ingest_run and the
+-- keys it inserted, updated or found missing are appended to ingest_changeset,
+-- which embedding jobs read (embed_all_tables.py --changes-since RUN_ID).
+-- row_key is the text of the target table's primary key columns joined by
+-- U+001F. Idempotent: safe to run more than once.
+
+CREATE TABLE IF NOT EXISTS researcher.ingest_run (
+    run_id BIGSERIAL PRIMARY KEY,
+    source TEXT,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    finished_at TIMESTAMPTZ,
+    stats JSONB
+);
+
+CREATE TABLE IF NOT EXISTS researcher.ingest_fingerprint (
+    table_name TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    run_id BIGINT NOT NULL,
+    PRIMARY KEY (table_name, row_key)
+);
+
+CREATE TABLE IF NOT EXISTS researcher.ingest_changeset (
+    change_id BIGSERIAL PRIMARY KEY,
+    run_id BIGINT NOT NULL REFERENCES researcher.ingest_run(run_id) ON DELETE CASCADE,
+    table_name TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete'))
+);
+
+CREATE INDEX IF NOT EXISTS ingest_changeset_table_run_idx
+    ON researcher.ingest_changeset (table_name, run_id);
+
+-- Note: the changeset only grows. Prune runs every consumer has processed, e.g.:
+--   DELETE FROM researcher.ingest_run WHERE started_at < now() - interval '30 days';
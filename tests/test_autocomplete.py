@@ -0,0 +1,109 @@
+import random
+import unittest
+
+from core.autocomplete import NameAutocomplete, NameIndex
+
+
+def _ids(results):
+    return [row["researcher_id"] for row in results]
+
+
+class NameIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = NameIndex([1, 2, 3, 4], ["김철수", "김철", "박김철", "Ｋim Cheol"])
+
+    def test_prefix_before_contains(self):
+        self.assertEqual(_ids(self.index.search("김철")), [2, 1, 3])
+        self.assertEqual(_ids(self.index.search("김철", limit=2)), [2, 1])
+        self.assertEqual(_ids(self.index.search("철수")), [1])
+        self.assertEqual(self.index.search("kim")[0], {"researcher_id": 4, "name": "Ｋim Cheol"})
+        self.assertEqual(self.index.search(""), [])
+
+    def test_short_query_is_prefix_only(self):
+        self.assertEqual(_ids(self.index.search("김")), [2, 1])
+        self.assertEqual(self.index.search("수"), [])
+
+    def test_updated_matches_rebuild(self):
+        rng = random.Random(7)
+        syllables = "김이박최정강조윤장수영희진호철"
+        names = {rid: "".join(rng.choices(syllables, k=rng.randint(2, 4))) for rid in range(200)}
+        index = NameIndex(list(names), list(names.values()))
+        for _ in range(10):
+            changes = {}
+            for _ in range(15):
+                rid = rng.randint(0, 250)
+                changes[rid] = None if rng.random() < 0.3 else "".join(rng.choices(syllables, k=rng.randint(2, 4)))
+            previous = index
+            snapshot = [previous.search(q, 1000) for q in ("김이", "수")]
+            index = index.updated(changes)
+            self.assertEqual([previous.search(q, 1000) for q in ("김이", "수")], snapshot)
+            for rid, name in changes.items():
+                if name is None:
+                    names.pop(rid, None)
+                else:
+                    names[rid] = name
+            rebuilt = NameIndex(list(names), list(names.values()))
+            self.assertEqual(len(index), len(rebuilt))
+            for query in ("김", "김이", "박최", "수영희", "호철"):
+                self.assertEqual(
+                    sorted(map(tuple, (r.values() for r in index.search(query, 1000)))),
+                    sorted(map(tuple, (r.values() for r in rebuilt.search(query, 1000)))),
+                )
+
+
+class _Researchers:
+    """NameAutocomplete가 쓰는 VectorUtils 메서드만 흉내 내는 테스트 대역."""
+
+    def __init__(self, names):
+        self.names = dict(names)
+        self.base = self.data_version = "base"
+        self.history = []
+        self.full_loads = 0
+
+    def refresh(self, changes):
+        self.names.update(changes)
+        for rid in [rid for rid, name in changes.items() if name is None]:
+            del self.names[rid]
+        version = f"{self.base}+{len(self.history) + 1}"
+        self.history.append((version, set(changes)))
+        self.data_version = version
+
+    def changed_since(self, version):
+        if version == self.base:
+            start = 0
+        else:
+            start = next((i + 1 for i, (ver, _) in enumerate(self.history) if ver == version), None)
+            if start is None:
+                return None
+        return set().union(*(ids for _, ids in self.history[start:]))
+
+    def live_names(self, ids):
+        return {rid: self.names.get(rid) for rid in ids}
+
+    def live_researchers(self):
+        self.full_loads += 1
+        return list(self.names), list(self.names.values())
+
+
+class NameAutocompleteTest(unittest.TestCase):
+    def test_refresh_updates_only_changed_names(self):
+        source = _Researchers({1: "김철수", 2: "이영희"})
+        auto = NameAutocomplete(source)
+        self.assertEqual(_ids(auto.search("김철")), [1])
+        source.refresh({1: None, 3: "김철호"})
+        self.assertEqual(_ids(auto.search("김철")), [3])
+        self.assertEqual(_ids(auto.search("이영")), [2])
+        self.assertEqual(source.full_loads, 1)
+
+    def test_unknown_history_rebuilds(self):
+        source = _Researchers({1: "김철수"})
+        auto = NameAutocomplete(source)
+        auto.search("김")
+        source.names[2] = "김영희"
+        source.base = source.data_version = "reloaded"
+        self.assertEqual(_ids(auto.search("김")), [2, 1])
+        self.assertEqual(source.full_loads, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
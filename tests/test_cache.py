@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from core.cache import LRUCache, SQLiteBackend, normalize_query
+
+
+class NormalizeQueryTest(unittest.TestCase):
+    def test_nfkc_and_whitespace(self):
+        self.assertEqual(normalize_query("  ｄｅｅｐ\t\n learning  "), "deep learning")
+        self.assertEqual(normalize_query(None), "")
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # a가 최근 사용
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["size"], 2)
+
+    def test_ttl_expiry(self):
+        cache = LRUCache(4, ttl=10)
+        with mock.patch("core.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch("core.cache.time.monotonic", return_value=105.0):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch("core.cache.time.monotonic", return_value=111.0):
+            self.assertEqual(cache.get("a", "miss"), "miss")
+        self.assertEqual(cache.stats()["expired"], 1)
+
+    def test_backend_shared_between_caches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = SQLiteBackend(os.path.join(tmp, "cache.sqlite"))
+            codec = dict(dumps=lambda v: str(v).encode(), loads=lambda b: int(b.decode()))
+            first = LRUCache(4, backend=backend, namespace="ns", **codec)
+            second = LRUCache(4, backend=backend, namespace="ns", **codec)
+            first.set("k", 42)
+            self.assertEqual(second.get("k"), 42)
+            self.assertEqual(second.stats()["backend_hits"], 1)
+            other = LRUCache(4, backend=backend, namespace="other", **codec)
+            self.assertIsNone(other.get("k"))
+
+
+class SQLiteBackendTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "cache.sqlite")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _count(self) -> int:
+        with sqlite3.connect(self.path) as conn:
+            return conn.execute("SELECT count(*) FROM cache").fetchone()[0]
+
+    def test_expired_value_is_miss(self):
+        backend = SQLiteBackend(self.path)
+        backend.set("ns", "k", b"v", ttl=60)
+        self.assertEqual(backend.get("ns", "k"), b"v")
+        with mock.patch("core.cache.time.time", return_value=time.time() + 120):
+            self.assertIsNone(backend.get("ns", "k"))
+
+    def test_row_cap_evicts_least_recently_accessed(self):
+        backend = SQLiteBackend(self.path, max_rows=100)
+        backend._PURGE_EVERY = 50
+        clock = [1000.0]
+        with mock.patch("core.cache.time.time", side_effect=lambda: clock[0]):
+            backend.set("ns", "keep", b"x", ttl=None)
+            for i in range(299):
+                clock[0] += 1
+                backend.set("ns", f"k{i}", b"x", ttl=None)
+                if i % 10 == 0:
+                    clock[0] += 1
+                    self.assertEqual(backend.get("ns", "keep"), b"x")
+        self.assertLessEqual(self._count(), 100)
+        self.assertEqual(backend.get("ns", "keep"), b"x")
+        self.assertIsNone(backend.get("ns", "k0"))
+
+    def test_migrates_file_without_accessed_at(self):
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(
+                "CREATE TABLE cache (namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+                " expires_at REAL, PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("INSERT INTO cache VALUES ('ns', 'old', x'01', NULL)")
+        backend = SQLiteBackend(self.path)
+        self.assertEqual(backend.get("ns", "old"), b"\x01")
+        backend.set("ns", "new", b"\x02", ttl=None)
+        self.assertEqual(backend.get("ns", "new"), b"\x02")
+
+
+if __name__ == "__main__":
+    unittest.main()
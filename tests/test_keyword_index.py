@@ -0,0 +1,78 @@
+import unittest
+
+from core.keyword_index import KeywordIndex, language_order, language_rank, query_tokens
+
+
+def _index() -> KeywordIndex:
+    return KeywordIndex.build(
+        [["Deep Learning", "딥러닝", " deep learning ", ""], ["로봇", "Robot Arm"], []],
+        [["배터리"], ["robot arm", "Battery"], ["딥러닝"]],
+        language_order("ko,en"),
+    )
+
+
+class HelperTest(unittest.TestCase):
+    def test_language_order_and_rank(self):
+        self.assertEqual(language_order(" en , ko "), ["en", "ko"])
+        self.assertEqual(language_order(""), ["ko", "en"])
+        self.assertEqual(language_rank("딥러닝", ["ko", "en"]), 0)
+        self.assertEqual(language_rank("robot", ["ko", "en"]), 1)
+        self.assertEqual(language_rank("ロボット", ["ko", "en"]), 2)
+
+    def test_query_tokens(self):
+        self.assertEqual(query_tokens("Robot, 딥러닝  robot"), ["robot", "딥러닝", "robot"])
+
+
+class KeywordIndexTest(unittest.TestCase):
+    def test_build_cleans_and_orders(self):
+        index = _index()
+        # 공백/빈 값 제거, 대소문자 무시 중복 제거, 한글 우선
+        self.assertEqual(index.rk[0], ("딥러닝", "Deep Learning"))
+        self.assertEqual(index.rk[1], ("로봇", "Robot Arm"))
+        self.assertEqual(index.pk[1], ("robot arm", "Battery"))
+        self.assertEqual(index.rk[2], ())
+
+    def test_postings_and_query(self):
+        index = _index()
+        self.assertEqual(index.researchers_with("DEEP LEARNING"), {0})
+        self.assertEqual(index.researchers_with("딥러닝"), {0, 2})
+        self.assertEqual(index.researchers_with("robot arm"), {1})
+        self.assertEqual(index.researchers_with("없음"), set())
+        terms = index.query("딥러닝 battery 딥러닝")
+        self.assertEqual(index.candidates(terms), {0, 1, 2})
+        self.assertEqual(index.overlap(0, terms), 2)
+        self.assertEqual(index.overlap(1, terms), 1)
+
+    def test_matched_is_substring_on_thesis_keywords(self):
+        index = _index()
+        terms = index.query("learn 로")
+        self.assertEqual(index.matched(0, terms), ["Deep Learning"])
+        self.assertEqual(index.matched(1, terms), ["로봇"])
+        self.assertEqual(index.matched(0, index.query("")), [])
+
+    def test_set_updates_row_and_postings(self):
+        index = _index()
+        index.set(0, ["로봇"], [])
+        self.assertEqual(index.rk[0], ("로봇",))
+        self.assertEqual(index.researchers_with("로봇"), {0, 1})
+        self.assertEqual(index.researchers_with("deep learning"), set())
+        pos = len(index.key_ids)
+        index.set(pos, ["양자컴퓨팅"], ["Battery"])
+        self.assertEqual(index.rk[pos], ("양자컴퓨팅",))
+        self.assertEqual(index.researchers_with("battery"), {1, pos})
+
+    def test_copy_leaves_original_untouched(self):
+        index = _index()
+        before = {kid: list(p) for kid, p in index.postings.items()}
+        new = index.copy()
+        new.set(0, ["로봇"], [])
+        new.set(len(new.key_ids), ["신규"], [])
+        self.assertEqual(index.rk[0], ("딥러닝", "Deep Learning"))
+        self.assertEqual(len(index.key_ids), 3)
+        self.assertEqual({kid: list(index.postings[kid]) for kid in before}, before)
+        self.assertEqual(new.researchers_with("로봇"), {0, 1})
+        self.assertEqual(new.researchers_with("신규"), {3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import struct
+import unittest
+
+import numpy as np
+
+from core.pgvector_codec import _BinaryCopyParser, _binary_copy_payload, decode_vector, encode_vector
+
+
+class VectorCodecTest(unittest.TestCase):
+    def test_round_trip(self):
+        vec = np.array([0.1, -2.5, 3e-8, 1e6], dtype="float32")
+        buf = encode_vector(vec)
+        self.assertEqual(struct.unpack_from(">hh", buf), (4, 0))
+        self.assertEqual(len(buf), 4 + 4 * 4)
+        out = decode_vector(buf)
+        self.assertEqual(out.dtype, np.float32)
+        np.testing.assert_array_equal(out, vec)
+
+    def test_decode_accepts_memoryview(self):
+        vec = np.arange(3, dtype="float32")
+        np.testing.assert_array_equal(decode_vector(memoryview(encode_vector(vec))), vec)
+
+
+class BinaryCopyParserTest(unittest.TestCase):
+    def _payload(self):
+        keys = ["1", "연구자-2", "3"]
+        vectors = [np.random.default_rng(i).random(8, dtype=np.float32) for i in range(len(keys))]
+        return keys, vectors, _binary_copy_payload(keys, vectors).getvalue()
+
+    def _parse(self, payload: bytes, chunk: int):
+        rows = []
+        parser = _BinaryCopyParser(rows.append)
+        for start in range(0, len(payload), chunk):
+            parser.write(payload[start:start + chunk])
+        return parser, rows
+
+    def test_rows_split_across_chunks(self):
+        keys, vectors, payload = self._payload()
+        for chunk in (1, 3, 7, 19, len(payload)):
+            with self.subTest(chunk=chunk):
+                parser, rows = self._parse(payload, chunk)
+                self.assertTrue(parser.finished)
+                self.assertEqual(parser.row_count, len(keys))
+                self.assertEqual([key.decode("utf-8") for key, _ in rows], keys)
+                for (_, vec), expected in zip(rows, vectors):
+                    np.testing.assert_array_equal(decode_vector(vec), expected)
+                self.assertEqual(len(parser._buf), 0)
+
+    def test_null_field(self):
+        header = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+        row = struct.pack(">hi", 2, 1) + b"k" + struct.pack(">i", -1)
+        rows = []
+        parser = _BinaryCopyParser(rows.append)
+        parser.write(header + row + struct.pack(">h", -1))
+        self.assertEqual(rows, [[b"k", None]])
+
+    def test_bad_signature(self):
+        import psycopg2
+
+        parser = _BinaryCopyParser(lambda fields: None)
+        with self.assertRaises(psycopg2.DataError):
+            parser.write(b"NOTPGCOPY" + b"\x00" * 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from core.keyword_index import KeywordIndex
+from core.researcher_store import (
+    IntColumn,
+    IntListColumn,
+    ResearcherStore,
+    StringColumn,
+    id_column,
+)
+
+
+class ColumnTest(unittest.TestCase):
+    def test_string_column_patch_and_compact(self):
+        col = StringColumn.from_values(["김철수", None, "Alice"])
+        self.assertEqual(list(col), ["김철수", "", "Alice"])
+        col[1] = "이영희"
+        self.assertEqual(col.append("Bob"), 3)
+        self.assertEqual(col[-1], "Bob")
+        self.assertEqual(col[1:3], ["이영희", "Alice"])
+        self.assertEqual(col.lengths().tolist(), [9, 9, 5, 3])
+        col.compact()
+        self.assertEqual(list(col), ["김철수", "이영희", "Alice", "Bob"])
+        with self.assertRaises(IndexError):
+            col[4]
+
+    def test_int_list_column_csr(self):
+        col = IntListColumn.from_lists([[1, 2], [], [3]])
+        col[1] = (7, 8, 9)
+        col.append([4])
+        offsets, values = col.csr()
+        self.assertEqual(offsets.tolist(), [0, 2, 5, 6, 7])
+        self.assertEqual(values.tolist(), [1, 2, 7, 8, 9, 3, 4])
+        self.assertEqual(col[1], (7, 8, 9))
+
+    def test_copy_is_independent(self):
+        col = StringColumn.from_values(["a", "b"])
+        new = col.copy()
+        new[0] = "z"
+        new.append("c")
+        self.assertEqual(list(col), ["a", "b"])
+        self.assertEqual(list(new), ["z", "b", "c"])
+        ints = IntColumn(np.array([1, 2]))
+        other = ints.copy()
+        other[0] = 9
+        other.append(3)
+        self.assertEqual(list(ints), [1, 2])
+        self.assertEqual(list(other), [9, 2, 3])
+
+    def test_id_column_type(self):
+        self.assertIsInstance(id_column([1, 2]), IntColumn)
+        self.assertIsInstance(id_column(["a", "b"]), StringColumn)
+        self.assertEqual(id_column([1, "a"]), [1, "a"])
+
+
+class ResearcherStoreTest(unittest.TestCase):
+    def _store(self) -> ResearcherStore:
+        keywords = KeywordIndex.build([["딥러닝"], ["로봇"]], [[], []], ["ko", "en"])
+        matrix = np.arange(6, dtype="float32").reshape(2, 3)
+        return ResearcherStore.build([10, 20], ["김철수", "이영희"], keywords, matrix)
+
+    def test_rows_and_positions(self):
+        store = self._store()
+        self.assertEqual(len(store), 2)
+        row = store[1]
+        self.assertEqual((row.researcher_id, row.name, row.thesis_keywords), (20, "이영희", ("로봇",)))
+        self.assertEqual(row.vector.tolist(), [3.0, 4.0, 5.0])
+        self.assertEqual(store.position(20), 1)
+        self.assertIsNone(store.position(30))
+
+    def test_copy_and_append(self):
+        store = self._store()
+        store.position(10)
+        new = store.copy()
+        pos = new.append(30, "박민수")
+        new.keywords.set(pos, ["배터리"], [])
+        self.assertEqual(new.position(30), 2)
+        self.assertIsNone(store.position(30))
+        self.assertEqual(len(store), 2)
+        self.assertEqual(new[2].thesis_keywords, ("배터리",))
+        self.assertIs(new.matrix, store.matrix)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+from core.keyword_index import KeywordIndex
+from core.sparse_index import BM25Index, fuse, tokenize, top_indices
+
+_RK = [["deep learning", "vision"], ["robot arm", "control"], ["deep reinforcement learning", "multi agent systems"], []]
+_PK = [[], ["robot"], [], ["battery"]]
+
+
+def _bm25() -> BM25Index:
+    return BM25Index.build(KeywordIndex.build(_RK, _PK, ["ko", "en"]))
+
+
+class TokenizeTest(unittest.TestCase):
+    def test_words_lowercase(self):
+        self.assertEqual(tokenize("Deep-Learning 딥러닝_v2"), ["deep", "learning", "딥러닝", "v2"])
+
+
+class BM25IndexTest(unittest.TestCase):
+    def test_build_scores(self):
+        index = _bm25()
+        self.assertEqual(index.n_docs, 4)
+        scores = index.scores("learning")
+        self.assertEqual(scores.shape, (4,))
+        self.assertGreater(scores[0], 0)
+        self.assertGreater(scores[2], 0)
+        self.assertEqual(scores[1], 0)
+        # 문서가 짧을수록(0번) 같은 tf에서 점수가 높음
+        self.assertGreater(scores[0], scores[2])
+        # 흔하지 않은 용어가 idf가 높음
+        self.assertGreater(index.scores("vision")[0], scores[0])
+        self.assertTrue(np.all(index.scores("없는용어") == 0))
+        self.assertEqual(top_indices(index.scores("robot learning"), 2).tolist()[0], 1)
+
+    def test_updated_matches_rebuild_for_known_terms(self):
+        index = _bm25()
+        new = index.updated({0: ["robot"], 3: None, 4: ["deep learning"]})
+        self.assertEqual(new.n_rows, 5)
+        scores = new.scores("robot")
+        self.assertGreater(scores[0], 0)
+        self.assertEqual(new.scores("battery")[3], 0)
+        self.assertEqual(new.scores("vision")[0], 0)
+        self.assertGreater(new.scores("deep")[4], 0)
+        # 원본은 그대로
+        self.assertEqual(index.n_rows, 4)
+        self.assertGreater(index.scores("vision")[0], 0)
+        self.assertEqual(index.scores("robot")[0], 0)
+
+    def test_needs_rebuild(self):
+        index = _bm25()
+        self.assertFalse(index.needs_rebuild(1, 0.0))
+        new = index.updated({0: ["robot"], 4: ["vision"]})
+        self.assertTrue(new.needs_rebuild(1, 0.0))
+        self.assertFalse(new.needs_rebuild(2, 0.0))
+
+
+class FuseTest(unittest.TestCase):
+    def test_rrf(self):
+        candidates = np.array([1, 3, 5])
+        fused = fuse(candidates, np.array([3, 1]), np.array([5, 3]), np.zeros(3), np.zeros(3), rrf_k=1.0)
+        np.testing.assert_allclose(fused, [1 / 3, 1 / 2 + 1 / 3, 1 / 2], rtol=1e-6)
+        self.assertEqual(int(candidates[np.argmax(fused)]), 3)
+
+    def test_weighted(self):
+        candidates = np.array([0, 1])
+        sims = np.array([0.5, 0.4], dtype="float32")
+        fused = fuse(candidates, candidates, candidates, sims, np.array([0.0, 2.0]), mode="weighted", sparse_weight=0.5)
+        np.testing.assert_allclose(fused, [0.5, 0.9], rtol=1e-6)
+        np.testing.assert_allclose(fuse(candidates, candidates, candidates, sims, np.zeros(2), mode="weighted"), sims)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            fuse(np.array([0]), np.array([0]), np.array([0]), np.zeros(1), np.zeros(1), mode="max")
+
+
+if __name__ == "__main__":
+    unittest.main()